@@ -4,6 +4,8 @@ import os
 import shutil
 import base64
 import redis
+import threading
+import time
 
 from datetime import datetime
 from pathlib import Path
@@ -22,6 +24,7 @@ from open_webui.env import (
     ENABLE_DB_MIGRATIONS,
     ENV,
     REDIS_URL,
+    REDIS_CONFIG_SYNC_INTERVAL,
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
@@ -224,6 +227,16 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Config of the app, synced between instances through Redis when available.
+
+    Reads are served from the in-memory values. A write is stored in Redis, bumps
+    the config version and is published on the config channel. A background thread
+    subscribed to the channel reloads the updated keys. It reloads every key
+    when (re)subscribing or when the version changed without it being notified,
+    e.g. after a dropped connection.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
@@ -249,6 +262,19 @@ class AppConfig:
             )
 
         super().__setattr__("_state", {})
+        super().__setattr__("_synced", set())  # Keys loaded from Redis
+        super().__setattr__("_version", None)  # Config version last loaded
+        super().__setattr__("_listener", None)
+        super().__setattr__("_lock", threading.Lock())
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
+
+    def _get_version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config-version"
+
+    def _get_channel(self) -> str:
+        return f"{self._redis_key_prefix}:config-updates"
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -258,29 +284,77 @@ class AppConfig:
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._redis.set(
+                    self._get_redis_key(key), json.dumps(self._state[key].value)
+                )
+                version = self._redis.incr(self._get_version_key())
+                self._redis.publish(
+                    self._get_channel(), json.dumps({"key": key, "version": version})
+                )
+
+    def _load(self, keys: list[str]):
+        """Update the in-memory values of keys from Redis."""
+        pipeline = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.get(self._get_redis_key(key))
+
+        for key, redis_value in zip(keys, pipeline.execute()):
+            self._synced.add(key)
+            if redis_value is None:
+                continue
+
+            try:
+                decoded_value = json.loads(redis_value)
+
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+    def _load_all(self):
+        super().__setattr__("_version", self._redis.get(self._get_version_key()))
+        self._load(list(self._state))
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                pubsub.subscribe(self._get_channel())
+                while True:
+                    message = pubsub.get_message(timeout=REDIS_CONFIG_SYNC_INTERVAL)
+                    if message is None:
+                        if self._redis.get(self._get_version_key()) != self._version:
+                            self._load_all()
+                    elif message["type"] == "subscribe":
+                        # Updates may have been missed while not subscribed
+                        self._load_all()
+                    elif message["type"] == "message":
+                        update = json.loads(message["data"])
+                        if update["key"] in self._state:
+                            self._load([update["key"]])
+                        super().__setattr__("_version", str(update["version"]))
+            except Exception as e:
+                log.warning(f"Config sync with Redis interrupted: {e}")
+                time.sleep(REDIS_CONFIG_SYNC_INTERVAL)
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
-
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+            if self._listener is None:
+                with self._lock:
+                    if self._listener is None:
+                        listener = threading.Thread(target=self._listen, daemon=True)
+                        super().__setattr__("_listener", listener)
+                        listener.start()
+
+            # Keys registered after the listener loaded all keys
+            if key not in self._synced:
+                self._load([key])
 
         return self._state[key].value
 
@@ -391,6 +391,14 @@ try:
 except ValueError:
     REDIS_SOCKET_CONNECT_TIMEOUT = None
 
+# Seconds between checks of the config version in Redis, catching config updates
+# whose pub/sub invalidation was missed
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "10")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(REDIS_CONFIG_SYNC_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 10.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -626,6 +634,199 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Per-message writes made while a response streams are coalesced in memory and
+# flushed after this many seconds (0 writes through), or after MAX_UPDATES updates
+CHAT_MESSAGE_SAVE_FLUSH_INTERVAL = os.environ.get(
+    "CHAT_MESSAGE_SAVE_FLUSH_INTERVAL", "1"
+)
+
+try:
+    CHAT_MESSAGE_SAVE_FLUSH_INTERVAL = float(CHAT_MESSAGE_SAVE_FLUSH_INTERVAL)
+except ValueError:
+    CHAT_MESSAGE_SAVE_FLUSH_INTERVAL = 1.0
+
+CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES = os.environ.get(
+    "CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES", "50"
+)
+
+try:
+    CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES = int(CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES)
+except ValueError:
+    CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES = 50
+
+# Statuses kept in a message's statusHistory, older ones are collapsed into a summary
+# (0 keeps all). Repeated updates of the same stage are always collapsed.
+CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH = os.environ.get(
+    "CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH", "50"
+)
+
+try:
+    CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH = int(CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH)
+except ValueError:
+    CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH = 50
+
+
+####################################
+# STRANDS AI
+####################################
+
+STRANDS_AGENT_POOL_SIZE = os.environ.get("STRANDS_AGENT_POOL_SIZE", "8")
+
+try:
+    STRANDS_AGENT_POOL_SIZE = int(STRANDS_AGENT_POOL_SIZE)
+except ValueError:
+    STRANDS_AGENT_POOL_SIZE = 8
+
+STRANDS_CLICKHOUSE_MCP_POOL_SIZE = os.environ.get(
+    "STRANDS_CLICKHOUSE_MCP_POOL_SIZE", "20"
+)
+
+try:
+    STRANDS_CLICKHOUSE_MCP_POOL_SIZE = int(STRANDS_CLICKHOUSE_MCP_POOL_SIZE)
+except ValueError:
+    STRANDS_CLICKHOUSE_MCP_POOL_SIZE = 20
+
+STRANDS_CLICKHOUSE_MCP_TIMEOUT = os.environ.get("STRANDS_CLICKHOUSE_MCP_TIMEOUT", "30")
+
+if STRANDS_CLICKHOUSE_MCP_TIMEOUT == "":
+    STRANDS_CLICKHOUSE_MCP_TIMEOUT = None
+else:
+    try:
+        STRANDS_CLICKHOUSE_MCP_TIMEOUT = int(STRANDS_CLICKHOUSE_MCP_TIMEOUT)
+    except Exception:
+        STRANDS_CLICKHOUSE_MCP_TIMEOUT = 30
+
+STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT = os.environ.get(
+    "STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT", "120"
+)
+
+if STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT == "":
+    STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT = None
+else:
+    try:
+        STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT = int(STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT)
+    except Exception:
+        STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT = 120
+
+STRANDS_CLICKHOUSE_MCP_MAX_RETRIES = os.environ.get(
+    "STRANDS_CLICKHOUSE_MCP_MAX_RETRIES", "3"
+)
+
+try:
+    STRANDS_CLICKHOUSE_MCP_MAX_RETRIES = int(STRANDS_CLICKHOUSE_MCP_MAX_RETRIES)
+except ValueError:
+    STRANDS_CLICKHOUSE_MCP_MAX_RETRIES = 3
+
+STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF = os.environ.get(
+    "STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF", "0.5"
+)
+
+try:
+    STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF = float(STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF)
+except ValueError:
+    STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF = 0.5
+
+STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES = os.environ.get(
+    "STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES", "8"
+)
+
+try:
+    STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES = int(
+        STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES
+    )
+except ValueError:
+    STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES = 8
+
+# Seconds to cache list_databases/list_tables results, 0 disables the cache
+STRANDS_SCHEMA_CACHE_TTL = os.environ.get("STRANDS_SCHEMA_CACHE_TTL", "600")
+
+try:
+    STRANDS_SCHEMA_CACHE_TTL = int(STRANDS_SCHEMA_CACHE_TTL)
+except ValueError:
+    STRANDS_SCHEMA_CACHE_TTL = 600
+
+# Seconds to cache run_select_query results, 0 disables the cache
+STRANDS_QUERY_CACHE_TTL = os.environ.get("STRANDS_QUERY_CACHE_TTL", "300")
+
+try:
+    STRANDS_QUERY_CACHE_TTL = int(STRANDS_QUERY_CACHE_TTL)
+except ValueError:
+    STRANDS_QUERY_CACHE_TTL = 300
+
+STRANDS_QUERY_CACHE_MAX_BYTES = os.environ.get(
+    "STRANDS_QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)
+)
+
+try:
+    STRANDS_QUERY_CACHE_MAX_BYTES = int(STRANDS_QUERY_CACHE_MAX_BYTES)
+except ValueError:
+    STRANDS_QUERY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES = os.environ.get(
+    "STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)
+)
+
+try:
+    STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES = int(STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES)
+except ValueError:
+    STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# Budget for a single run_select_query result passed to the agent
+STRANDS_QUERY_MAX_ROWS = os.environ.get("STRANDS_QUERY_MAX_ROWS", "500")
+
+try:
+    STRANDS_QUERY_MAX_ROWS = int(STRANDS_QUERY_MAX_ROWS)
+except ValueError:
+    STRANDS_QUERY_MAX_ROWS = 500
+
+STRANDS_QUERY_MAX_BYTES = os.environ.get("STRANDS_QUERY_MAX_BYTES", str(1024 * 1024))
+
+try:
+    STRANDS_QUERY_MAX_BYTES = int(STRANDS_QUERY_MAX_BYTES)
+except ValueError:
+    STRANDS_QUERY_MAX_BYTES = 1024 * 1024
+
+
+####################################
+# CLICKHOUSE
+####################################
+
+# No default host: deployments that relied on the formerly built-in host and
+# read-only account must now set CLICKHOUSE_HOST, CLICKHOUSE_USERNAME and
+# CLICKHOUSE_PASSWORD explicitly
+CLICKHOUSE_HOST = os.environ.get("CLICKHOUSE_HOST", "")
+
+if not CLICKHOUSE_HOST:
+    log.warning(
+        "CLICKHOUSE_HOST is not set, the ClickHouse customer endpoints are "
+        "disabled. There is no built-in ClickHouse host or account anymore, set "
+        "CLICKHOUSE_HOST, CLICKHOUSE_USERNAME and CLICKHOUSE_PASSWORD."
+    )
+
+try:
+    CLICKHOUSE_PORT = int(os.environ.get("CLICKHOUSE_PORT", "8123"))
+except ValueError:
+    CLICKHOUSE_PORT = 8123
+
+CLICKHOUSE_USERNAME = os.environ.get("CLICKHOUSE_USERNAME", "default")
+CLICKHOUSE_PASSWORD = os.environ.get("CLICKHOUSE_PASSWORD", "")
+
+CLICKHOUSE_POOL_SIZE = os.environ.get("CLICKHOUSE_POOL_SIZE", "8")
+
+try:
+    CLICKHOUSE_POOL_SIZE = int(CLICKHOUSE_POOL_SIZE)
+except ValueError:
+    CLICKHOUSE_POOL_SIZE = 8
+
+# Seconds to cache region -> customers lookups, 0 disables the cache
+CLICKHOUSE_CUSTOMERS_CACHE_TTL = os.environ.get("CLICKHOUSE_CUSTOMERS_CACHE_TTL", "300")
+
+try:
+    CLICKHOUSE_CUSTOMERS_CACHE_TTL = int(CLICKHOUSE_CUSTOMERS_CACHE_TTL)
+except ValueError:
+    CLICKHOUSE_CUSTOMERS_CACHE_TTL = 300
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -687,6 +888,16 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Streaming deltas of a message emitted within this many milliseconds are sent as a
+# single socket.io frame (0 sends every delta)
+WEBSOCKET_EVENT_COALESCE_INTERVAL = os.environ.get(
+    "WEBSOCKET_EVENT_COALESCE_INTERVAL", "25"
+)
+try:
+    WEBSOCKET_EVENT_COALESCE_INTERVAL = int(WEBSOCKET_EVENT_COALESCE_INTERVAL)
+except ValueError:
+    WEBSOCKET_EVENT_COALESCE_INTERVAL = 25
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -793,6 +1004,105 @@ SENTENCE_TRANSFORMERS_CROSS_ENCODER_SIGMOID_ACTIVATION_FUNCTION = (
     == "true"
 )
 
+####################################
+# RETRIEVAL
+####################################
+
+# Number of collection BM25 indexes for hybrid search kept in memory per worker
+RAG_BM25_INDEX_CACHE_SIZE = os.environ.get("RAG_BM25_INDEX_CACHE_SIZE", "32")
+
+try:
+    RAG_BM25_INDEX_CACHE_SIZE = int(RAG_BM25_INDEX_CACHE_SIZE)
+except ValueError:
+    RAG_BM25_INDEX_CACHE_SIZE = 32
+
+# Chunks embedded and inserted together when ingesting documents
+RAG_INGEST_BATCH_SIZE = os.environ.get("RAG_INGEST_BATCH_SIZE", "256")
+
+try:
+    RAG_INGEST_BATCH_SIZE = int(RAG_INGEST_BATCH_SIZE)
+except ValueError:
+    RAG_INGEST_BATCH_SIZE = 256
+
+# Batches waiting between two ingestion stages, bounding the memory of an ingestion
+RAG_INGEST_QUEUE_SIZE = os.environ.get("RAG_INGEST_QUEUE_SIZE", "2")
+
+try:
+    RAG_INGEST_QUEUE_SIZE = int(RAG_INGEST_QUEUE_SIZE)
+except ValueError:
+    RAG_INGEST_QUEUE_SIZE = 2
+
+# Cache embeddings by text, engine, model and prefix, shared through Redis when
+# REDIS_URL is set and on disk otherwise
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+# Embeddings kept in memory per worker
+RAG_EMBEDDING_CACHE_SIZE = os.environ.get("RAG_EMBEDDING_CACHE_SIZE", "1024")
+
+try:
+    RAG_EMBEDDING_CACHE_SIZE = int(RAG_EMBEDDING_CACHE_SIZE)
+except ValueError:
+    RAG_EMBEDDING_CACHE_SIZE = 1024
+
+# Embeddings kept on disk, least recently used ones are evicted beyond it
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = os.environ.get(
+    "RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(RAG_EMBEDDING_CACHE_MAX_ENTRIES)
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+
+# Seconds an embedding is kept in Redis after it was last used
+RAG_EMBEDDING_CACHE_TTL = os.environ.get("RAG_EMBEDDING_CACHE_TTL", "604800")
+
+try:
+    RAG_EMBEDDING_CACHE_TTL = int(RAG_EMBEDDING_CACHE_TTL)
+except ValueError:
+    RAG_EMBEDDING_CACHE_TTL = 604800
+
+####################################
+# FILE PROCESSING
+####################################
+
+# Process uploaded files with the workers of a durable job queue (python -m
+# open_webui.worker), in Redis when REDIS_URL is set and in SQLite otherwise
+ENABLE_FILE_PROCESSING_QUEUE = (
+    os.environ.get("ENABLE_FILE_PROCESSING_QUEUE", "False").lower() == "true"
+)
+
+# Attempts of a file processing job before the file is marked as failed
+FILE_PROCESSING_JOB_MAX_ATTEMPTS = os.environ.get(
+    "FILE_PROCESSING_JOB_MAX_ATTEMPTS", "3"
+)
+
+try:
+    FILE_PROCESSING_JOB_MAX_ATTEMPTS = int(FILE_PROCESSING_JOB_MAX_ATTEMPTS)
+except ValueError:
+    FILE_PROCESSING_JOB_MAX_ATTEMPTS = 3
+
+# Seconds before the first retry of a failed job, doubled on each retry
+FILE_PROCESSING_JOB_RETRY_DELAY = os.environ.get(
+    "FILE_PROCESSING_JOB_RETRY_DELAY", "10"
+)
+
+try:
+    FILE_PROCESSING_JOB_RETRY_DELAY = int(FILE_PROCESSING_JOB_RETRY_DELAY)
+except ValueError:
+    FILE_PROCESSING_JOB_RETRY_DELAY = 10
+
+# Seconds a job is leased to a worker, renewed while it runs. Jobs of workers that
+# died are handed out again once their lease expires
+FILE_PROCESSING_JOB_LEASE = os.environ.get("FILE_PROCESSING_JOB_LEASE", "60")
+
+try:
+    FILE_PROCESSING_JOB_LEASE = int(FILE_PROCESSING_JOB_LEASE)
+except ValueError:
+    FILE_PROCESSING_JOB_LEASE = 60
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -66,6 +66,7 @@ from open_webui.socket.main import (
     periodic_usage_pool_cleanup,
     get_event_emitter,
     get_models_in_use,
+    EVENT_COALESCER,
 )
 from open_webui.routers import (
     audio,
@@ -489,6 +490,7 @@ from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
     ENABLE_PUBLIC_ACTIVE_USERS_COUNT,
+    ENABLE_FILE_PROCESSING_QUEUE,
     # Admin Account Runtime Creation
     WEBUI_ADMIN_EMAIL,
     WEBUI_ADMIN_PASSWORD,
@@ -509,6 +511,8 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.utils.pagination import NEXT_CURSOR_HEADER
+from open_webui.utils.message_buffer import MESSAGE_WRITE_BUFFER
 from open_webui.utils.access_control import has_access
 
 from open_webui.utils.auth import (
@@ -539,6 +543,7 @@ from open_webui.tasks import (
     list_tasks,
 )  # Import from tasks.py
 
+from open_webui.utils.file_processing import file_status_listener
 from open_webui.utils.redis import get_sentinels_from_env
 
 
@@ -627,6 +632,9 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    if ENABLE_FILE_PROCESSING_QUEUE:
+        app.state.file_status_listener = asyncio.create_task(file_status_listener())
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -650,9 +658,15 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Persist chat message updates still buffered in memory
+    await MESSAGE_WRITE_BUFFER.flush_all()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "file_status_listener"):
+        app.state.file_status_listener.cancel()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1401,6 +1415,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -1744,7 +1759,7 @@ async def chat_completion(
             if metadata.get("chat_id") and metadata.get("message_id"):
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        MESSAGE_WRITE_BUFFER.upsert_message(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1785,7 +1800,7 @@ async def chat_completion(
                 # Update the chat message with the error
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        MESSAGE_WRITE_BUFFER.upsert_message(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1793,6 +1808,9 @@ async def chat_completion(
                                 "error": {"content": str(e)},
                             },
                         )
+                        await MESSAGE_WRITE_BUFFER.flush(
+                            metadata["chat_id"], metadata["message_id"]
+                        )
 
                     event_emitter = get_event_emitter(metadata)
                     await event_emitter(
@@ -2164,6 +2182,18 @@ async def get_current_usage(user=Depends(get_verified_user)):
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@app.get("/api/usage/streaming")
+async def get_streaming_usage(user=Depends(get_admin_user)):
+    """
+    Get socket.io frame coalescing and message write buffer statistics of this worker.
+    This is an experimental endpoint and subject to change.
+    """
+    return {
+        "events": EVENT_COALESCER.stats(),
+        "message_writes": MESSAGE_WRITE_BUFFER.stats(),
+    }
+
+
 ############################
 # OAuth Login & Callback
 ############################
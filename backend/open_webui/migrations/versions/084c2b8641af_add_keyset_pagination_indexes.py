@@ -0,0 +1,35 @@
+"""Add keyset pagination indexes
+
+Revision ID: 084c2b8641af
+Revises: 154dfcec2de3
+Create Date: 2026-10-16 16:40:18.902513
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "084c2b8641af"
+down_revision: Union[str, None] = "154dfcec2de3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "message_channel_id_created_at_id_idx",
+        "message",
+        ["channel_id", "created_at", "id"],
+    )
+    op.create_index(
+        "file_user_id_updated_at_id_idx", "file", ["user_id", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("message_channel_id_created_at_id_idx", table_name="message")
+    op.drop_index("file_user_id_updated_at_id_idx", table_name="file")
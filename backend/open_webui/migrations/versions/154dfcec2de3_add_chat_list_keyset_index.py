@@ -0,0 +1,29 @@
+"""Add chat list keyset index
+
+Revision ID: 154dfcec2de3
+Revises: f2f86493eaeb
+Create Date: 2026-10-16 15:21:07.583920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "154dfcec2de3"
+down_revision: Union[str, None] = "f2f86493eaeb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "user_id_updated_at_id_idx", "chat", ["user_id", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("user_id_updated_at_id_idx", table_name="chat")
@@ -0,0 +1,207 @@
+"""Add chat_search table
+
+Revision ID: f2f86493eaeb
+Revises: fc1ff1d4fb07
+Create Date: 2026-10-16 14:03:52.226174
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f2f86493eaeb"
+down_revision: Union[str, None] = "fc1ff1d4fb07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+# The helpers below are frozen copies of the app code as of this revision, so the
+# backfill doesn't change when the app code does
+
+
+def get_message_contents(chat: dict, chat_messages: list) -> dict[str, object]:
+    """Return the content of each message of a chat, chat_message rows merged in."""
+    contents = {
+        message_id: message.get("content")
+        for message_id, message in (
+            (chat.get("history") or {}).get("messages") or {}
+        ).items()
+        if isinstance(message, dict)
+    }
+    for chat_message in chat_messages:
+        if chat_message.data and "content" in chat_message.data:
+            contents[chat_message.id] = chat_message.data["content"]
+    return contents
+
+
+def get_message_search_content(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            item.get("text") or ""
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "text"
+        )
+    return ""
+
+
+def get_chat_search_documents(title: str, contents: dict) -> dict[str, str]:
+    documents = {"": title or ""}
+    for message_id, content in contents.items():
+        documents[message_id] = get_message_search_content(content)
+    return {message_id: text for message_id, text in documents.items() if text}
+
+
+def sanitize_text_for_db(text: str) -> str:
+    text = text.replace("\x00", "")
+    return text.encode("utf-8", errors="surrogatepass").decode("utf-8", errors="ignore")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("message_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.UniqueConstraint(
+            "chat_id", "message_id", name="uq_chat_search_chat_id_message_id"
+        ),
+    )
+    op.create_index("chat_search_user_id_idx", "chat_search", ["user_id"])
+
+    backfill_chat_search()
+
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        # External content FTS5 index over chat_search, kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE chat_search_fts USING fts5("
+            "content, content='chat_search', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute("INSERT INTO chat_search_fts(chat_search_fts) VALUES ('rebuild')")
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+                INSERT INTO chat_search_fts(rowid, content)
+                VALUES (new.id, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+                INSERT INTO chat_search_fts(rowid, content)
+                VALUES (new.id, new.content);
+            END
+            """
+        )
+    elif conn.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX chat_search_content_idx ON chat_search "
+            "USING GIN (to_tsvector('simple', content))"
+        )
+
+
+def backfill_chat_search() -> None:
+    conn = op.get_bind()
+
+    chat_table = sa.table(
+        "chat",
+        sa.column("id", sa.Text()),
+        sa.column("user_id", sa.Text()),
+        sa.column("title", sa.Text()),
+        sa.column("chat", sa.JSON()),
+    )
+    chat_message_table = sa.table(
+        "chat_message",
+        sa.column("chat_id", sa.Text()),
+        sa.column("id", sa.Text()),
+        sa.column("data", sa.JSON()),
+        sa.column("status_history", sa.JSON()),
+        sa.column("files", sa.JSON()),
+        sa.column("current_at", sa.BigInteger()),
+    )
+    chat_search_table = sa.table(
+        "chat_search",
+        sa.column("chat_id", sa.Text()),
+        sa.column("message_id", sa.Text()),
+        sa.column("user_id", sa.Text()),
+        sa.column("content", sa.Text()),
+    )
+
+    last_id = None
+    while True:
+        query = (
+            sa.select(chat_table)
+            .where(~chat_table.c.user_id.like("shared-%"))
+            .order_by(chat_table.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+
+        chats = conn.execute(query).fetchall()
+        if not chats:
+            break
+        last_id = chats[-1].id
+
+        chat_messages_by_chat_id = {}
+        for row in conn.execute(
+            sa.select(chat_message_table).where(
+                chat_message_table.c.chat_id.in_([chat.id for chat in chats])
+            )
+        ):
+            chat_messages_by_chat_id.setdefault(row.chat_id, []).append(row)
+
+        rows = []
+        for chat in chats:
+            contents = get_message_contents(
+                chat.chat or {}, chat_messages_by_chat_id.get(chat.id, [])
+            )
+            for message_id, content in get_chat_search_documents(
+                chat.title, contents
+            ).items():
+                rows.append(
+                    {
+                        "chat_id": chat.id,
+                        "message_id": message_id,
+                        "user_id": chat.user_id,
+                        "content": sanitize_text_for_db(content),
+                    }
+                )
+
+        if rows:
+            conn.execute(chat_search_table.insert(), rows)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+    elif conn.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS chat_search_content_idx")
+
+    op.drop_index("chat_search_user_id_idx", table_name="chat_search")
+    op.drop_table("chat_search")
@@ -0,0 +1,97 @@
+"""Add chat_message table
+
+Revision ID: fc1ff1d4fb07
+Revises: c440947495f3
+Create Date: 2026-10-16 10:12:31.418207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "fc1ff1d4fb07"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing chats keep their full history in chat.chat; rows are only created
+    # by single-message writes, so no backfill is needed
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("status_history", sa.JSON(), nullable=True),
+        sa.Column("files", sa.JSON(), nullable=True),
+        sa.Column("current_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Fold pending message writes back into the chat JSON before dropping the table
+    conn = op.get_bind()
+
+    chat_table = sa.table(
+        "chat",
+        sa.column("id", sa.Text()),
+        sa.column("chat", sa.JSON()),
+    )
+    chat_message_table = sa.table(
+        "chat_message",
+        sa.column("chat_id", sa.Text()),
+        sa.column("id", sa.Text()),
+        sa.column("data", sa.JSON()),
+        sa.column("status_history", sa.JSON()),
+        sa.column("files", sa.JSON()),
+        sa.column("current_at", sa.BigInteger()),
+    )
+
+    chat_messages_by_chat_id = {}
+    for row in conn.execute(
+        sa.select(chat_message_table).order_by(chat_message_table.c.current_at)
+    ):
+        chat_messages_by_chat_id.setdefault(row.chat_id, []).append(row)
+
+    for chat_id, rows in chat_messages_by_chat_id.items():
+        chat = conn.execute(
+            sa.select(chat_table.c.chat).where(chat_table.c.id == chat_id)
+        ).scalar()
+        if chat is None:
+            continue
+
+        history = chat.setdefault("history", {})
+        messages = history.setdefault("messages", {})
+        for row in rows:
+            if row.id not in messages and row.data is None:
+                continue
+
+            message = {**messages.get(row.id, {}), **(row.data or {})}
+            if row.status_history:
+                message["statusHistory"] = (
+                    message.get("statusHistory") or []
+                ) + row.status_history
+            if row.files:
+                message["files"] = (message.get("files") or []) + row.files
+            messages[row.id] = message
+
+            if row.current_at is not None:
+                history["currentId"] = row.id
+
+        conn.execute(
+            chat_table.update().where(chat_table.c.id == chat_id).values(chat=chat)
+        )
+
+    op.drop_table("chat_message")
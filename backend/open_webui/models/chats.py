@@ -1,5 +1,6 @@
 import logging
 import json
+import re
 import time
 import uuid
 from typing import Optional
@@ -9,13 +10,17 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.utils.pagination import Keyset
+from open_webui.utils.status_history import append_status, compact_status_history
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    Float,
     ForeignKey,
+    Integer,
     String,
     Text,
     JSON,
@@ -61,11 +66,17 @@ class Chat(Base):
         Index("user_id_archived_idx", "user_id", "archived"),
         # WHERE user_id = ... ORDER BY updated_at DESC
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
+        # WHERE user_id = ... AND (updated_at, id) < (...) ORDER BY updated_at DESC, id DESC
+        Index("user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
     )
 
 
+# Chat lists are ordered most recently updated first
+CHAT_LIST_KEYSET = Keyset(Chat.updated_at, Chat.id)
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -117,6 +128,124 @@ class ChatFileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    # Message state written since the chat JSON was last saved as a whole, so that
+    # single-message updates don't rewrite the full chat. Merged into chat.history
+    # on read and folded back into the chat JSON on the next full chat update.
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    id = Column(Text, primary_key=True)
+
+    data = Column(JSON, nullable=True)  # message fields upserted
+    status_history = Column(JSON, nullable=True)  # statusHistory entries appended
+    files = Column(JSON, nullable=True)  # files appended
+
+    current_at = Column(BigInteger, nullable=True)  # when it became history.currentId
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+
+class ChatMessageModel(BaseModel):
+    chat_id: str
+    id: str
+
+    data: Optional[dict] = None
+    status_history: Optional[list] = None
+    files: Optional[list] = None
+
+    current_at: Optional[int] = None
+    created_at: int
+    updated_at: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+def merge_chat_messages(chat: dict, chat_messages: list) -> dict:
+    """
+    Return a copy of the chat JSON with the given chat_message rows merged into
+    chat.history, yielding the same shape as if every write had gone to the chat JSON.
+    """
+    history = dict(chat.get("history") or {})
+    messages = dict(history.get("messages") or {})
+
+    current = None
+    for chat_message in chat_messages:
+        message = messages.get(chat_message.id)
+        if message is None and chat_message.data is None:
+            # Status or files appended to a message that doesn't exist
+            continue
+
+        message = {**(message or {}), **(chat_message.data or {})}
+        if chat_message.status_history:
+            status_history = message.get("statusHistory") or []
+            for status in chat_message.status_history:
+                status_history = append_status(status_history, status)
+            message["statusHistory"] = status_history
+        if chat_message.files:
+            message["files"] = (message.get("files") or []) + chat_message.files
+        messages[chat_message.id] = message
+
+        if chat_message.current_at is not None and (
+            current is None or chat_message.current_at > current.current_at
+        ):
+            current = chat_message
+
+    history["messages"] = messages
+    if current is not None:
+        history["currentId"] = current.id
+
+    return {**chat, "history": history}
+
+
+class ChatSearch(Base):
+    __tablename__ = "chat_search"
+
+    # Full-text search documents of a chat: its title (message_id "") and the text
+    # content of each message. Indexed by the chat_search_fts FTS5 table on SQLite
+    # and by a GIN index on to_tsvector('simple', content) on PostgreSQL.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, nullable=False)
+    message_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    content = Column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "chat_id", "message_id", name="uq_chat_search_chat_id_message_id"
+        ),
+        Index("chat_search_user_id_idx", "user_id"),
+    )
+
+
+def get_message_search_content(content) -> str:
+    """Return the searchable text of a message's content."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            item.get("text") or ""
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "text"
+        )
+    return ""
+
+
+def get_chat_search_documents(title: str, chat: dict) -> dict[str, str]:
+    """Return the search documents of a chat keyed by message id, "" for the title."""
+    documents = {"": title or ""}
+    for message_id, message in (
+        (chat.get("history") or {}).get("messages") or {}
+    ).items():
+        if isinstance(message, dict):
+            documents[message_id] = get_message_search_content(message.get("content"))
+    return {message_id: content for message_id, content in documents.items() if content}
+
+
+def get_chat_search_terms(search_text: str) -> list[str]:
+    return re.findall(r"\w+", search_text.lower())
+
+
 ####################
 # Forms
 ####################
@@ -168,6 +297,19 @@ class ChatTitleIdResponse(BaseModel):
     created_at: int
 
 
+class ChatListItemResponse(ChatTitleIdResponse):
+    pinned: Optional[bool] = False
+    folder_id: Optional[str] = None
+    tag_ids: list[str] = []
+
+
+class ChatSearchResultResponse(BaseModel):
+    id: str
+    title: str
+    updated_at: int
+    snippet: str = ""
+
+
 class ChatListResponse(BaseModel):
     items: list[ChatModel]
     total: int
@@ -258,6 +400,30 @@ class ChatTable:
         """Recursively remove null bytes from strings in dict/list structures."""
         return sanitize_data_for_db(obj)
 
+    def _compact_status_histories(self, chat: dict) -> dict:
+        """Compact the statusHistory of each message of a chat saved by the client."""
+
+        def compact(message):
+            if isinstance(message, dict) and message.get("statusHistory"):
+                return {
+                    **message,
+                    "statusHistory": compact_status_history(message["statusHistory"]),
+                }
+            return message
+
+        history = chat.get("history")
+        if isinstance(history, dict) and isinstance(history.get("messages"), dict):
+            messages = {
+                message_id: compact(message)
+                for message_id, message in history["messages"].items()
+            }
+            chat = {**chat, "history": {**history, "messages": messages}}
+
+        if isinstance(chat.get("messages"), list):
+            chat = {**chat, "messages": [compact(m) for m in chat["messages"]]}
+
+        return chat
+
     def _sanitize_chat_row(self, chat_item):
         """
         Clean a Chat SQLAlchemy model's title + chat JSON,
@@ -281,6 +447,231 @@ class ChatTable:
 
         return changed
 
+    def _to_chat_model(self, chat_item, db: Session) -> ChatModel:
+        return self._to_chat_models([chat_item], db)[0]
+
+    def _to_chat_models(self, chat_items, db: Session) -> list[ChatModel]:
+        """Validate Chat rows, merging in their pending chat_message rows."""
+        chat_models = [ChatModel.model_validate(chat_item) for chat_item in chat_items]
+
+        chat_ids = [chat_model.id for chat_model in chat_models]
+        chat_messages_by_chat_id = {}
+        for i in range(0, len(chat_ids), 500):
+            for chat_message in (
+                db.query(ChatMessage)
+                .filter(ChatMessage.chat_id.in_(chat_ids[i : i + 500]))
+                .all()
+            ):
+                chat_messages_by_chat_id.setdefault(chat_message.chat_id, []).append(
+                    chat_message
+                )
+
+        for chat_model in chat_models:
+            if chat_model.id in chat_messages_by_chat_id:
+                chat_model.chat = merge_chat_messages(
+                    chat_model.chat, chat_messages_by_chat_id[chat_model.id]
+                )
+        return chat_models
+
+    def _get_or_create_chat_message(
+        self, db: Session, id: str, message_id: str
+    ) -> Optional[ChatMessage]:
+        chat_message = db.get(ChatMessage, (id, message_id))
+        if chat_message is not None:
+            return chat_message
+
+        if not db.query(exists().where(Chat.id == id)).scalar():
+            return None
+
+        chat_message = ChatMessage(
+            chat_id=id,
+            id=message_id,
+            created_at=int(time.time()),
+            updated_at=int(time.time()),
+        )
+        db.add(chat_message)
+        return chat_message
+
+    def _index_chat(
+        self, db: Session, chat_id: str, user_id: str, title: str, chat: dict
+    ):
+        """Bring the search documents of a chat in line with its title and history."""
+        if user_id.startswith("shared-"):
+            return
+
+        chat_searches = {
+            chat_search.message_id: chat_search
+            for chat_search in db.query(ChatSearch).filter_by(chat_id=chat_id).all()
+        }
+        for message_id, content in get_chat_search_documents(title, chat).items():
+            chat_search = chat_searches.pop(message_id, None)
+            if chat_search is None:
+                db.add(
+                    ChatSearch(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        user_id=user_id,
+                        content=content,
+                    )
+                )
+            elif chat_search.content != content:
+                chat_search.content = content
+
+        for chat_search in chat_searches.values():
+            db.delete(chat_search)
+
+    def _index_chat_message(self, db: Session, chat_id: str, message_id: str, content):
+        content = get_message_search_content(content)
+        chat_search = (
+            db.query(ChatSearch)
+            .filter_by(chat_id=chat_id, message_id=message_id)
+            .first()
+        )
+        if chat_search is not None:
+            if not content:
+                db.delete(chat_search)
+            elif chat_search.content != content:
+                chat_search.content = content
+        elif content:
+            user_id = db.query(Chat.user_id).filter_by(id=chat_id).scalar()
+            if user_id and not user_id.startswith("shared-"):
+                db.add(
+                    ChatSearch(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        user_id=user_id,
+                        content=content,
+                    )
+                )
+
+    def _get_chat_search_results(self, db: Session, user_id: str, terms: list[str]):
+        """
+        Return a subquery of (chat_id, rank) for the user's chats matching all terms
+        as word prefixes, where a lower rank is a better match.
+        """
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            search_results = text(
+                """
+                SELECT chat_search.chat_id AS chat_id, MIN(chat_search_fts.rank) AS rank
+                FROM chat_search_fts
+                JOIN chat_search ON chat_search.id = chat_search_fts.rowid
+                WHERE chat_search_fts MATCH :search_query
+                AND chat_search.user_id = :search_user_id
+                GROUP BY chat_search.chat_id
+                """
+            ).bindparams(
+                search_query=" ".join(f'"{term}"*' for term in terms),
+                search_user_id=user_id,
+            )
+        elif dialect_name == "postgresql":
+            search_results = text(
+                """
+                SELECT chat_search.chat_id AS chat_id,
+                MIN(-ts_rank(
+                    to_tsvector('simple', chat_search.content),
+                    to_tsquery('simple', :search_query)
+                )) AS rank
+                FROM chat_search
+                WHERE to_tsvector('simple', chat_search.content) @@ to_tsquery('simple', :search_query)
+                AND chat_search.user_id = :search_user_id
+                GROUP BY chat_search.chat_id
+                """
+            ).bindparams(
+                search_query=" & ".join(f"{term}:*" for term in terms),
+                search_user_id=user_id,
+            )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
+
+        return search_results.columns(chat_id=Text, rank=Float).subquery(
+            "chat_search_results"
+        )
+
+    def _get_chat_search_snippets(
+        self, db: Session, chat_ids: list[str], terms: list[str]
+    ) -> dict[str, str]:
+        """Return the best matching snippet of each chat, with matches in **bold**."""
+        if not chat_ids:
+            return {}
+
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            snippets_query = text(
+                """
+                SELECT chat_search.chat_id AS chat_id,
+                snippet(chat_search_fts, 0, '**', '**', '...', 32) AS snippet
+                FROM chat_search_fts
+                JOIN chat_search ON chat_search.id = chat_search_fts.rowid
+                WHERE chat_search_fts MATCH :search_query
+                AND chat_search.chat_id IN :chat_ids
+                ORDER BY chat_search_fts.rank
+                """
+            ).bindparams(
+                bindparam("chat_ids", expanding=True),
+                search_query=" ".join(f'"{term}"*' for term in terms),
+                chat_ids=chat_ids,
+            )
+        elif dialect_name == "postgresql":
+            # Only headline the best matching document of each chat
+            snippets_query = text(
+                """
+                SELECT best.chat_id AS chat_id,
+                ts_headline(
+                    'simple', best.content, to_tsquery('simple', :search_query),
+                    'StartSel=**, StopSel=**, MaxWords=32, MinWords=8'
+                ) AS snippet
+                FROM (
+                    SELECT DISTINCT ON (chat_search.chat_id)
+                    chat_search.chat_id, chat_search.content
+                    FROM chat_search
+                    WHERE to_tsvector('simple', chat_search.content) @@ to_tsquery('simple', :search_query)
+                    AND chat_search.chat_id IN :chat_ids
+                    ORDER BY chat_search.chat_id, ts_rank(
+                        to_tsvector('simple', chat_search.content),
+                        to_tsquery('simple', :search_query)
+                    ) DESC
+                ) AS best
+                """
+            ).bindparams(
+                bindparam("chat_ids", expanding=True),
+                search_query=" & ".join(f"{term}:*" for term in terms),
+                chat_ids=chat_ids,
+            )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
+
+        snippets = {}
+        for row in db.execute(snippets_query):
+            snippets.setdefault(row.chat_id, row.snippet)
+        return snippets
+
+    def _query_chat_list(self, db: Session):
+        """Query the columns of the chat list, leaving out the chat JSON."""
+        return db.query(
+            Chat.id,
+            Chat.title,
+            Chat.updated_at,
+            Chat.created_at,
+            Chat.pinned,
+            Chat.folder_id,
+            Chat.meta,
+        )
+
+    def _to_chat_list_items(self, rows) -> list[ChatListItemResponse]:
+        return [
+            ChatListItemResponse(
+                id=row.id,
+                title=row.title,
+                updated_at=row.updated_at,
+                created_at=row.created_at,
+                pinned=row.pinned,
+                folder_id=row.folder_id,
+                tag_ids=(row.meta or {}).get("tags", []),
+            )
+            for row in rows
+        ]
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
@@ -304,6 +695,7 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+            self._index_chat(db, chat.id, chat.user_id, chat.title, chat.chat)
             db.commit()
             db.refresh(chat_item)
             return ChatModel.model_validate(chat_item) if chat_item else None
@@ -345,6 +737,7 @@ class ChatTable:
             for form_data in chat_import_forms:
                 chat = self._chat_import_form_to_chat_model(user_id, form_data)
                 chats.append(Chat(**chat.model_dump()))
+                self._index_chat(db, chat.id, chat.user_id, chat.title, chat.chat)
 
             db.add_all(chats)
             db.commit()
@@ -356,7 +749,9 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = self._clean_null_bytes(chat)
+                chat_item.chat = self._clean_null_bytes(
+                    self._compact_status_histories(chat)
+                )
                 chat_item.title = (
                     self._clean_null_bytes(chat["title"])
                     if "title" in chat
@@ -365,6 +760,12 @@ class ChatTable:
 
                 chat_item.updated_at = int(time.time())
 
+                # The chat JSON now holds the full history
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                self._index_chat(
+                    db, id, chat_item.user_id, chat_item.title, chat_item.chat
+                )
+
                 db.commit()
                 db.refresh(chat_item)
 
@@ -417,80 +818,97 @@ class ChatTable:
         return chat.chat.get("history", {}).get("messages", {}) or {}
 
     def get_message_by_id_and_message_id(
-        self, id: str, message_id: str
+        self, id: str, message_id: str, db: Optional[Session] = None
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
+        chat = self.get_chat_by_id(id, db=db)
         if chat is None:
             return None
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
     def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        # Sanitize message content for null characters before upserting
-        if isinstance(message.get("content"), str):
-            message["content"] = sanitize_text_for_db(message["content"])
+        self,
+        id: str,
+        message_id: str,
+        message: dict,
+        db: Optional[Session] = None,
+        statuses: Optional[list[dict]] = None,
+    ) -> Optional[ChatMessageModel]:
+        """
+        Merge fields into a message, then append statuses to its statusHistory, in
+        a single commit.
+        """
+        with get_db_context(db) as db:
+            chat_message = self._get_or_create_chat_message(db, id, message_id)
+            if chat_message is None:
+                return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+            # Sanitize message content for null characters before upserting
+            message = self._clean_null_bytes(message)
+            if message.get("statusHistory"):
+                message["statusHistory"] = compact_status_history(
+                    message["statusHistory"]
+                )
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+            chat_message.data = {**(chat_message.data or {}), **message}
+            if "content" in message:
+                self._index_chat_message(db, id, message_id, message["content"])
+            # Replacing the list drops entries appended before this upsert
+            if "statusHistory" in message:
+                chat_message.status_history = None
+            if "files" in message:
+                chat_message.files = None
+
+            for status in statuses or []:
+                chat_message.status_history = append_status(
+                    chat_message.status_history or [], self._clean_null_bytes(status)
+                )
 
-        history["currentId"] = message_id
+            if message:
+                chat_message.current_at = time.time_ns()
+            chat_message.updated_at = int(time.time())
+            db.query(Chat).filter_by(id=id).update({"updated_at": int(time.time())})
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            db.commit()
+            db.refresh(chat_message)
+            return ChatMessageModel.model_validate(chat_message)
 
     def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        self, id: str, message_id: str, status: dict, db: Optional[Session] = None
+    ) -> Optional[ChatMessageModel]:
+        with get_db_context(db) as db:
+            chat_message = self._get_or_create_chat_message(db, id, message_id)
+            if chat_message is None:
+                return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+            chat_message.status_history = append_status(
+                chat_message.status_history or [], self._clean_null_bytes(status)
+            )
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+            chat_message.updated_at = int(time.time())
+            db.query(Chat).filter_by(id=id).update({"updated_at": int(time.time())})
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            db.commit()
+            db.refresh(chat_message)
+            return ChatMessageModel.model_validate(chat_message)
 
     def add_message_files_by_id_and_message_id(
-        self, id: str, message_id: str, files: list[dict]
+        self, id: str, message_id: str, files: list[dict], db: Optional[Session] = None
     ) -> list[dict]:
-        with get_db_context() as db:
-            chat = self.get_chat_by_id(id, db=db)
-            if chat is None:
+        with get_db_context(db) as db:
+            chat_message = self._get_or_create_chat_message(db, id, message_id)
+            if chat_message is None:
                 return None
 
-            chat = chat.chat
-            history = chat.get("history", {})
+            chat_message.files = (chat_message.files or []) + files
 
-            message_files = []
+            chat_message.updated_at = int(time.time())
+            db.query(Chat).filter_by(id=id).update({"updated_at": int(time.time())})
 
-            if message_id in history.get("messages", {}):
-                message_files = history["messages"][message_id].get("files", [])
-                message_files = message_files + files
-                history["messages"][message_id]["files"] = message_files
+            db.commit()
 
-            chat["history"] = history
-            self.update_chat_by_id(id, chat, db=db)
-            return message_files
+            message = self.get_message_by_id_and_message_id(id, message_id, db=db)
+            return (message or {}).get("files", [])
 
     def insert_shared_chat_by_chat_id(
         self, chat_id: str, db: Optional[Session] = None
@@ -510,7 +928,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(chat, db).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -546,7 +964,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id, db=db)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(chat, db).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -590,7 +1008,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -604,7 +1022,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -619,7 +1037,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -640,11 +1058,14 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
+            query = self._query_chat_list(db).filter(
+                Chat.user_id == user_id, Chat.archived == True
+            )
 
             if filter:
                 query_key = filter.get("query")
@@ -664,16 +1085,15 @@ class ChatTable:
                         query = query.order_by(getattr(Chat, order_by).desc())
                     else:
                         raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
+            if not (filter and filter.get("order_by") and filter.get("direction")):
+                query = CHAT_LIST_KEYSET.apply(query, cursor)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_list_items(query.all())
 
     def get_chat_list_by_user_id(
         self,
@@ -682,12 +1102,13 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._query_chat_list(db).filter(Chat.user_id == user_id)
             if not include_archived:
-                query = query.filter_by(archived=False)
+                query = query.filter(Chat.archived == False)
 
             if filter:
                 query_key = filter.get("query")
@@ -704,16 +1125,15 @@ class ChatTable:
                         query = query.order_by(getattr(Chat, order_by).desc())
                     else:
                         raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
+            if not (filter and filter.get("order_by") and filter.get("direction")):
+                query = CHAT_LIST_KEYSET.apply(query, cursor)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_list_items(query.all())
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -723,43 +1143,29 @@ class ChatTable:
         include_pinned: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> list[ChatTitleIdResponse]:
+    ) -> list[ChatListItemResponse]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._query_chat_list(db).filter(Chat.user_id == user_id)
 
             if not include_folders:
-                query = query.filter_by(folder_id=None)
+                query = query.filter(Chat.folder_id == None)
 
             if not include_pinned:
                 query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
 
             if not include_archived:
-                query = query.filter_by(archived=False)
+                query = query.filter(Chat.archived == False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
-            )
+            query = CHAT_LIST_KEYSET.apply(query, cursor)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
+            return self._to_chat_list_items(query.all())
 
     def get_chat_list_by_chat_ids(
         self,
@@ -776,7 +1182,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -791,7 +1197,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(chat_item, db)
         except Exception:
             return None
 
@@ -817,7 +1223,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -830,7 +1236,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_user_id(
         self,
@@ -873,21 +1279,20 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(all_chats, db),
                     "total": total,
                 }
             )
 
     def get_pinned_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db_context(db) as db:
-            all_chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id, pinned=True, archived=False)
-                .order_by(Chat.updated_at.desc())
+            query = self._query_chat_list(db).filter(
+                Chat.user_id == user_id, Chat.pinned == True, Chat.archived == False
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = CHAT_LIST_KEYSET.apply(query)
+            return self._to_chat_list_items(query.all())
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -898,7 +1303,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -908,9 +1313,10 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats based on a search query using the full-text search index, allowing
+        pagination using skip and limit.
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
@@ -972,7 +1378,7 @@ class ChatTable:
         search_text = " ".join(search_text_words)
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = self._query_chat_list(db).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 query = query.filter(Chat.archived == is_archived)
@@ -991,26 +1397,9 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
-
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -1042,33 +1431,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
-
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -1103,13 +1465,85 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
+            # Rank chats by their best matching title or message in the search index,
+            # then chats whose title only contains the search text within a word
+            terms = get_chat_search_terms(search_text)
+            title_match = Chat.title.ilike(f"%{search_text}%")
+            if terms:
+                search_results = self._get_chat_search_results(db, user_id, terms)
+                query = (
+                    query.outerjoin(search_results, search_results.c.chat_id == Chat.id)
+                    .filter(or_(search_results.c.chat_id.isnot(None), title_match))
+                    .order_by(
+                        search_results.c.rank.is_(None),
+                        search_results.c.rank,
+                        Chat.updated_at.desc(),
+                    )
+                )
+            elif search_text:
+                # Nothing to look up in the index, e.g. only punctuation
+                query = CHAT_LIST_KEYSET.apply(query.filter(title_match))
+            else:
+                query = CHAT_LIST_KEYSET.apply(query)
+
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
             log.info(f"The number of chats: {len(all_chats)}")
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_list_items(all_chats)
+
+    def search_chats_by_user_id_and_text(
+        self,
+        user_id: str,
+        search_text: str,
+        start_timestamp: Optional[int] = None,
+        end_timestamp: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 5,
+        db: Optional[Session] = None,
+    ) -> list[ChatSearchResultResponse]:
+        """
+        Return the user's unarchived chats best matching the search text, each with a
+        snippet of its best matching title or message.
+        """
+        terms = get_chat_search_terms(sanitize_text_for_db(search_text))
+        if not terms:
+            return []
+
+        with get_db_context(db) as db:
+            search_results = self._get_chat_search_results(db, user_id, terms)
+            query = (
+                db.query(Chat.id, Chat.title, Chat.updated_at)
+                .join(search_results, search_results.c.chat_id == Chat.id)
+                .filter(Chat.user_id == user_id, Chat.archived == False)
+            )
+
+            if start_timestamp:
+                query = query.filter(Chat.updated_at >= start_timestamp)
+            if end_timestamp:
+                query = query.filter(Chat.updated_at <= end_timestamp)
+
+            chats = (
+                query.order_by(search_results.c.rank, Chat.updated_at.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+
+            # Snippets are only extracted for the returned page
+            snippets = self._get_chat_search_snippets(
+                db, [chat.id for chat in chats], terms
+            )
+            return [
+                ChatSearchResultResponse(
+                    id=chat.id,
+                    title=chat.title,
+                    updated_at=chat.updated_at,
+                    snippet=snippets.get(chat.id, ""),
+                )
+                for chat in chats
+            ]
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1117,22 +1551,24 @@ class ChatTable:
         user_id: str,
         skip: int = 0,
         limit: int = 60,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = self._query_chat_list(db).filter(
+                Chat.folder_id == folder_id, Chat.user_id == user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
-            query = query.filter_by(archived=False)
+            query = query.filter(Chat.archived == False)
 
-            query = query.order_by(Chat.updated_at.desc())
+            query = CHAT_LIST_KEYSET.apply(query, cursor)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_list_items(query.all())
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1147,7 +1583,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: Optional[Session] = None
@@ -1160,7 +1596,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1179,9 +1615,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._query_chat_list(db).filter(Chat.user_id == user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -1204,9 +1640,11 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            all_chats = query.all()
-            log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            # Every chat of the tag: the sidebar loads tag views in one request, and
+            # an empty list means the tag is unused
+            query = CHAT_LIST_KEYSET.apply(query)
+
+            return self._to_chat_list_items(query.all())
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1227,7 +1665,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1319,6 +1757,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                db.query(ChatSearch).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1331,6 +1771,11 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                if db.query(
+                    exists().where(Chat.id == id, Chat.user_id == user_id)
+                ).scalar():
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+                    db.query(ChatSearch).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1345,6 +1790,12 @@ class ChatTable:
             with get_db_context(db) as db:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatSearch).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1357,6 +1808,20 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatSearch).filter(
+                    ChatSearch.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1492,7 +1957,7 @@ class ChatTable:
                 .all()
             )
 
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
 
 Chats = ChatTable()
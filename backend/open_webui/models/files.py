@@ -5,7 +5,8 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, String, Text, JSON, Index
+from open_webui.utils.pagination import Keyset
 
 log = logging.getLogger(__name__)
 
@@ -31,6 +32,15 @@ class File(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE user_id = ... AND (updated_at, id) < (...) ORDER BY updated_at DESC, id DESC
+        Index("file_user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
+    )
+
+
+# File listings are ordered most recently updated first
+FILE_LIST_KEYSET = Keyset(File.updated_at, File.id)
+
 
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -262,6 +272,7 @@ class FilesTable:
         filename: str = "*",
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> list[FileModel]:
         """
@@ -272,6 +283,7 @@ class FilesTable:
             filename: Glob pattern to match filenames (e.g., "*.txt"). Default "*" matches all.
             skip: Number of results to skip for pagination.
             limit: Maximum number of results to return.
+            cursor: Cursor of the page to return, continuing after the previous page.
             db: Optional database session.
 
         Returns:
@@ -289,7 +301,7 @@ class FilesTable:
 
             return [
                 FileModel.model_validate(file)
-                for file in query.order_by(File.updated_at.desc())
+                for file in FILE_LIST_KEYSET.apply(query, cursor)
                 .offset(skip)
                 .limit(limit)
                 .all()
@@ -31,6 +31,7 @@ from sqlalchemy import (
 
 from open_webui.utils.access_control import has_access
 from open_webui.utils.db.access_control import has_permission
+from open_webui.utils.pagination import Keyset
 
 
 log = logging.getLogger(__name__)
@@ -71,6 +72,18 @@ class Knowledge(Base):
     updated_at = Column(BigInteger)
 
 
+# Knowledge bases are listed most recently updated first
+KNOWLEDGE_LIST_KEYSET = Keyset(Knowledge.updated_at, Knowledge.id)
+
+# A file is listed once per knowledge base it belongs to
+KNOWLEDGE_FILE_LIST_KEYSET = Keyset(
+    File.updated_at,
+    File.id,
+    Knowledge.id,
+    key=lambda file: (file.updated_at, file.id, file.collection["id"]),
+)
+
+
 class KnowledgeModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -149,11 +162,13 @@ class FileUserResponse(FileModelResponse):
 class KnowledgeListResponse(BaseModel):
     items: list[KnowledgeUserModel]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class KnowledgeFileListResponse(BaseModel):
     items: list[FileUserResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class KnowledgeTable:
@@ -214,6 +229,7 @@ class KnowledgeTable:
         filter: dict,
         skip: int = 0,
         limit: int = 30,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> KnowledgeListResponse:
         try:
@@ -240,9 +256,9 @@ class KnowledgeTable:
 
                     query = has_permission(db, Knowledge, query, filter)
 
-                query = query.order_by(Knowledge.updated_at.desc())
-
                 total = query.count()
+
+                query = KNOWLEDGE_LIST_KEYSET.apply(query, cursor)
                 if skip:
                     query = query.offset(skip)
                 if limit:
@@ -267,13 +283,24 @@ class KnowledgeTable:
                         )
                     )
 
-                return KnowledgeListResponse(items=knowledge_bases, total=total)
+                return KnowledgeListResponse(
+                    items=knowledge_bases,
+                    total=total,
+                    next_cursor=KNOWLEDGE_LIST_KEYSET.get_next_cursor(
+                        knowledge_bases, limit
+                    ),
+                )
         except Exception as e:
             print(e)
             return KnowledgeListResponse(items=[], total=0)
 
     def search_knowledge_files(
-        self, filter: dict, skip: int = 0, limit: int = 30, db: Optional[Session] = None
+        self,
+        filter: dict,
+        skip: int = 0,
+        limit: int = 30,
+        cursor: Optional[str] = None,
+        db: Optional[Session] = None,
     ) -> KnowledgeFileListResponse:
         """
         Scalable version: search files across all knowledge bases the user has
@@ -299,12 +326,12 @@ class KnowledgeTable:
                     if q:
                         query = query.filter(File.filename.ilike(f"%{q}%"))
 
-                # Order by file changes
-                query = query.order_by(File.updated_at.desc())
-
                 # Count before pagination
                 total = query.count()
 
+                # Order by file changes
+                query = KNOWLEDGE_FILE_LIST_KEYSET.apply(query, cursor)
+
                 if skip:
                     query = query.offset(skip)
                 if limit:
@@ -330,7 +357,13 @@ class KnowledgeTable:
                         )
                     )
 
-                return KnowledgeFileListResponse(items=items, total=total)
+                return KnowledgeFileListResponse(
+                    items=items,
+                    total=total,
+                    next_cursor=KNOWLEDGE_FILE_LIST_KEYSET.get_next_cursor(
+                        items, limit
+                    ),
+                )
 
         except Exception as e:
             print("search_knowledge_files error:", e)
@@ -416,6 +449,7 @@ class KnowledgeTable:
         filter: dict,
         skip: int = 0,
         limit: int = 30,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> KnowledgeFileListResponse:
         try:
@@ -438,33 +472,22 @@ class KnowledgeTable:
                     elif view_option == "shared":
                         query = query.filter(KnowledgeFile.user_id != user_id)
 
-                    order_by = filter.get("order_by")
-                    direction = filter.get("direction")
-
-                    if order_by == "name":
-                        if direction == "asc":
-                            query = query.order_by(File.filename.asc())
-                        else:
-                            query = query.order_by(File.filename.desc())
-                    elif order_by == "created_at":
-                        if direction == "asc":
-                            query = query.order_by(File.created_at.asc())
-                        else:
-                            query = query.order_by(File.created_at.desc())
-                    elif order_by == "updated_at":
-                        if direction == "asc":
-                            query = query.order_by(File.updated_at.asc())
-                        else:
-                            query = query.order_by(File.updated_at.desc())
-                    else:
-                        query = query.order_by(File.updated_at.desc())
+                order_by = filter.get("order_by") if filter else None
+                descending = (filter.get("direction") if filter else None) != "asc"
 
+                if order_by == "name":
+                    keyset = Keyset(File.filename, File.id, descending=descending)
+                elif order_by == "created_at":
+                    keyset = Keyset(File.created_at, File.id, descending=descending)
+                elif order_by == "updated_at":
+                    keyset = Keyset(File.updated_at, File.id, descending=descending)
                 else:
-                    query = query.order_by(File.updated_at.desc())
+                    keyset = Keyset(File.updated_at, File.id)
 
                 # Count BEFORE pagination
                 total = query.count()
 
+                query = keyset.apply(query, cursor)
                 if skip:
                     query = query.offset(skip)
                 if limit:
@@ -487,7 +510,11 @@ class KnowledgeTable:
                         )
                     )
 
-                return KnowledgeFileListResponse(items=files, total=total)
+                return KnowledgeFileListResponse(
+                    items=files,
+                    total=total,
+                    next_cursor=keyset.get_next_cursor(files, limit),
+                )
         except Exception as e:
             print(e)
             return KnowledgeFileListResponse(items=[], total=0)
@@ -8,10 +8,11 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.users import Users, User, UserNameResponse
 from open_webui.models.channels import Channels, ChannelMember
+from open_webui.utils.pagination import Keyset
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -61,6 +62,15 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... AND (created_at, id) < (...) ORDER BY created_at DESC, id DESC
+        Index("message_channel_id_created_at_id_idx", "channel_id", "created_at", "id"),
+    )
+
+
+# Channel messages are listed newest first
+MESSAGE_LIST_KEYSET = Keyset(Message.created_at, Message.id)
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -303,16 +313,13 @@ class MessageTable:
         channel_id: str,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db_context(db) as db:
+            query = db.query(Message).filter_by(channel_id=channel_id, parent_id=None)
             all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+                MESSAGE_LIST_KEYSET.apply(query, cursor).offset(skip).limit(limit).all()
             )
 
             messages = []
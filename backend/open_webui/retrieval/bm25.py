@@ -0,0 +1,419 @@
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import RAG_BM25_INDEX_CACHE_SIZE, REDIS_KEY_PREFIX, REDIS_URL
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+
+def get_enriched_texts(collection_result: GetResult) -> list[str]:
+    enriched_texts = []
+    for idx, text in enumerate(collection_result.documents[0]):
+        metadata = collection_result.metadatas[0][idx]
+        metadata_parts = [text]
+
+        # Add filename (repeat twice for extra weight in BM25 scoring)
+        if metadata.get("name"):
+            filename = metadata["name"]
+            filename_tokens = (
+                filename.replace("_", " ").replace("-", " ").replace(".", " ")
+            )
+            metadata_parts.append(
+                f"Filename: {filename} {filename_tokens} {filename_tokens}"
+            )
+
+        # Add title if available
+        if metadata.get("title"):
+            metadata_parts.append(f"Title: {metadata['title']}")
+
+        # Add document section headings if available (from markdown splitter)
+        if metadata.get("headings") and isinstance(metadata["headings"], list):
+            headings = " > ".join(str(h) for h in metadata["headings"])
+            metadata_parts.append(f"Section: {headings}")
+
+        # Add source URL/path if available
+        if metadata.get("source"):
+            metadata_parts.append(f"Source: {metadata['source']}")
+
+        # Add snippet for web search results
+        if metadata.get("snippet"):
+            metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+        enriched_texts.append(" ".join(metadata_parts))
+
+    return enriched_texts
+
+
+class BM25Index:
+    """
+    Okapi BM25 index of the documents of a collection, scored like rank_bm25's
+    BM25Okapi used by BM25Retriever, but kept as an inverted index so documents can
+    be added and removed without re-tokenizing the whole collection and a query
+    only scores the documents containing its terms.
+    """
+
+    k1 = 1.5
+    b = 0.75
+    epsilon = 0.25
+
+    def __init__(self, enriched: bool = False):
+        self.enriched = enriched
+        self.documents = {}  # id -> (document, metadata, term frequencies, length)
+        self.postings = {}  # term -> {id: term frequency}
+        self.total_length = 0
+        self.lock = threading.Lock()
+        self._idf = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, result: GetResult):
+        """Add the documents of a get result, replacing those with the same ids."""
+        ids, documents, metadatas = (
+            result.ids[0],
+            result.documents[0],
+            result.metadatas[0],
+        )
+        texts = get_enriched_texts(result) if self.enriched else documents
+
+        with self.lock:
+            self._remove(ids)
+            for id, document, metadata, text in zip(ids, documents, metadatas, texts):
+                # Same tokenization as BM25Retriever's default preprocessing
+                frequencies = Counter(text.split())
+                length = sum(frequencies.values())
+                self.documents[id] = (document, metadata, frequencies, length)
+                self.total_length += length
+                for term, frequency in frequencies.items():
+                    self.postings.setdefault(term, {})[id] = frequency
+            self._idf = None
+
+    def remove(self, ids: list[str]):
+        with self.lock:
+            self._remove(ids)
+            self._idf = None
+
+    def _remove(self, ids: list[str]):
+        for id in ids:
+            if id not in self.documents:
+                continue
+
+            _, _, frequencies, length = self.documents.pop(id)
+            self.total_length -= length
+            for term in frequencies:
+                postings = self.postings[term]
+                del postings[id]
+                if not postings:
+                    del self.postings[term]
+
+    def _get_idf(self) -> dict:
+        if self._idf is None:
+            count = len(self.documents)
+            idf = {
+                term: math.log(count - len(postings) + 0.5)
+                - math.log(len(postings) + 0.5)
+                for term, postings in self.postings.items()
+            }
+
+            # Terms in more than half the documents get a small positive weight
+            average_idf = sum(idf.values()) / len(idf) if idf else 0
+            for term, value in idf.items():
+                if value < 0:
+                    idf[term] = self.epsilon * average_idf
+            self._idf = idf
+        return self._idf
+
+    def search(self, query: str, k: int) -> list[Document]:
+        """Return the k documents scoring highest for the query."""
+        with self.lock:
+            if not self.documents:
+                return []
+
+            idf = self._get_idf()
+            average_length = self.total_length / len(self.documents)
+
+            scores = {}
+            for term in query.split():
+                for id, frequency in self.postings.get(term, {}).items():
+                    length = self.documents[id][3]
+                    scores[id] = scores.get(id, 0) + idf[term] * (
+                        frequency
+                        * (self.k1 + 1)
+                        / (
+                            frequency
+                            + self.k1 * (1 - self.b + self.b * length / average_length)
+                        )
+                    )
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                Document(
+                    page_content=self.documents[id][0],
+                    metadata=self.documents[id][1],
+                )
+                for id, _ in top
+            ]
+
+
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.index.search(query, self.k)
+
+
+class BM25IndexEntry:
+    def __init__(self, generation: str, enriched: bool):
+        self.generation = generation
+        self.index = BM25Index(enriched=enriched)
+        self.offset = 0  # Bytes of the journal applied to the index
+        self.lock = threading.Lock()
+
+
+class BM25IndexCache:
+    """
+    BM25 indexes of collections for hybrid search, persisted on disk and shared by
+    the workers.
+
+    Each collection has a journal of the documents added to it since its index was
+    built, one JSON line per batch, and a generation that is replaced whenever the
+    collection changes in a way the journal can't follow (deleted documents or
+    collections). Indexes built from the journal are kept in memory, and caught up
+    with the lines appended by other workers or dropped when the generation changes.
+
+    Journals are shared by the workers of one host only. With a Redis client, the
+    generations are kept in Redis instead of the cache directory, so the replicas of
+    a multi-host deployment drop their indexes when any of them changes a
+    collection. Additions invalidate the index too in that case, as the other hosts
+    can't read the journal they would be appended to.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_size: int = RAG_BM25_INDEX_CACHE_SIZE,
+        redis=None,
+        redis_key_prefix: str = REDIS_KEY_PREFIX,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.redis = redis
+        self.redis_key_prefix = redis_key_prefix
+        self._entries = OrderedDict()  # (collection name, enriched) -> entry
+        self._lock = threading.Lock()
+
+    def _get_name(self, collection_name: str) -> str:
+        digest = hashlib.sha256(collection_name.encode()).hexdigest()[:12]
+        return f"{re.sub(r'[^A-Za-z0-9_-]', '_', collection_name)[:64]}-{digest}"
+
+    def _get_generation_path(self, collection_name: str) -> Path:
+        return self.path / f"{self._get_name(collection_name)}.generation"
+
+    def _get_journal_path(self, collection_name: str, generation: str) -> Path:
+        return self.path / f"{self._get_name(collection_name)}.{generation}.jsonl"
+
+    def _get_redis_key(self, name: Optional[str] = None) -> str:
+        if name is None:
+            return f"{self.redis_key_prefix}:bm25:generation"
+        return f"{self.redis_key_prefix}:bm25:{name}:generation"
+
+    def _get_generation(self, collection_name: str) -> str:
+        if self.redis is not None:
+            # Prefixed with the generation of all collections, replaced by reset()
+            epoch = self.redis.get(self._get_redis_key()) or "0"
+            name = self._get_name(collection_name)
+            return f"{epoch}-{self.redis.get(self._get_redis_key(name)) or '0'}"
+
+        try:
+            return self._get_generation_path(collection_name).read_text().strip()
+        except FileNotFoundError:
+            return "0"
+
+    def _dump(self, result: GetResult) -> bytes:
+        line = json.dumps(
+            {
+                "ids": result.ids[0],
+                "documents": result.documents[0],
+                "metadatas": result.metadatas[0],
+            },
+            default=str,
+        )
+        return f"{line}\n".encode()
+
+    def _build(self, collection_name: str, entry: BM25IndexEntry, fetch) -> bool:
+        """
+        Build the index of a collection from the vector database and write its
+        journal. Return False if the collection is empty or doesn't exist.
+        """
+        result = fetch()
+        if not result or not result.ids or not result.ids[0]:
+            return False
+
+        entry.index.add(result)
+
+        journal_path = self._get_journal_path(collection_name, entry.generation)
+        temp_path = journal_path.with_name(f"{journal_path.name}.{uuid.uuid4()}")
+        data = self._dump(result)
+        temp_path.write_bytes(data)
+        try:
+            # Fails if another worker built the journal meanwhile, documents may
+            # have been appended to it since, so it's kept and caught up with
+            os.link(temp_path, journal_path)
+            entry.offset = len(data)
+        except FileExistsError:
+            entry.index = BM25Index(enriched=entry.index.enriched)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        if self.redis is not None:
+            # Left behind by invalidations made on other hosts
+            name = self._get_name(collection_name)
+            for path in self.path.glob(f"{name}.*.jsonl"):
+                if path != journal_path:
+                    path.unlink(missing_ok=True)
+
+        if self._get_generation(collection_name) != entry.generation:
+            # Invalidated while building, documents may be missing from the journal
+            journal_path.unlink(missing_ok=True)
+        return True
+
+    def _catch_up(self, collection_name: str, entry: BM25IndexEntry):
+        journal_path = self._get_journal_path(collection_name, entry.generation)
+        try:
+            with open(journal_path, "rb") as f:
+                f.seek(entry.offset)
+                data = f.read()
+        except FileNotFoundError:
+            # Invalidated since the generation was read
+            return
+
+        # Lines being appended by another worker are applied on the next query
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line:
+                batch = json.loads(line)
+                entry.index.add(
+                    GetResult(
+                        ids=[batch["ids"]],
+                        documents=[batch["documents"]],
+                        metadatas=[batch["metadatas"]],
+                    )
+                )
+        entry.offset += end
+
+    def get_index(
+        self,
+        collection_name: str,
+        fetch: Callable[[], Optional[GetResult]],
+        enriched: bool = False,
+    ) -> Optional[BM25Index]:
+        """
+        Return the BM25 index of a collection, None if the collection is empty.
+
+        :param fetch: Function returning all documents of the collection, called
+            when no index of the collection has been built yet
+        :param enriched: Index the documents enriched with their metadata
+        """
+        generation = self._get_generation(collection_name)
+        key = (collection_name, enriched)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != generation:
+                entry = BM25IndexEntry(generation, enriched)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        with entry.lock:
+            journal_path = self._get_journal_path(collection_name, generation)
+            if entry.offset == 0 and not journal_path.exists():
+                if not self._build(collection_name, entry, fetch):
+                    with self._lock:
+                        self._entries.pop(key, None)
+                    return None
+
+            self._catch_up(collection_name, entry)
+
+        return entry.index if len(entry.index) else None
+
+    def add(self, collection_name: str, result: GetResult):
+        """Add documents inserted into a collection to its index."""
+        if self.redis is not None:
+            # The indexes of the other hosts can't catch up with a local journal
+            self.invalidate(collection_name)
+            return
+
+        generation = self._get_generation(collection_name)
+        try:
+            fd = os.open(
+                self._get_journal_path(collection_name, generation),
+                os.O_WRONLY | os.O_APPEND,
+            )
+        except FileNotFoundError:
+            # No index yet, or one being built that may miss these documents
+            self.invalidate(collection_name)
+            return
+
+        try:
+            os.write(fd, self._dump(result))
+        finally:
+            os.close(fd)
+
+    def _invalidate(self, name: str):
+        generation = uuid.uuid4().hex
+        if self.redis is not None:
+            self.redis.set(self._get_redis_key(name), generation)
+        else:
+            temp_path = self.path / f"{name}.generation.{generation}"
+            temp_path.write_text(generation)
+            os.replace(temp_path, self.path / f"{name}.generation")
+
+        for journal_path in self.path.glob(f"{name}.*.jsonl"):
+            journal_path.unlink(missing_ok=True)
+
+    def invalidate(self, collection_name: str):
+        """Drop the index of a collection, rebuilt on its next query."""
+        self._invalidate(self._get_name(collection_name))
+        with self._lock:
+            for enriched in (False, True):
+                self._entries.pop((collection_name, enriched), None)
+
+    def reset(self):
+        """Drop the indexes of all collections."""
+        if self.redis is not None:
+            self.redis.set(self._get_redis_key(), uuid.uuid4().hex)
+            for path in self.path.iterdir():
+                path.unlink(missing_ok=True)
+        else:
+            for name in {path.name.split(".")[0] for path in self.path.iterdir()}:
+                self._invalidate(name)
+        with self._lock:
+            self._entries.clear()
+
+
+BM25_INDEXES = BM25IndexCache(
+    CACHE_DIR / "bm25", redis=get_redis_client() if REDIS_URL else None
+)
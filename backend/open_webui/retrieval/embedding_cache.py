@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_CACHE_TTL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+
+def get_embedding_cache_key(
+    engine: str, model: str, prefix: Optional[str], text: str
+) -> str:
+    return hashlib.sha256(
+        "\0".join([engine or "", model or "", prefix or "", text]).encode()
+    ).hexdigest()
+
+
+# Embeddings are stored as float32, the precision embedding models compute in
+def pack_embedding(embedding: list) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    embedding = array("f")
+    embedding.frombytes(data)
+    return embedding.tolist()
+
+
+class RedisEmbeddingCacheBackend:
+    name = "redis"
+
+    def __init__(self, redis, key_prefix: str, ttl: int):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+
+    def _get_key(self, key: str) -> str:
+        return f"{self.key_prefix}:embedding:{key}"
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        pipeline = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.get(self._get_key(key))
+            # Refreshing the expiry keeps recently used embeddings
+            pipeline.expire(self._get_key(key), self.ttl)
+        return pipeline.execute()[::2]
+
+    def set_many(self, items: dict[str, bytes]):
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, data in items.items():
+            pipeline.set(self._get_key(key), data, ex=self.ttl)
+        pipeline.execute()
+
+
+class DiskEmbeddingCacheBackend:
+    name = "disk"
+
+    def __init__(self, path: Path, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS embedding "
+            "(key TEXT PRIMARY KEY, data BLOB NOT NULL, used_at INTEGER NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS embedding_used_at_idx ON embedding (used_at)"
+        )
+        self.db.commit()
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        found = {}
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                found.update(
+                    self.db.execute(
+                        "SELECT key, data FROM embedding "
+                        f"WHERE key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    ).fetchall()
+                )
+
+                hits = [key for key in batch if key in found]
+                if hits:
+                    self.db.execute(
+                        f"UPDATE embedding SET used_at = ? "
+                        f"WHERE key IN ({','.join('?' * len(hits))})",
+                        [time.time_ns(), *hits],
+                    )
+            self.db.commit()
+        return [found.get(key) for key in keys]
+
+    def set_many(self, items: dict[str, bytes]):
+        used_at = time.time_ns()
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO embedding (key, data, used_at) "
+                "VALUES (?, ?, ?)",
+                [(key, data, used_at) for key, data in items.items()],
+            )
+            self.db.execute(
+                "DELETE FROM embedding WHERE key IN (SELECT key FROM embedding "
+                "ORDER BY used_at LIMIT max((SELECT COUNT(*) FROM embedding) - ?, 0))",
+                [self.max_entries],
+            )
+            self.db.commit()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings, keyed by the hash of the text, the
+    embedding engine and model, and the prefix.
+
+    Recently used embeddings are kept in memory, in front of a backend shared by the
+    workers. Errors of the backend are logged and count as misses, so the cache can
+    never fail an embedding request.
+    """
+
+    def __init__(self, size: int, backend=None):
+        self.size = size
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> packed embedding
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.memory_hits = 0
+        self.backend_hits = 0
+        self.backend_errors = 0
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def _set_memory(self, key: str, data: bytes):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    async def get_embeddings(
+        self,
+        texts: Union[str, list[str]],
+        embed: Callable[[list[str]], Awaitable[Optional[list]]],
+        engine: str,
+        model: str,
+        prefix: Optional[str] = None,
+    ):
+        """
+        Return the embeddings of the texts, computing only those not cached with
+        embed, once per distinct text.
+        """
+        if isinstance(texts, str):
+            embeddings = await self.get_embeddings(
+                [texts], embed, engine, model, prefix
+            )
+            return embeddings[0] if embeddings else embeddings
+
+        keys = [get_embedding_cache_key(engine, model, prefix, text) for text in texts]
+        self.requests += len(keys)
+
+        found = {}
+        for key in dict.fromkeys(keys):
+            data = self._get_memory(key)
+            if data is not None:
+                found[key] = data
+        self.memory_hits += sum(key in found for key in keys)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.backend is not None:
+            try:
+                results = await asyncio.to_thread(self.backend.get_many, missing)
+                backend_found = {
+                    key: data for key, data in zip(missing, results) if data is not None
+                }
+                for key, data in backend_found.items():
+                    found[key] = data
+                    self._set_memory(key, data)
+                self.backend_hits += sum(key in backend_found for key in keys)
+            except Exception as e:
+                self.backend_errors += 1
+                log.warning(f"Failed to read the embedding cache: {e}")
+
+        embeddings = {key: unpack_embedding(data) for key, data in found.items()}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            computed = await embed(list(missing.values()))
+            if not computed or len(computed) != len(missing):
+                # Failed embedding requests are returned as they are
+                return computed
+
+            items = {}
+            for key, embedding in zip(missing, computed):
+                embeddings[key] = embedding
+                items[key] = pack_embedding(embedding)
+                self._set_memory(key, items[key])
+
+            if self.backend is not None:
+                try:
+                    await asyncio.to_thread(self.backend.set_many, items)
+                except Exception as e:
+                    self.backend_errors += 1
+                    log.warning(f"Failed to write the embedding cache: {e}")
+
+        return [embeddings[key] for key in keys]
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.backend_hits
+        return {
+            "backend": self.backend.name if self.backend is not None else None,
+            "requests": self.requests,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.requests - hits,
+            "hit_rate": round(hits / self.requests, 4) if self.requests else 0,
+            "backend_errors": self.backend_errors,
+            "memory_entries": len(self._entries),
+        }
+
+
+def get_embedding_cache_backend():
+    try:
+        if REDIS_URL:
+            return RedisEmbeddingCacheBackend(
+                get_redis_connection(
+                    redis_url=REDIS_URL,
+                    redis_sentinels=get_sentinels_from_env(
+                        REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                    ),
+                    redis_cluster=REDIS_CLUSTER,
+                    decode_responses=False,
+                ),
+                REDIS_KEY_PREFIX,
+                RAG_EMBEDDING_CACHE_TTL,
+            )
+        return DiskEmbeddingCacheBackend(
+            CACHE_DIR / "embeddings.db", RAG_EMBEDDING_CACHE_MAX_ENTRIES
+        )
+    except Exception as e:
+        log.warning(f"Embedding cache limited to memory: {e}")
+        return None
+
+
+EMBEDDING_CACHE = (
+    EmbeddingCache(RAG_EMBEDDING_CACHE_SIZE, get_embedding_cache_backend())
+    if ENABLE_RAG_EMBEDDING_CACHE
+    else None
+)
@@ -3,7 +3,7 @@ import logging
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
@@ -140,6 +140,48 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def get_batches(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[list[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        # Page through the items of the collection, fetching only the included fields.
+        if not self.has_collection(collection_name):
+            return
+
+        include = ["documents", "metadatas"] if include is None else include
+        if filter and len(filter) > 1:
+            where = {"$and": [{key: value} for key, value in filter.items()]}
+        else:
+            where = filter or None
+
+        collection = self.client.get_collection(name=collection_name)
+        offset = 0
+        while True:
+            result = collection.get(
+                where=where, limit=batch_size, offset=offset, include=include
+            )
+            if not result["ids"]:
+                return
+
+            yield GetResult(
+                **{
+                    "ids": [result["ids"]],
+                    "documents": (
+                        [result["documents"]] if "documents" in include else None
+                    ),
+                    "metadatas": (
+                        [result["metadatas"]] if "metadatas" in include else None
+                    ),
+                }
+            )
+
+            if len(result["ids"]) < batch_size:
+                return
+            offset += batch_size
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
@@ -4,7 +4,7 @@ from pymilvus import connections, Collection
 
 import json
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
 from open_webui.retrieval.vector.main import (
@@ -263,6 +263,57 @@ class MilvusClient(VectorDBBase):
         # This will use the paginated query logic.
         return self.query(collection_name=collection_name, filter={}, limit=-1)
 
+    def get_batches(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[list[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        # Iterate over the collection, fetching only the included fields.
+        connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
+
+        collection_name = collection_name.replace("-", "_")
+        if not self.has_collection(collection_name):
+            return
+
+        include = ["documents", "metadatas"] if include is None else include
+        output_fields = ["id"]
+        if "documents" in include:
+            output_fields.append("data")
+        if "metadatas" in include:
+            output_fields.append("metadata")
+
+        filter_expressions = []
+        for key, value in (filter or {}).items():
+            if isinstance(value, str):
+                filter_expressions.append(f'metadata["{key}"] == "{value}"')
+            else:
+                filter_expressions.append(f'metadata["{key}"] == {value}')
+
+        collection = Collection(f"{self.collection_prefix}_{collection_name}")
+        collection.load()
+
+        iterator = collection.query_iterator(
+            batch_size=batch_size,
+            expr=" && ".join(filter_expressions),
+            output_fields=output_fields,
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    return
+
+                result = self._result_to_get_result([batch])
+                yield GetResult(
+                    ids=result.ids,
+                    documents=result.documents if "documents" in include else None,
+                    metadatas=result.metadatas if "metadatas" in include else None,
+                )
+        finally:
+            iterator.close()
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection_name = collection_name.replace("-", "_")
@@ -1,4 +1,5 @@
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+import io
 import logging
 import json
 from sqlalchemy import (
@@ -20,7 +21,7 @@ from sqlalchemy import (
 from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
-from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB, array
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
@@ -62,6 +63,18 @@ Base = declarative_base()
 log = logging.getLogger(__name__)
 
 
+def escape_copy_value(value: Optional[str]) -> str:
+    """Escape a value for the text format of COPY."""
+    if value is None:
+        return "\\N"
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
 def pgcrypto_encrypt(val, key):
     return func.pgp_sym_encrypt(val, literal(key))
 
@@ -90,9 +103,9 @@ class PgvectorClient(VectorDBBase):
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
-            from open_webui.internal.db import ScopedSession
+            from open_webui.internal.db import SessionLocal
 
-            self.session = ScopedSession
+            self.SessionLocal = SessionLocal
         else:
             if isinstance(PGVECTOR_POOL_SIZE, int):
                 if PGVECTOR_POOL_SIZE > 0:
@@ -112,16 +125,18 @@ class PgvectorClient(VectorDBBase):
             else:
                 engine = create_engine(PGVECTOR_DB_URL, pool_pre_ping=True)
 
-            SessionLocal = sessionmaker(
+            # Each operation uses a session of its own, operations run concurrently
+            # from threads and the event loop
+            self.SessionLocal = sessionmaker(
                 autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
             )
-            self.session = scoped_session(SessionLocal)
 
+        session = self.SessionLocal()
         try:
             # Ensure the pgvector extension is available
             # Use a conditional check to avoid permission issues on Azure PostgreSQL
             if PGVECTOR_CREATE_EXTENSION:
-                self.session.execute(
+                session.execute(
                     text(
                         """
                     DO $$
@@ -137,7 +152,7 @@ class PgvectorClient(VectorDBBase):
             if PGVECTOR_PGCRYPTO:
                 # Ensure the pgcrypto extension is available for encryption
                 # Use a conditional check to avoid permission issues on Azure PostgreSQL
-                self.session.execute(
+                session.execute(
                     text(
                         """
                     DO $$
@@ -156,29 +171,31 @@ class PgvectorClient(VectorDBBase):
                     )
 
             # Check vector length consistency
-            self.check_vector_length()
+            self.check_vector_length(session)
 
             # Create the tables if they do not exist
             # Base.metadata.create_all requires a bind (engine or connection)
             # Get the connection from the session
-            connection = self.session.connection()
+            connection = session.connection()
             Base.metadata.create_all(bind=connection)
 
             index_method, index_options = self._vector_index_configuration()
-            self._ensure_vector_index(index_method, index_options)
+            self._ensure_vector_index(session, index_method, index_options)
 
-            self.session.execute(
+            session.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
                     "ON document_chunk (collection_name);"
                 )
             )
-            self.session.commit()
+            session.commit()
             log.info("Initialization complete.")
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during initialization: {e}")
             raise
+        finally:
+            session.close()
 
     @staticmethod
     def _extract_index_method(index_def: Optional[str]) -> Optional[str]:
@@ -213,9 +230,11 @@ class PgvectorClient(VectorDBBase):
 
         return index_method, index_options
 
-    def _ensure_vector_index(self, index_method: str, index_options: str) -> None:
+    def _ensure_vector_index(
+        self, session, index_method: str, index_options: str
+    ) -> None:
         index_name = "idx_document_chunk_vector"
-        existing_index_def = self.session.execute(
+        existing_index_def = session.execute(
             text(
                 """
                 SELECT indexdef
@@ -244,7 +263,7 @@ class PgvectorClient(VectorDBBase):
             )
             if index_options:
                 index_sql = f"{index_sql} {index_options}"
-            self.session.execute(text(index_sql))
+            session.execute(text(index_sql))
             log.info(
                 "Ensured vector index '%s' using %s%s.",
                 index_name,
@@ -252,7 +271,7 @@ class PgvectorClient(VectorDBBase):
                 f" {index_options}" if index_options else "",
             )
 
-    def check_vector_length(self) -> None:
+    def check_vector_length(self, session) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
         Raises an exception if there is a mismatch.
@@ -261,7 +280,7 @@ class PgvectorClient(VectorDBBase):
         try:
             # Attempt to reflect the 'document_chunk' table
             document_chunk_table = Table(
-                "document_chunk", metadata, autoload_with=self.session.bind
+                "document_chunk", metadata, autoload_with=session.bind
             )
         except NoSuchTableError:
             # Table does not exist; no action needed
@@ -301,127 +320,123 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
+    def _write_items(
+        self, session, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> None:
+        """
+        Write items with one COPY into a temporary table and one INSERT ... SELECT
+        from it, which also encrypts the text and metadata of all rows at once when
+        pgcrypto is enabled.
+        """
+        rows = []
+        for item in items:
+            vector = self.adjust_vector_length(item["vector"])
+            metadata = (
+                item["metadata"]
+                if PGVECTOR_PGCRYPTO
+                else process_metadata(item["metadata"])
+            )
+            rows.append(
+                {
+                    "id": item["id"],
+                    "vector": f"[{','.join(map(str, vector))}]",
+                    "collection_name": collection_name,
+                    "text": item["text"],
+                    "vmetadata": json.dumps(metadata),
+                }
+            )
 
-            else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=process_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
-                log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+        session.execute(
+            text(
+                "CREATE TEMPORARY TABLE document_chunk_copy "
+                "(id TEXT, vector TEXT, collection_name TEXT, "
+                "text TEXT, vmetadata TEXT) "
+                "ON COMMIT DROP"
+            )
+        )
+
+        cursor = session.connection().connection.cursor()
+        if hasattr(cursor, "copy_expert"):
+            data = io.StringIO(
+                "".join(
+                    "\t".join(escape_copy_value(value) for value in row.values()) + "\n"
+                    for row in rows
                 )
+            )
+            cursor.copy_expert("COPY document_chunk_copy FROM STDIN", data)
+        else:
+            # Drivers without COPY support insert the rows in batches
+            session.execute(
+                text(
+                    "INSERT INTO document_chunk_copy VALUES "
+                    "(:id, :vector, :collection_name, :text, :vmetadata)"
+                ),
+                rows,
+            )
+
+        vector_type = f"{'halfvec' if USE_HALFVEC else 'vector'}({VECTOR_LENGTH})"
+        if PGVECTOR_PGCRYPTO:
+            columns = (
+                f"id, vector::{vector_type}, collection_name, "
+                "pgp_sym_encrypt(text, :key), pgp_sym_encrypt(vmetadata, :key)"
+            )
+        else:
+            columns = (
+                f"id, vector::{vector_type}, collection_name, text, vmetadata::jsonb"
+            )
+
+        if upsert:
+            on_conflict = (
+                "ON CONFLICT (id) DO UPDATE SET "
+                "vector = EXCLUDED.vector, "
+                "collection_name = EXCLUDED.collection_name, "
+                "text = EXCLUDED.text, "
+                "vmetadata = EXCLUDED.vmetadata"
+            )
+        else:
+            on_conflict = "ON CONFLICT (id) DO NOTHING" if PGVECTOR_PGCRYPTO else ""
+
+        session.execute(
+            text(
+                "INSERT INTO document_chunk "
+                "(id, vector, collection_name, text, vmetadata) "
+                f"SELECT {columns} FROM document_chunk_copy {on_conflict}"
+            ),
+            {"key": PGVECTOR_PGCRYPTO_KEY} if PGVECTOR_PGCRYPTO else {},
+        )
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        session = self.SessionLocal()
+        try:
+            self._write_items(session, collection_name, items, upsert=False)
+            session.commit()
+            log.info(
+                f"Inserted {len(items)} items into collection '{collection_name}'."
+            )
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during insert: {e}")
             raise
+        finally:
+            session.close()
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        # A row can only be updated once per statement, the last item of an id wins
+        items = list({item["id"]: item for item in items}.values())
+
+        session = self.SessionLocal()
         try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = process_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=process_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
-                )
+            self._write_items(session, collection_name, items, upsert=True)
+            session.commit()
+            log.info(
+                f"Upserted {len(items)} items into collection '{collection_name}'."
+            )
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during upsert: {e}")
             raise
+        finally:
+            session.close()
 
     def search(
         self,
@@ -430,6 +445,7 @@ class PgvectorClient(VectorDBBase):
         filter: Optional[Dict[str, Any]] = None,
         limit: int = 10,
     ) -> Optional[SearchResult]:
+        session = self.SessionLocal()
         try:
             if not vectors:
                 return None
@@ -539,7 +555,7 @@ class PgvectorClient(VectorDBBase):
                 .order_by(query_vectors.c.qid, subq.c.distance)
             )
 
-            result_proxy = self.session.execute(stmt)
+            result_proxy = session.execute(stmt)
             results = result_proxy.all()
 
             ids = [[] for _ in range(num_queries)]
@@ -564,18 +580,21 @@ class PgvectorClient(VectorDBBase):
                 documents[qid].append(row.text)
                 metadatas[qid].append(row.vmetadata)
 
-            self.session.rollback()  # read-only transaction
+            session.rollback()  # read-only transaction
             return SearchResult(
                 ids=ids, distances=distances, documents=documents, metadatas=metadatas
             )
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during search: {e}")
             return None
+        finally:
+            session.close()
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
     ) -> Optional[GetResult]:
+        session = self.SessionLocal()
         try:
             if PGVECTOR_PGCRYPTO:
                 # Build where clause for vmetadata filter
@@ -599,9 +618,9 @@ class PgvectorClient(VectorDBBase):
                 ).where(*where_clauses)
                 if limit is not None:
                     stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
+                results = session.execute(stmt).all()
             else:
-                query = self.session.query(DocumentChunk).filter(
+                query = session.query(DocumentChunk).filter(
                     DocumentChunk.collection_name == collection_name
                 )
 
@@ -622,20 +641,23 @@ class PgvectorClient(VectorDBBase):
             documents = [[result.text for result in results]]
             metadatas = [[result.vmetadata for result in results]]
 
-            self.session.rollback()  # read-only transaction
+            session.rollback()  # read-only transaction
             return GetResult(
                 ids=ids,
                 documents=documents,
                 metadatas=metadatas,
             )
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during query: {e}")
             return None
+        finally:
+            session.close()
 
     def get(
         self, collection_name: str, limit: Optional[int] = None
     ) -> Optional[GetResult]:
+        session = self.SessionLocal()
         try:
             if PGVECTOR_PGCRYPTO:
                 stmt = select(
@@ -649,13 +671,13 @@ class PgvectorClient(VectorDBBase):
                 ).where(DocumentChunk.collection_name == collection_name)
                 if limit is not None:
                     stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
+                results = session.execute(stmt).all()
                 ids = [[row.id for row in results]]
                 documents = [[row.text for row in results]]
                 metadatas = [[row.vmetadata for row in results]]
             else:
 
-                query = self.session.query(DocumentChunk).filter(
+                query = session.query(DocumentChunk).filter(
                     DocumentChunk.collection_name == collection_name
                 )
                 if limit is not None:
@@ -670,12 +692,83 @@ class PgvectorClient(VectorDBBase):
                 documents = [[result.text for result in results]]
                 metadatas = [[result.vmetadata for result in results]]
 
-            self.session.rollback()  # read-only transaction
+            session.rollback()  # read-only transaction
             return GetResult(ids=ids, documents=documents, metadatas=metadatas)
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during get: {e}")
             return None
+        finally:
+            session.close()
+
+    def get_batches(
+        self,
+        collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        # Page through the collection ordered by id, each page starting after the
+        # last id of the previous one, so pages are read from the primary key index
+        include = ["documents", "metadatas"] if include is None else include
+
+        if PGVECTOR_PGCRYPTO:
+            text_column = pgcrypto_decrypt(
+                DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+            )
+            metadata_column = pgcrypto_decrypt(
+                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+            )
+        else:
+            text_column = DocumentChunk.text
+            metadata_column = DocumentChunk.vmetadata
+
+        columns = [DocumentChunk.id]
+        if "documents" in include:
+            columns.append(text_column.label("text"))
+        if "metadatas" in include:
+            columns.append(metadata_column.label("vmetadata"))
+
+        where_clauses = [DocumentChunk.collection_name == collection_name]
+        for key, value in (filter or {}).items():
+            where_clauses.append(metadata_column[key].astext == str(value))
+
+        last_id = None
+        while True:
+            stmt = select(*columns).where(*where_clauses)
+            if last_id is not None:
+                stmt = stmt.where(DocumentChunk.id > last_id)
+            stmt = stmt.order_by(DocumentChunk.id).limit(batch_size)
+
+            session = self.SessionLocal()
+            try:
+                results = session.execute(stmt).all()
+                session.rollback()  # read-only transaction
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during get_batches: {e}")
+                raise
+            finally:
+                session.close()
+
+            if not results:
+                return
+
+            yield GetResult(
+                ids=[[row.id for row in results]],
+                documents=(
+                    [[row.text for row in results]] if "documents" in include else None
+                ),
+                metadatas=(
+                    [[row.vmetadata for row in results]]
+                    if "metadatas" in include
+                    else None
+                ),
+            )
+
+            if len(results) < batch_size:
+                return
+            last_id = results[-1].id
 
     def delete(
         self,
@@ -683,6 +776,7 @@ class PgvectorClient(VectorDBBase):
         ids: Optional[List[str]] = None,
         filter: Optional[Dict[str, Any]] = None,
     ) -> None:
+        session = self.SessionLocal()
         try:
             if PGVECTOR_PGCRYPTO:
                 wheres = [DocumentChunk.collection_name == collection_name]
@@ -697,10 +791,10 @@ class PgvectorClient(VectorDBBase):
                             == str(value)
                         )
                 stmt = DocumentChunk.__table__.delete().where(*wheres)
-                result = self.session.execute(stmt)
+                result = session.execute(stmt)
                 deleted = result.rowcount
             else:
-                query = self.session.query(DocumentChunk).filter(
+                query = session.query(DocumentChunk).filter(
                     DocumentChunk.collection_name == collection_name
                 )
                 if ids:
@@ -711,42 +805,50 @@ class PgvectorClient(VectorDBBase):
                             DocumentChunk.vmetadata[key].astext == str(value)
                         )
                 deleted = query.delete(synchronize_session=False)
-            self.session.commit()
+            session.commit()
             log.info(f"Deleted {deleted} items from collection '{collection_name}'.")
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during delete: {e}")
             raise
+        finally:
+            session.close()
 
     def reset(self) -> None:
+        session = self.SessionLocal()
         try:
-            deleted = self.session.query(DocumentChunk).delete()
-            self.session.commit()
+            deleted = session.query(DocumentChunk).delete()
+            session.commit()
             log.info(
                 f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
             )
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during reset: {e}")
             raise
+        finally:
+            session.close()
 
     def close(self) -> None:
         pass
 
     def has_collection(self, collection_name: str) -> bool:
+        session = self.SessionLocal()
         try:
             exists = (
-                self.session.query(DocumentChunk)
+                session.query(DocumentChunk)
                 .filter(DocumentChunk.collection_name == collection_name)
                 .first()
                 is not None
             )
-            self.session.rollback()  # read-only transaction
+            session.rollback()  # read-only transaction
             return exists
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error checking collection existence: {e}")
             return False
+        finally:
+            session.close()
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
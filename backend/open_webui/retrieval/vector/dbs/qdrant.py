@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, Optional
 import logging
 from urllib.parse import urlparse
 
@@ -203,6 +203,65 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_batches(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[list[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        # Scroll through the collection, fetching only the included payload fields.
+        if not self.has_collection(collection_name):
+            return
+
+        include = ["documents", "metadatas"] if include is None else include
+        payload = [
+            field
+            for field, name in (("text", "documents"), ("metadata", "metadatas"))
+            if name in include
+        ]
+
+        scroll_filter = None
+        if filter:
+            scroll_filter = models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key=f"metadata.{key}", match=models.MatchValue(value=value)
+                    )
+                    for key, value in filter.items()
+                ]
+            )
+
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=scroll_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=payload or False,
+                with_vectors=False,
+            )
+            if not points:
+                return
+
+            yield GetResult(
+                ids=[[point.id for point in points]],
+                documents=(
+                    [[point.payload["text"] for point in points]]
+                    if "documents" in include
+                    else None
+                ),
+                metadatas=(
+                    [[point.payload["metadata"] for point in points]]
+                    if "metadatas" in include
+                    else None
+                ),
+            )
+
+            if offset is None:
+                return
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 
 class VectorItem(BaseModel):
@@ -74,6 +74,42 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_batches(
+        self,
+        collection_name: str,
+        filter: Optional[Dict] = None,
+        include: Optional[List[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        """
+        Retrieve the vectors of a collection in batches of at most batch_size,
+        optionally only those matching the metadata filter.
+
+        :param include: Fields to retrieve besides the ids, "documents" and
+            "metadatas" by default. Fields not included are None.
+
+        Backends that can page through a collection override this, by default all
+        the vectors are retrieved at once and split into batches.
+        """
+        include = ["documents", "metadatas"] if include is None else include
+        result = (
+            self.query(collection_name, filter) if filter else self.get(collection_name)
+        )
+        if not result or not result.ids or not result.ids[0]:
+            return
+
+        for start in range(0, len(result.ids[0]), batch_size):
+            end = start + batch_size
+            yield GetResult(
+                ids=[result.ids[0][start:end]],
+                documents=(
+                    [result.documents[0][start:end]] if "documents" in include else None
+                ),
+                metadatas=(
+                    [result.metadatas[0][start:end]] if "metadatas" in include else None
+                ),
+            )
+
     @abstractmethod
     def delete(
         self,
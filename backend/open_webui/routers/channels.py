@@ -41,6 +41,7 @@ from open_webui.models.messages import (
     MessageResponse,
     MessageWithReactionsResponse,
     MessageForm,
+    MESSAGE_LIST_KEYSET,
 )
 
 
@@ -67,6 +68,7 @@ from open_webui.utils.access_control import (
 )
 from open_webui.utils.webhook import post_webhook
 from open_webui.utils.channels import extract_mentions, replace_mentions
+from open_webui.utils.pagination import set_next_cursor
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
 
@@ -782,9 +784,11 @@ class MessageUserResponse(MessageResponse):
 @router.get("/{id}/messages", response_model=list[MessageUserResponse])
 async def get_channel_messages(
     request: Request,
+    response: Response,
     id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -812,10 +816,16 @@ async def get_channel_messages(
             id, user.id, db=db
         )  # Ensure user is a member of the channel
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit, db=db)
+    try:
+        message_list = Messages.get_messages_by_channel_id(
+            id, skip, limit, cursor=cursor, db=db
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     if not message_list:
         return []
+    set_next_cursor(response, MESSAGE_LIST_KEYSET, message_list, limit)
 
     # Batch fetch all users in a single query (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
@@ -3,7 +3,7 @@ import logging
 from typing import Optional
 from sqlalchemy.orm import Session
 import asyncio
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 
 from open_webui.utils.misc import get_message_list
@@ -15,7 +15,8 @@ from open_webui.models.chats import (
     ChatsImportForm,
     ChatResponse,
     Chats,
-    ChatTitleIdResponse,
+    ChatListItemResponse,
+    CHAT_LIST_KEYSET,
     ChatStatsExport,
     AggregateChatStats,
     ChatBody,
@@ -34,6 +35,7 @@ from pydantic import BaseModel
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.pagination import set_next_cursor
 
 log = logging.getLogger(__name__)
 
@@ -44,28 +46,34 @@ router = APIRouter()
 ############################
 
 
-@router.get("/", response_model=list[ChatTitleIdResponse])
-@router.get("/list", response_model=list[ChatTitleIdResponse])
+@router.get("/", response_model=list[ChatListItemResponse])
+@router.get("/list", response_model=list[ChatListItemResponse])
 def get_session_user_chat_list(
+    response: Response,
     user=Depends(get_verified_user),
     page: Optional[int] = None,
     include_pinned: Optional[bool] = False,
     include_folders: Optional[bool] = False,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_session),
 ):
     try:
-        if page is not None:
+        if page is not None or cursor is not None:
             limit = 60
-            skip = (page - 1) * limit
+            # A cursor continues after the last chat of the previous page
+            skip = (page - 1) * limit if cursor is None else 0
 
-            return Chats.get_chat_title_id_list_by_user_id(
+            chat_list = Chats.get_chat_title_id_list_by_user_id(
                 user.id,
                 include_folders=include_folders,
                 include_pinned=include_pinned,
                 skip=skip,
                 limit=limit,
+                cursor=cursor,
                 db=db,
             )
+            set_next_cursor(response, CHAT_LIST_KEYSET, chat_list, limit)
+            return chat_list
         else:
             return Chats.get_chat_title_id_list_by_user_id(
                 user.id,
@@ -554,13 +562,15 @@ async def delete_all_user_chats(
 ############################
 
 
-@router.get("/list/user/{user_id}", response_model=list[ChatTitleIdResponse])
+@router.get("/list/user/{user_id}", response_model=list[ChatListItemResponse])
 async def get_user_chat_list_by_user_id(
+    response: Response,
     user_id: str,
     page: Optional[int] = None,
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_admin_user),
     db: Session = Depends(get_session),
 ):
@@ -574,7 +584,7 @@ async def get_user_chat_list_by_user_id(
         page = 1
 
     limit = 60
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if query:
@@ -584,9 +594,22 @@ async def get_user_chat_list_by_user_id(
     if direction:
         filter["direction"] = direction
 
-    return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit, db=db
-    )
+    try:
+        chat_list = Chats.get_chat_list_by_user_id(
+            user_id,
+            include_archived=True,
+            filter=filter,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            db=db,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not (order_by and direction):
+        set_next_cursor(response, CHAT_LIST_KEYSET, chat_list, limit)
+    return chat_list
 
 
 ############################
@@ -636,7 +659,7 @@ async def import_chats(
 ############################
 
 
-@router.get("/search", response_model=list[ChatTitleIdResponse])
+@router.get("/search", response_model=list[ChatListItemResponse])
 def search_user_chats(
     text: str,
     page: Optional[int] = None,
@@ -649,12 +672,9 @@ def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit, db=db
-        )
-    ]
+    chat_list = Chats.get_chats_by_user_id_and_search_text(
+        user.id, text, skip=skip, limit=limit, db=db
+    )
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -694,20 +714,30 @@ async def get_chats_by_folder_id(
 
 @router.get("/folder/{folder_id}/list")
 async def get_chat_list_by_folder_id(
+    response: Response,
     folder_id: str,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     try:
         limit = 10
-        skip = (page - 1) * limit
+        skip = (page - 1) * limit if cursor is None else 0
+
+        chat_list = Chats.get_chats_by_folder_id_and_user_id(
+            folder_id,
+            user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            db=db,
+        )
+        set_next_cursor(response, CHAT_LIST_KEYSET, chat_list, limit)
 
         return [
             {"title": chat.title, "id": chat.id, "updated_at": chat.updated_at}
-            for chat in Chats.get_chats_by_folder_id_and_user_id(
-                folder_id, user.id, skip=skip, limit=limit, db=db
-            )
+            for chat in chat_list
         ]
 
     except Exception as e:
@@ -722,14 +752,11 @@ async def get_chat_list_by_folder_id(
 ############################
 
 
-@router.get("/pinned", response_model=list[ChatTitleIdResponse])
+@router.get("/pinned", response_model=list[ChatListItemResponse])
 async def get_user_pinned_chats(
     user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id, db=db)
-    ]
+    return Chats.get_pinned_chats_by_user_id(user.id, db=db)
 
 
 ############################
@@ -801,12 +828,14 @@ async def get_all_user_chats_in_db(
 ############################
 
 
-@router.get("/archived", response_model=list[ChatTitleIdResponse])
+@router.get("/archived", response_model=list[ChatListItemResponse])
 async def get_archived_session_user_chat_list(
+    response: Response,
     page: Optional[int] = None,
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -814,7 +843,7 @@ async def get_archived_session_user_chat_list(
         page = 1
 
     limit = 60
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if query:
@@ -824,17 +853,20 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
+    try:
+        chat_list = Chats.get_archived_chat_list_by_user_id(
             user.id,
             filter=filter,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             db=db,
         )
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    if not (order_by and direction):
+        set_next_cursor(response, CHAT_LIST_KEYSET, chat_list, limit)
     return chat_list
 
 
@@ -904,7 +936,7 @@ class TagFilterForm(TagForm):
     limit: Optional[int] = 50
 
 
-@router.post("/tags", response_model=list[ChatTitleIdResponse])
+@router.post("/tags", response_model=list[ChatListItemResponse])
 async def get_user_chat_list_by_tag_name(
     form_data: TagFilterForm,
     user=Depends(get_verified_user),
@@ -992,7 +1024,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
@@ -1000,6 +1032,7 @@ async def update_chat_message_by_id(
         },
         db=db,
     )
+    chat = Chats.get_chat_by_id(id, db=db)
 
     event_emitter = get_event_emitter(
         {
@@ -1,36 +1,86 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 import clickhouse_connect
+from clickhouse_connect.driver import httputil
 import logging
+import threading
+from open_webui.env import (
+    CLICKHOUSE_CUSTOMERS_CACHE_TTL,
+    CLICKHOUSE_HOST,
+    CLICKHOUSE_PASSWORD,
+    CLICKHOUSE_POOL_SIZE,
+    CLICKHOUSE_PORT,
+    CLICKHOUSE_USERNAME,
+)
 from open_webui.utils.auth import get_admin_user
+from open_webui.utils.cache import TTLCache
+from open_webui.utils.redis import get_redis_client
 
 log = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# ClickHouse connection configuration
-CLICKHOUSE_HOST = "172.31.5.136"  # Configure as needed
-CLICKHOUSE_PORT = 8123
-CLICKHOUSE_USERNAME = "RO_User"  # Configure as needed
-CLICKHOUSE_PASSWORD = "RO_User"  # Configure as needed
+# Shared ClickHouse client; it holds a urllib3 connection pool and is safe to use
+# from multiple threads since it does not bind queries to a ClickHouse session
+_client = None
+_client_lock = threading.Lock()
+
+_customers_cache = TTLCache(
+    "clickhouse:customers",
+    ttl=CLICKHOUSE_CUSTOMERS_CACHE_TTL,
+    redis_client=get_redis_client(async_mode=True),
+)
+
 
 class CustomerResponse(BaseModel):
     customers: List[str]
 
+
 def get_clickhouse_client():
-    """Get ClickHouse client connection"""
-    try:
-        client = clickhouse_connect.get_client(
-            host=CLICKHOUSE_HOST,
-            port=CLICKHOUSE_PORT,
-            username=CLICKHOUSE_USERNAME,
-            password=CLICKHOUSE_PASSWORD
-        )
-        return client
-    except Exception as e:
-        log.error(f"Failed to connect to ClickHouse: {e}")
-        raise HTTPException(status_code=500, detail="Failed to connect to ClickHouse")
+    """Get the shared, pooled ClickHouse client connection"""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            return _client
+
+        if not CLICKHOUSE_HOST:
+            raise HTTPException(
+                status_code=500,
+                detail="ClickHouse is not configured, set CLICKHOUSE_HOST",
+            )
+
+        try:
+            _client = clickhouse_connect.get_client(
+                host=CLICKHOUSE_HOST,
+                port=CLICKHOUSE_PORT,
+                username=CLICKHOUSE_USERNAME,
+                password=CLICKHOUSE_PASSWORD,
+                autogenerate_session_id=False,
+                pool_mgr=httputil.get_pool_manager(maxsize=CLICKHOUSE_POOL_SIZE),
+            )
+            return _client
+        except Exception as e:
+            log.error(f"Failed to connect to ClickHouse: {e}")
+            raise HTTPException(
+                status_code=500, detail="Failed to connect to ClickHouse"
+            )
+
+
+def query_customers_by_region(region: str) -> List[str]:
+    """Query customers of a region (blocking; run in a thread pool)"""
+    client = get_clickhouse_client()
+
+    # Execute the query with parameterized input to prevent SQL injection
+    query = "SELECT CustomerAdWebsite FROM nSight_all.Lookup_CustomerAdWebsite WHERE Location = %(region)s"
+
+    result = client.query(query, parameters={"region": region})
+
+    # Extract customer names from the result
+    return [row[0] for row in result.result_rows if row[0]]
+
 
 @router.get("/customers/{region}", response_model=CustomerResponse)
 async def get_customers_by_region(region: str, user=Depends(get_admin_user)):
@@ -38,21 +88,26 @@ async def get_customers_by_region(region: str, user=Depends(get_admin_user)):
     Get customers by region from ClickHouse database
     """
     try:
-        client = get_clickhouse_client()
-        
-        # Execute the query with parameterized input to prevent SQL injection
-        query = "SELECT CustomerAdWebsite FROM nSight_all.Lookup_CustomerAdWebsite WHERE Location = %(region)s"
-        
-        result = client.query(query, parameters={"region": region})
-        
-        # Extract customer names from the result
-        customers = [row[0] for row in result.result_rows if row[0]]
-        
+        if CLICKHOUSE_CUSTOMERS_CACHE_TTL > 0:
+            customers = await _customers_cache.get(region)
+            if customers is not None:
+                return CustomerResponse(customers=customers)
+
+        customers = await run_in_threadpool(query_customers_by_region, region)
+
+        if CLICKHOUSE_CUSTOMERS_CACHE_TTL > 0:
+            await _customers_cache.set(region, customers)
+
         return CustomerResponse(customers=customers)
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error querying ClickHouse: {e}")
-        raise HTTPException(status_code=500, detail=f"Error querying database: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error querying database: {str(e)}"
+        )
+
 
 @router.get("/regions")
 async def get_regions(user=Depends(get_admin_user)):
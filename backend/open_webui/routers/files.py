@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 import asyncio
+import time
 
 from fastapi import (
     BackgroundTasks,
@@ -20,12 +21,14 @@ from fastapi import (
     Query,
 )
 
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import ENABLE_FILE_PROCESSING_QUEUE
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEXES
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -34,27 +37,42 @@ from open_webui.models.files import (
     FileModel,
     FileModelResponse,
     Files,
+    FILE_LIST_KEYSET,
 )
 from open_webui.models.chats import Chats
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.groups import Groups
 
 
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    process_file,
+    process_file_item,
+)
 from open_webui.routers.audio import transcribe
 
 from open_webui.storage.provider import Storage
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.file_processing import (
+    enqueue_file_processing,
+    publish_file_status,
+    subscribe_file_status,
+)
 from open_webui.utils.access_control import has_access
 from open_webui.utils.misc import strict_match_mime_type
+from open_webui.utils.pagination import set_next_cursor
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Seconds between reads of the status of a file being processed, when no status
+# event arrives. Without the processing queue no events are published.
+FILE_STATUS_RECHECK_INTERVAL = 15 if ENABLE_FILE_PROCESSING_QUEUE else 1
+
 
 ############################
 # Check if the current user has access to a file through any knowledge bases the user may be in.
@@ -115,6 +133,61 @@ def has_access_to_file(
 ############################
 
 
+def process_uploaded_file_content(
+    request,
+    content_type: Optional[str],
+    file_path: str,
+    file_id: str,
+    file_metadata: dict,
+    user,
+    db: Session,
+):
+    """
+    Extract the content of an uploaded file and save it to the vector database.
+    Errors are raised without setting the failed status of the file, the caller
+    sets it once it gives up on the file.
+    """
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
+
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path_processed = Storage.get_file(file_path)
+            result = transcribe(request, file_path_processed, file_metadata, user)
+
+            process_file_item(
+                request,
+                ProcessFileForm(file_id=file_id, content=result.get("text", "")),
+                user,
+                db,
+                report_failure=False,
+            )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            process_file_item(
+                request,
+                ProcessFileForm(file_id=file_id),
+                user,
+                db,
+                report_failure=False,
+            )
+        else:
+            raise Exception(f"File type {content_type} is not supported for processing")
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file_item(
+            request,
+            ProcessFileForm(file_id=file_id),
+            user,
+            db,
+            report_failure=False,
+        )
+
+
 def process_uploaded_file(
     request,
     file,
@@ -126,61 +199,27 @@ def process_uploaded_file(
 ):
     def _process_handler(db_session):
         try:
-            if file.content_type:
-                stt_supported_content_types = getattr(
-                    request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                )
-
-                if strict_match_mime_type(
-                    stt_supported_content_types, file.content_type
-                ):
-                    file_path_processed = Storage.get_file(file_path)
-                    result = transcribe(
-                        request, file_path_processed, file_metadata, user
-                    )
-
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=file_item.id, content=result.get("text", "")
-                        ),
-                        user=user,
-                        db=db_session,
-                    )
-                elif (not file.content_type.startswith(("image/", "video/"))) or (
-                    request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                ):
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=file_item.id),
-                        user=user,
-                        db=db_session,
-                    )
-                else:
-                    raise Exception(
-                        f"File type {file.content_type} is not supported for processing"
-                    )
-            else:
-                log.info(
-                    f"File type {file.content_type} is not provided, but trying to process anyway"
-                )
-                process_file(
-                    request,
-                    ProcessFileForm(file_id=file_item.id),
-                    user=user,
-                    db=db_session,
-                )
-
+            process_uploaded_file_content(
+                request,
+                file.content_type,
+                file_path,
+                file_item.id,
+                file_metadata,
+                user,
+                db=db_session,
+            )
         except Exception as e:
             log.error(f"Error processing file: {file_item.id}")
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
             Files.update_file_data_by_id(
                 file_item.id,
                 {
                     "status": "failed",
-                    "error": str(e.detail) if hasattr(e, "detail") else str(e),
+                    "error": error,
                 },
                 db=db_session,
             )
+            publish_file_status(file_item.id, user.id, "failed", error)
 
     if db:
         _process_handler(db)
@@ -302,15 +341,26 @@ def upload_file_handler(
 
         if process:
             if background_tasks and process_in_background:
-                background_tasks.add_task(
-                    process_uploaded_file,
-                    request,
-                    file,
-                    file_path,
-                    file_item,
-                    file_metadata,
-                    user,
-                )
+                if ENABLE_FILE_PROCESSING_QUEUE:
+                    # Processed by the workers of the file processing queue
+                    enqueue_file_processing(
+                        file_item.id,
+                        user.id,
+                        file.content_type,
+                        file_path,
+                        file_metadata,
+                        len(contents),
+                    )
+                else:
+                    background_tasks.add_task(
+                        process_uploaded_file,
+                        request,
+                        file,
+                        file_path,
+                        file_item,
+                        file_metadata,
+                        user,
+                    )
                 return {"status": True, **file_item.model_dump()}
             else:
                 process_uploaded_file(
@@ -371,6 +421,7 @@ async def list_files(
 
 @router.get("/search", response_model=list[FileModelResponse])
 async def search_files(
+    response: Response,
     filename: str = Query(
         ...,
         description="Filename pattern to search for. Supports wildcards such as '*.txt'",
@@ -380,6 +431,9 @@ async def search_files(
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of files to return"
     ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor of the next page, from the X-Next-Cursor header"
+    ),
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -391,13 +445,17 @@ async def search_files(
     user_id = None if user.role == "admin" else user.id
 
     # Use optimized database query with pagination
-    files = Files.search_files(
-        user_id=user_id,
-        filename=filename,
-        skip=skip,
-        limit=limit,
-        db=db,
-    )
+    try:
+        files = Files.search_files(
+            user_id=user_id,
+            filename=filename,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            db=db,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     if not files:
         raise HTTPException(
@@ -410,6 +468,7 @@ async def search_files(
             if file.data and "content" in file.data:
                 del file.data["content"]
 
+    set_next_cursor(response, FILE_LIST_KEYSET, files, limit)
     return files
 
 
@@ -427,6 +486,7 @@ async def delete_all_files(
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            BM25_INDEXES.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -497,30 +557,38 @@ async def get_file_process_status(
 
             async def event_stream(file_id):
                 # NOTE: We intentionally do NOT capture the request's db session here.
-                # Each poll creates its own short-lived session to avoid holding a
-                # connection for hours. A WebSocket push would be more efficient.
-                for _ in range(MAX_FILE_PROCESSING_DURATION):
-                    file_item = Files.get_file_by_id(file_id)  # Creates own session
-                    if file_item:
-                        data = file_item.model_dump().get("data", {})
-                        status = data.get("status")
-
-                        if status:
-                            event = {"status": status}
-                            if status == "failed":
-                                event["error"] = data.get("error")
-
-                            yield f"data: {json.dumps(event)}\n\n"
-                            if status in ("completed", "failed"):
+                # The status is read with a short-lived session of its own whenever
+                # a status event of the file is received, and at a low interval in
+                # case an event was missed.
+                deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+                with subscribe_file_status(file_id) as events:
+                    while time.monotonic() < deadline:
+                        file_item = Files.get_file_by_id(file_id)  # Own session
+                        if file_item:
+                            data = file_item.model_dump().get("data", {})
+                            status = data.get("status")
+
+                            if status:
+                                event = {"status": status}
+                                if status == "failed":
+                                    event["error"] = data.get("error")
+
+                                yield f"data: {json.dumps(event)}\n\n"
+                                if status in ("completed", "failed"):
+                                    break
+                            else:
+                                # Legacy
                                 break
                         else:
-                            # Legacy
+                            yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
                             break
-                    else:
-                        yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-                        break
 
-                    await asyncio.sleep(1)
+                        try:
+                            await asyncio.wait_for(
+                                events.get(), timeout=FILE_STATUS_RECHECK_INTERVAL
+                            )
+                        except asyncio.TimeoutError:
+                            pass
 
             return StreamingResponse(
                 event_stream(file.id),
@@ -830,6 +898,7 @@ async def delete_file_by_id(
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                BM25_INDEXES.invalidate(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -19,6 +19,7 @@ from open_webui.models.knowledge import (
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEXES
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -102,17 +103,19 @@ class KnowledgeAccessResponse(KnowledgeUserResponse):
 class KnowledgeAccessListResponse(BaseModel):
     items: list[KnowledgeAccessResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 @router.get("/", response_model=KnowledgeAccessListResponse)
 async def get_knowledge_bases(
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     page = max(page, 1)
     limit = PAGE_ITEM_COUNT
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if not user.role == "admin" or not BYPASS_ADMIN_ACCESS_CONTROL:
@@ -123,7 +126,7 @@ async def get_knowledge_bases(
         filter["user_id"] = user.id
 
     result = Knowledges.search_knowledge_bases(
-        user.id, filter=filter, skip=skip, limit=limit, db=db
+        user.id, filter=filter, skip=skip, limit=limit, cursor=cursor, db=db
     )
 
     return KnowledgeAccessListResponse(
@@ -141,6 +144,7 @@ async def get_knowledge_bases(
             for knowledge_base in result.items
         ],
         total=result.total,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -149,12 +153,13 @@ async def search_knowledge_bases(
     query: Optional[str] = None,
     view_option: Optional[str] = None,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     page = max(page, 1)
     limit = PAGE_ITEM_COUNT
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if query:
@@ -170,7 +175,7 @@ async def search_knowledge_bases(
         filter["user_id"] = user.id
 
     result = Knowledges.search_knowledge_bases(
-        user.id, filter=filter, skip=skip, limit=limit, db=db
+        user.id, filter=filter, skip=skip, limit=limit, cursor=cursor, db=db
     )
 
     return KnowledgeAccessListResponse(
@@ -188,6 +193,7 @@ async def search_knowledge_bases(
             for knowledge_base in result.items
         ],
         total=result.total,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -195,12 +201,13 @@ async def search_knowledge_bases(
 async def search_knowledge_files(
     query: Optional[str] = None,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     page = max(page, 1)
     limit = PAGE_ITEM_COUNT
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if query:
@@ -213,7 +220,7 @@ async def search_knowledge_files(
     filter["user_id"] = user.id
 
     return Knowledges.search_knowledge_files(
-        filter=filter, skip=skip, limit=limit, db=db
+        filter=filter, skip=skip, limit=limit, cursor=cursor, db=db
     )
 
 
@@ -297,6 +304,7 @@ async def reindex_knowledge_files(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=knowledge_base.id
                     )
+                    BM25_INDEXES.invalidate(knowledge_base.id)
             except Exception as e:
                 log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
                 continue  # Skip, don't raise
@@ -479,6 +487,7 @@ async def get_knowledge_files_by_id(
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -503,7 +512,7 @@ async def get_knowledge_files_by_id(
     page = max(page, 1)
 
     limit = 30
-    skip = (page - 1) * limit
+    skip = (page - 1) * limit if cursor is None else 0
 
     filter = {}
     if query:
@@ -516,7 +525,7 @@ async def get_knowledge_files_by_id(
         filter["direction"] = direction
 
     return Knowledges.search_files_by_id(
-        id, user.id, filter=filter, skip=skip, limit=limit, db=db
+        id, user.id, filter=filter, skip=skip, limit=limit, cursor=cursor, db=db
     )
 
 
@@ -635,6 +644,7 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    BM25_INDEXES.invalidate(knowledge.id)
 
     # Add content to the vector database
     try:
@@ -712,6 +722,7 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"hash": file.hash}
         )  # Remove by hash as well in case of duplicates
+        BM25_INDEXES.invalidate(knowledge.id)
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -723,6 +734,7 @@ def remove_file_from_knowledge_by_id(
             file_collection = f"file-{form_data.file_id}"
             if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
                 VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+                BM25_INDEXES.invalidate(file_collection)
         except Exception as e:
             log.debug("This was most likely caused by bypassing embedding processing")
             log.debug(e)
@@ -801,6 +813,7 @@ async def delete_knowledge_by_id(
     # Clean up vector DB
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25_INDEXES.invalidate(id)
     except Exception as e:
         log.debug(e)
         pass
@@ -840,6 +853,7 @@ async def reset_knowledge_by_id(
 
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25_INDEXES.invalidate(id)
     except Exception as e:
         log.debug(e)
         pass
@@ -9,7 +9,7 @@ import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -44,6 +44,9 @@ from sqlalchemy.orm import Session
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.bm25 import BM25_INDEXES
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -94,6 +97,7 @@ from open_webui.utils.misc import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.file_processing import publish_file_status
 
 from open_webui.config import (
     ENV,
@@ -109,6 +113,8 @@ from open_webui.config import (
 from open_webui.env import (
     DEVICE_TYPE,
     DOCKER,
+    RAG_INGEST_BATCH_SIZE,
+    RAG_INGEST_QUEUE_SIZE,
     SENTENCE_TRANSFORMERS_BACKEND,
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
@@ -295,6 +301,17 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    """
+    Get the embedding cache hit rate of this worker.
+    """
+    return {
+        "enabled": EMBEDDING_CACHE is not None,
+        **(EMBEDDING_CACHE.stats() if EMBEDDING_CACHE is not None else {}),
+    }
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
@@ -1377,6 +1394,226 @@ def merge_docs_to_target_size(
     return processed_chunks
 
 
+def _get_docs_info(docs: list[Document]) -> str:
+    docs_info = set()
+
+    # Trying to select relevant metadata identifying the document.
+    for doc in docs:
+        metadata = getattr(doc, "metadata", {})
+        doc_name = metadata.get("name", "")
+        if not doc_name:
+            doc_name = metadata.get("title", "")
+        if not doc_name:
+            doc_name = metadata.get("source", "")
+        if doc_name:
+            docs_info.add(doc_name)
+
+    return ", ".join(docs_info)
+
+
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
+        log.info("Using markdown header text splitter")
+        # Define headers to split on - covering most common markdown header levels
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=[
+                ("#", "Header 1"),
+                ("##", "Header 2"),
+                ("###", "Header 3"),
+                ("####", "Header 4"),
+                ("#####", "Header 5"),
+                ("######", "Header 6"),
+            ],
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        markdown_docs = []
+        for doc in docs:
+            markdown_docs.extend(
+                [
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata},
+                    )
+                    for split_chunk in markdown_splitter.split_text(doc.page_content)
+                ]
+            )
+
+        docs = markdown_docs
+        if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
+            docs = merge_docs_to_target_size(request, docs)
+
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+    return docs
+
+
+def group_docs(docs: Iterable[Document]) -> Iterator[list[Document]]:
+    """Group consecutive documents of the same source, whose chunks may be merged."""
+    group = []
+    for doc in docs:
+        if group and not can_merge_chunks(group[-1], doc):
+            yield group
+            group = []
+        group.append(doc)
+
+    if group:
+        yield group
+
+
+async def ingest_docs(
+    request: Request,
+    docs: Iterable[Document],
+    collection_name: str,
+    embedding_function,
+    metadata: Optional[dict] = None,
+    overwrite: bool = False,
+    split: bool = True,
+    user=None,
+) -> int:
+    """
+    Split, embed and insert documents into a collection as a pipeline. Chunks are
+    embedded and inserted in batches, while the next ones are split and embedded,
+    with bounded queues between the stages so only a few batches are in memory.
+
+    Inserted chunks are deleted again if the ingestion fails. Return the number of
+    chunks inserted.
+    """
+    # Batches of chunks, then of items, None once done or the exception of a stage
+    chunks_queue = asyncio.Queue(maxsize=RAG_INGEST_QUEUE_SIZE)
+    items_queue = asyncio.Queue(maxsize=RAG_INGEST_QUEUE_SIZE)
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+    async def split_stage():
+        try:
+            batch = []
+            for group in group_docs(docs):
+                log.debug(
+                    f"save_docs_to_vector_db: document {_get_docs_info(group)} {collection_name}"
+                )
+                chunks = (
+                    await asyncio.to_thread(split_docs, request, group)
+                    if split
+                    else group
+                )
+                for chunk in chunks:
+                    batch.append(chunk)
+                    if len(batch) >= RAG_INGEST_BATCH_SIZE:
+                        await chunks_queue.put(batch)
+                        batch = []
+
+            if batch:
+                await chunks_queue.put(batch)
+            await chunks_queue.put(None)
+        except Exception as e:
+            await chunks_queue.put(e)
+
+    async def embed_stage():
+        try:
+            while True:
+                chunks = await chunks_queue.get()
+                if chunks is None or isinstance(chunks, Exception):
+                    await items_queue.put(chunks)
+                    return
+
+                texts = [sanitize_text_for_db(chunk.page_content) for chunk in chunks]
+                embeddings = await embedding_function(
+                    list(map(lambda x: x.replace("\n", " "), texts)),
+                    prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                    user=user,
+                )
+                log.info(
+                    f"embeddings generated {len(embeddings)} for {len(texts)} items"
+                )
+
+                await items_queue.put(
+                    [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "text": text,
+                            "vector": embeddings[idx],
+                            "metadata": {
+                                **chunks[idx].metadata,
+                                **(metadata if metadata else {}),
+                                "embedding_config": {**embedding_config},
+                            },
+                        }
+                        for idx, text in enumerate(texts)
+                    ]
+                )
+        except Exception as e:
+            await items_queue.put(e)
+
+    def write_items(items: list[dict]):
+        VECTOR_DB_CLIENT.insert(
+            collection_name=collection_name,
+            items=items,
+        )
+        BM25_INDEXES.add(
+            collection_name,
+            GetResult(
+                ids=[[item["id"] for item in items]],
+                documents=[[item["text"] for item in items]],
+                metadatas=[[item["metadata"] for item in items]],
+            ),
+        )
+
+    tasks = [asyncio.create_task(split_stage()), asyncio.create_task(embed_stage())]
+    inserted_ids = []
+    try:
+        while (items := await items_queue.get()) is not None:
+            if isinstance(items, Exception):
+                raise items
+
+            if not inserted_ids and overwrite:
+                # The existing collection is only replaced once there is content
+                if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                    BM25_INDEXES.invalidate(collection_name)
+                    log.info(f"deleting existing collection {collection_name}")
+
+            log.info(f"adding {len(items)} items to collection {collection_name}")
+            await asyncio.to_thread(write_items, items)
+            inserted_ids.extend(item["id"] for item in items)
+
+        if not inserted_ids:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        return len(inserted_ids)
+    except Exception:
+        if inserted_ids:
+            log.info(f"removing {len(inserted_ids)} items from {collection_name}")
+            VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=inserted_ids)
+            BM25_INDEXES.invalidate(collection_name)
+        raise
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1387,31 +1624,17 @@ def save_docs_to_vector_db(
     add: bool = False,
     user=None,
 ) -> bool:
-    def _get_docs_info(docs: list[Document]) -> str:
-        docs_info = set()
-
-        # Trying to select relevant metadata identifying the document.
-        for doc in docs:
-            metadata = getattr(doc, "metadata", {})
-            doc_name = metadata.get("name", "")
-            if not doc_name:
-                doc_name = metadata.get("title", "")
-            if not doc_name:
-                doc_name = metadata.get("source", "")
-            if doc_name:
-                docs_info.add(doc_name)
-
-        return ", ".join(docs_info)
-
-    log.debug(
-        f"save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}"
-    )
-
     # Check if entries with the same hash (metadata.hash) already exist
     if metadata and "hash" in metadata:
-        result = VECTOR_DB_CLIENT.query(
-            collection_name=collection_name,
-            filter={"hash": metadata["hash"]},
+        # Only the ids of the first match are needed to detect a duplicate
+        result = next(
+            VECTOR_DB_CLIENT.get_batches(
+                collection_name=collection_name,
+                filter={"hash": metadata["hash"]},
+                include=[],
+                batch_size=1,
+            ),
+            None,
         )
 
         if result is not None and result.ids and len(result.ids) > 0:
@@ -1420,87 +1643,11 @@ def save_docs_to_vector_db(
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
-    if split:
-        if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
-            log.info("Using markdown header text splitter")
-            # Define headers to split on - covering most common markdown header levels
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=[
-                    ("#", "Header 1"),
-                    ("##", "Header 2"),
-                    ("###", "Header 3"),
-                    ("####", "Header 4"),
-                    ("#####", "Header 5"),
-                    ("######", "Header 6"),
-                ],
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            split_docs = []
-            for doc in docs:
-                split_docs.extend(
-                    [
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata},
-                        )
-                        for split_chunk in markdown_splitter.split_text(
-                            doc.page_content
-                        )
-                    ]
-                )
-
-            docs = split_docs
-            if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
-                docs = merge_docs_to_target_size(request, docs)
-
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
-
-    if len(docs) == 0:
-        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
-
-    texts = [sanitize_text_for_db(doc.page_content) for doc in docs]
-    metadatas = [
-        {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
-        }
-        for doc in docs
-    ]
-
     try:
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
             log.info(f"collection {collection_name} already exists")
 
-            if overwrite:
-                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
-                log.info(f"deleting existing collection {collection_name}")
-            elif add is False:
+            if overwrite is False and add is False:
                 log.info(
                     f"collection {collection_name} already exists, overwrite is False and add is False"
                 )
@@ -1538,33 +1685,21 @@ def save_docs_to_vector_db(
             enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
         )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+        # Run the async ingestion pipeline in sync context
+        count = asyncio.run(
+            ingest_docs(
+                request,
+                docs,
+                collection_name,
+                embedding_function,
+                metadata=metadata,
+                overwrite=overwrite,
+                split=split,
                 user=user,
             )
         )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
-
-        log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
-
-        log.info(f"added {len(items)} items to collection {collection_name}")
+        log.info(f"added {count} items to collection {collection_name}")
         return True
     except Exception as e:
         log.exception(e)
@@ -1587,6 +1722,22 @@ def process_file(
     """
     Process a file and save its content to the vector database.
     """
+    return process_file_item(request, form_data, user, db)
+
+
+def process_file_item(
+    request: Request,
+    form_data: ProcessFileForm,
+    user,
+    db: Session,
+    report_failure: bool = True,
+):
+    """
+    Process a file and save its content to the vector database.
+
+    :param report_failure: Set the failed status of the file on errors, callers
+        that retry or set the status themselves pass False
+    """
     if user.role == "admin":
         file = Files.get_file_by_id(form_data.file_id, db=db)
     else:
@@ -1609,6 +1760,7 @@ def process_file(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=f"file-{file.id}"
                     )
+                    BM25_INDEXES.invalidate(f"file-{file.id}")
                 except:
                     # Audio file upload pipeline
                     pass
@@ -1739,6 +1891,7 @@ def process_file(
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
                 Files.update_file_data_by_id(file.id, {"status": "completed"}, db=db)
                 Files.update_file_hash_by_id(file.id, hash, db=db)
+                publish_file_status(file.id, file.user_id, "completed")
                 return {
                     "status": True,
                     "collection_name": None,
@@ -1776,6 +1929,7 @@ def process_file(
                             db=db,
                         )
                         Files.update_file_hash_by_id(file.id, hash, db=db)
+                        publish_file_status(file.id, file.user_id, "completed")
 
                         return {
                             "status": True,
@@ -1790,11 +1944,13 @@ def process_file(
 
         except Exception as e:
             log.exception(e)
-            Files.update_file_data_by_id(
-                file.id,
-                {"status": "failed"},
-                db=db,
-            )
+            if report_failure:
+                Files.update_file_data_by_id(
+                    file.id,
+                    {"status": "failed"},
+                    db=db,
+                )
+                publish_file_status(file.id, file.user_id, "failed", str(e))
             # Clear the hash so the file can be re-uploaded after fixing the issue
             Files.update_file_hash_by_id(file.id, None, db=db)
 
@@ -2399,13 +2555,9 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
+                collection_result=None,
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2557,6 +2709,7 @@ def delete_entries_from_collection(
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            BM25_INDEXES.invalidate(form_data.collection_name)
             return {"status": True}
         else:
             return {"status": False}
@@ -2568,6 +2721,7 @@ def delete_entries_from_collection(
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user), db: Session = Depends(get_session)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEXES.reset()
     Knowledges.delete_all_knowledge(db=db)
 
 
@@ -2638,26 +2792,12 @@ async def process_files_batch(
     file_errors: List[BatchProcessFilesResult] = []
     file_updates: List[FileUpdateForm] = []
 
-    # Prepare all documents first
-    all_docs: List[Document] = []
+    # Prepare all files first, their documents are created while being saved
+    prepared_files: List[FileModel] = []
 
     for file in form_data.files:
         try:
             text_content = file.data.get("content", "")
-            docs: List[Document] = [
-                Document(
-                    page_content=text_content.replace("<br/>", "\n"),
-                    metadata={
-                        **file.meta,
-                        "name": file.filename,
-                        "created_by": file.user_id,
-                        "file_id": file.id,
-                        "source": file.filename,
-                    },
-                )
-            ]
-
-            all_docs.extend(docs)
 
             file_updates.append(
                 FileUpdateForm(
@@ -2668,6 +2808,7 @@ async def process_files_batch(
             file_results.append(
                 BatchProcessFilesResult(file_id=file.id, status="prepared")
             )
+            prepared_files.append(file)
 
         except Exception as e:
             log.error(f"process_files_batch: Error processing file {file.id}: {str(e)}")
@@ -2675,13 +2816,26 @@ async def process_files_batch(
                 BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e))
             )
 
+    def get_docs() -> Iterator[Document]:
+        for file in prepared_files:
+            yield Document(
+                page_content=file.data.get("content", "").replace("<br/>", "\n"),
+                metadata={
+                    **file.meta,
+                    "name": file.filename,
+                    "created_by": file.user_id,
+                    "file_id": file.id,
+                    "source": file.filename,
+                },
+            )
+
     # Save all documents in one batch
-    if all_docs:
+    if prepared_files:
         try:
             await run_in_threadpool(
                 save_docs_to_vector_db,
                 request,
-                all_docs,
+                get_docs(),
                 collection_name,
                 add=True,
                 user=user,
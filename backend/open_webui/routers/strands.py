@@ -1,7 +1,7 @@
 import json
 import logging
 import os
-import sys
+import re
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -9,9 +9,11 @@ from uuid import uuid4
 import asyncio
 import threading
 import copy
-from contextlib import redirect_stdout, redirect_stderr
-from io import StringIO
+import contextvars
+import hashlib
+from collections import OrderedDict
 
+import aiohttp
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
@@ -19,7 +21,25 @@ from pydantic import BaseModel
 from open_webui.models.users import UserModel
 from open_webui.models.models import Models
 from open_webui.utils.auth import get_verified_user, get_admin_user
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    AIOHTTP_CLIENT_SESSION_SSL,
+    SRC_LOG_LEVELS,
+    STRANDS_AGENT_POOL_SIZE,
+    STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES,
+    STRANDS_CLICKHOUSE_MCP_MAX_RETRIES,
+    STRANDS_CLICKHOUSE_MCP_POOL_SIZE,
+    STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT,
+    STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF,
+    STRANDS_CLICKHOUSE_MCP_TIMEOUT,
+    STRANDS_QUERY_CACHE_MAX_BYTES,
+    STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES,
+    STRANDS_QUERY_CACHE_TTL,
+    STRANDS_QUERY_MAX_BYTES,
+    STRANDS_QUERY_MAX_ROWS,
+    STRANDS_SCHEMA_CACHE_TTL,
+)
+from open_webui.utils.cache import TTLCache
+from open_webui.utils.redis import get_redis_client
 from open_webui.config import save_config, CONFIG_DATA
 
 # Import Strands components directly
@@ -28,7 +48,6 @@ try:
     from strands import Agent
     from strands.models import BedrockModel
     from strands.tools import tool
-    import requests
 except ImportError as e:
     logging.error(f"Failed to import Strands dependencies: {e}")
     Agent = None
@@ -118,61 +137,458 @@ at the end of result, always add nice words to appreciate the user to use nSight
 # Use environment variable or default
 SYSTEM_PROMPT = os.environ.get('STRANDS_SYSTEM_PROMPT', DEFAULT_SYSTEM_PROMPT)
 
-# Global agent instance
-_agent_instance = None
+# Shared, conversation-independent agent components
 _clickhouse_client = None
+_bedrock_model = None
+_bedrock_model_version = None
 _agent_tools = []
-_execution_log = []  # Track execution steps for thinking process
-_tool_call_counts = {}  # Track how many times each tool is called
+_agent_build_lock = threading.RLock()
+
+# Schema discovery results (list_databases/list_tables) change rarely; share them across
+# conversations and, when Redis is configured, across workers
+_schema_cache = TTLCache(
+    "strands:schema",
+    ttl=STRANDS_SCHEMA_CACHE_TTL,
+    redis_client=get_redis_client(async_mode=True),
+)
+
+# run_select_query results keyed by normalized SQL, bounded in size
+_query_cache = TTLCache(
+    "strands:query",
+    ttl=STRANDS_QUERY_CACHE_TTL,
+    redis_client=get_redis_client(async_mode=True),
+    max_bytes=STRANDS_QUERY_CACHE_MAX_BYTES,
+    max_entry_bytes=STRANDS_QUERY_CACHE_MAX_ENTRY_BYTES,
+)
+
+
+class ExecutionContext:
+    """Execution tracking (thinking process, tool call counts, listeners) for a single chat request"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        # Track execution steps for thinking process
+        self.execution_log: List[Dict[str, Any]] = []
+        # Track how many times each tool is called
+        self.tool_call_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._listener_lock = threading.Lock()
+        self._listeners: List[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    def append(self, event: Dict[str, Any]):
+        """Append an event to the execution log and notify listeners."""
+        with self._lock:
+            self.execution_log.append(event)
+        self.notify(event)
+
+    def count_tool_call(self, tool_name: str) -> int:
+        """Increment and return the call count for a tool."""
+        with self._lock:
+            self.tool_call_counts[tool_name] = (
+                self.tool_call_counts.get(tool_name, 0) + 1
+            )
+            return self.tool_call_counts[tool_name]
+
+    def snapshot(self) -> tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Return copies of the execution log and tool call counts."""
+        with self._lock:
+            return list(self.execution_log), dict(self.tool_call_counts)
+
+    def events_since(
+        self, cursor: int
+    ) -> tuple[List[Dict[str, Any]], int, Dict[str, int]]:
+        """Return the events appended after cursor, the new cursor and the current tool call counts."""
+        with self._lock:
+            return (
+                self.execution_log[cursor:],
+                len(self.execution_log),
+                dict(self.tool_call_counts),
+            )
+
+    def register_listener(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        """Register an async listener for execution log updates."""
+        with self._listener_lock:
+            self._listeners.append((loop, queue))
+
+    def clear_listener(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        """Remove an execution listener."""
+        with self._listener_lock:
+            if (loop, queue) in self._listeners:
+                self._listeners.remove((loop, queue))
+
+    def notify(self, event: Dict[str, Any]):
+        """Dispatch execution log events to registered async listeners."""
+        with self._listener_lock:
+            listeners = list(self._listeners)
+
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, copy.deepcopy(event))
+            except RuntimeError:
+                # Event loop might be closed; ignore
+                continue
+
+    def log_summary(self):
+        """Log a summary of the tracked execution."""
+        execution_log, tool_call_counts = self.snapshot()
+        if not execution_log and not tool_call_counts:
+            return
+        log.info(f"[STRANDS TRACKING] Execution summary for request {self.request_id}:")
+        log.info(f"[STRANDS TRACKING] - Total events: {len(execution_log)}")
+        log.info(
+            f"[STRANDS TRACKING] - Total tool calls: {sum(tool_call_counts.values())}"
+        )
+        for tool_name, count in tool_call_counts.items():
+            log.info(f"[STRANDS TRACKING]   • {tool_name}: {count}")
 
-_execution_log_lock = threading.Lock()
-_execution_listener_lock = threading.Lock()
-_execution_event_listeners: List[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
 
+# The execution context of the request currently being served. asyncio.to_thread copies
+# contextvars into the worker thread, so agent tools see the context of their own request.
+_current_execution_context: contextvars.ContextVar[Optional[ExecutionContext]] = (
+    contextvars.ContextVar("strands_execution_context", default=None)
+)
 
-def register_execution_listener(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
-    """Register an async listener for execution log updates."""
-    with _execution_listener_lock:
-        _execution_event_listeners.append((loop, queue))
 
+def get_execution_context() -> ExecutionContext:
+    """Get the execution context of the current request.
 
-def clear_execution_listener(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
-    """Remove an execution listener."""
-    with _execution_listener_lock:
-        if (loop, queue) in _execution_event_listeners:
-            _execution_event_listeners.remove((loop, queue))
+    Calls made outside of a chat request (e.g. /tools/test) get a detached context
+    so they never leak into another request's thinking process.
+    """
+    context = _current_execution_context.get()
+    if context is None:
+        context = ExecutionContext("detached")
+    return context
+
+
+def normalize_query(query: str) -> str:
+    """Normalize SQL for cache keys: drop comments, collapse whitespace and trailing semicolons
+
+    String literals and quoted identifiers are left untouched, and case is preserved
+    since ClickHouse identifiers are case-sensitive.
+    """
+    normalized = []
+    i = 0
+    length = len(query)
+    pending_space = False
+    while i < length:
+        char = query[i]
+        if char in ("'", '"', "`"):
+            # Copy quoted section verbatim, honouring backslash escapes
+            end = i + 1
+            while end < length and query[end] != char:
+                end += 2 if query[end] == "\\" else 1
+            if pending_space and normalized:
+                normalized.append(" ")
+            pending_space = False
+            normalized.append(query[i : end + 1])
+            i = end + 1
+        elif query.startswith("--", i):
+            newline = query.find("\n", i)
+            i = length if newline == -1 else newline
+            pending_space = True
+        elif query.startswith("/*", i):
+            end = query.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            pending_space = True
+        elif char.isspace():
+            pending_space = True
+            i += 1
+        else:
+            if pending_space and normalized:
+                normalized.append(" ")
+            pending_space = False
+            normalized.append(char)
+            i += 1
+    return "".join(normalized).rstrip("; ")
 
 
-def _notify_execution_listeners(event: dict):
-    """Dispatch execution log events to registered async listeners."""
-    with _execution_listener_lock:
-        listeners = list(_execution_event_listeners)
+def parse_partial_query_result(body: str) -> tuple[List[Any], List[Any]]:
+    """Recover the columns and complete rows from a query result body that was cut off
 
-    for loop, queue in listeners:
+    Handles both {"columns": [...], "rows": [...]} objects and bare row lists.
+    """
+    decoder = json.JSONDecoder()
+    columns = []
+
+    if body.lstrip().startswith("["):
+        position = body.index("[") + 1
+    else:
+        rows_match = re.search(r'"rows"\s*:\s*\[', body)
+        if rows_match is None:
+            return columns, []
+        position = rows_match.end()
+
+        # Columns are only recoverable if they were sent before the rows
+        columns_match = re.search(r'"columns"\s*:\s*', body[: rows_match.start()])
+        if columns_match is not None:
+            try:
+                columns, _ = decoder.raw_decode(body, columns_match.end())
+            except ValueError:
+                columns = []
+
+    rows = []
+    while position < len(body):
+        while position < len(body) and (
+            body[position].isspace() or body[position] == ","
+        ):
+            position += 1
+        if position >= len(body) or body[position] == "]":
+            break
         try:
-            loop.call_soon_threadsafe(queue.put_nowait, copy.deepcopy(event))
-        except RuntimeError:
-            # Event loop might be closed; ignore
-            continue
+            row, position = decoder.raw_decode(body, position)
+        except ValueError:
+            # Row was cut off by the byte budget
+            break
+        rows.append(row)
+    return columns, rows
+
+
+def summarize_query_rows(
+    columns: List[Any], rows: List[Any], sample_size: int = 5
+) -> Dict[str, Any]:
+    """Per-column min/max, null count and a sample of distinct values"""
+    if not rows:
+        return {}
+
+    if isinstance(rows[0], dict):
+        column_names = list(rows[0].keys())
+        values_by_column = [
+            [row.get(name) for row in rows if isinstance(row, dict)]
+            for name in column_names
+        ]
+    else:
+        width = max(
+            (len(row) for row in rows if isinstance(row, (list, tuple))), default=0
+        )
+        column_names = [
+            str(columns[i]) if i < len(columns) else f"column_{i + 1}"
+            for i in range(width)
+        ]
+        values_by_column = [
+            [
+                row[i] if isinstance(row, (list, tuple)) and i < len(row) else None
+                for row in rows
+            ]
+            for i in range(width)
+        ]
+
+    summary = {}
+    for name, values in zip(column_names, values_by_column):
+        present = [value for value in values if value is not None]
+        distinct = {}
+        for value in present:
+            distinct.setdefault(json.dumps(value, sort_keys=True, default=str), value)
+
+        column_summary = {
+            "null_count": len(values) - len(present),
+            "distinct_count": len(distinct),
+            "distinct_sample": list(distinct.values())[:sample_size],
+        }
+        if present:
+            try:
+                column_summary["min"] = min(present)
+                column_summary["max"] = max(present)
+            except TypeError:
+                column_summary["min"] = min(str(value) for value in present)
+                column_summary["max"] = max(str(value) for value in present)
+        summary[name] = column_summary
+    return summary
+
+
+def apply_query_result_budget(
+    result: Dict[str, Any], byte_truncated: bool = False
+) -> Dict[str, Any]:
+    """Truncate a query result to STRANDS_QUERY_MAX_ROWS rows, adding summary statistics if anything was cut"""
+    rows = result.get("rows", [])
+    if not byte_truncated and len(rows) <= STRANDS_QUERY_MAX_ROWS:
+        return result
+
+    columns = result.get("columns", [])
+    result["rows"] = rows[:STRANDS_QUERY_MAX_ROWS]
+    result["truncated"] = True
+    result["summary"] = {
+        # When the byte budget was hit, the full row count is unknown
+        "rows_read": len(rows),
+        "rows_returned": len(result["rows"]),
+        "more_rows_available": byte_truncated,
+        "note": (
+            "Result truncated to fit the row/byte budget. Statistics cover the rows read; "
+            "use aggregation, WHERE filters or LIMIT to get precise answers."
+        ),
+        "columns": summarize_query_rows(columns, rows),
+    }
+    log.info(
+        f"[CLICKHOUSE MCP] Result truncated: {len(rows)} row(s) read, "
+        f"{len(result['rows'])} returned"
+    )
+    return result
+
 
 class ClickHouseMCPClient:
-    """ClickHouse MCP Client for database operations"""
-    
+    """Async ClickHouse MCP Client for database operations
+
+    Uses a pooled aiohttp session with per-call timeouts. Idempotent metadata calls
+    (list_databases, list_tables) are retried with exponential backoff, and
+    run_select_query is bounded by a process-wide concurrency limit so one slow
+    analytical query cannot starve the worker.
+    """
+
+    # Shared by all clients of the process, one per event loop
+    _query_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
     def __init__(self, base_url: str):
         self.base_url = base_url
-        self.session = requests.Session()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight_queries: Dict[str, asyncio.Future] = {}
         log.info(f"[CLICKHOUSE MCP] Initialized client")
         log.info(f"[CLICKHOUSE MCP] Base URL: {base_url}")
-    
-    def list_databases(self) -> Dict[str, Any]:
-        """List available ClickHouse databases"""
+        log.info(
+            f"[CLICKHOUSE MCP] Pool size: {STRANDS_CLICKHOUSE_MCP_POOL_SIZE}, "
+            f"max concurrent queries: {STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES}"
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=STRANDS_CLICKHOUSE_MCP_POOL_SIZE),
+                trust_env=True,
+            )
+            self._session_loop = loop
+        return self._session
+
+    @classmethod
+    def _get_query_semaphore(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in cls._query_semaphores:
+            cls._query_semaphores[loop] = asyncio.Semaphore(
+                STRANDS_CLICKHOUSE_MCP_MAX_CONCURRENT_QUERIES
+            )
+        return cls._query_semaphores[loop]
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(
+        self,
+        endpoint: str,
+        payload: Optional[dict] = None,
+        *,
+        timeout: Optional[int],
+        retries: int = 0,
+    ) -> Any:
+        """POST to an MCP endpoint and return the decoded JSON body
+
+        Args:
+            endpoint: MCP endpoint name
+            payload: JSON payload, if any
+            timeout: Total timeout in seconds for a single attempt
+            retries: Number of retries on connection errors, timeouts and 5xx responses
+        """
+        url = f"{self.base_url}/{endpoint}"
+        attempt = 0
+        while True:
+            try:
+                async with self._get_session().post(
+                    url,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                ) as response:
+                    if response.status >= 500 and attempt < retries:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                        )
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except (
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientResponseError,
+                asyncio.TimeoutError,
+            ) as e:
+                is_retryable = (
+                    not isinstance(e, aiohttp.ClientResponseError) or e.status >= 500
+                )
+                if attempt >= retries or not is_retryable:
+                    raise
+                delay = STRANDS_CLICKHOUSE_MCP_RETRY_BACKOFF * (2**attempt)
+                attempt += 1
+                log.warning(
+                    f"[CLICKHOUSE MCP] {endpoint} failed ({type(e).__name__}: {e}), "
+                    f"retry {attempt}/{retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _post_with_budget(
+        self,
+        endpoint: str,
+        payload: Optional[dict] = None,
+        *,
+        timeout: Optional[int],
+        max_bytes: int,
+    ) -> tuple[str, bool]:
+        """POST to an MCP endpoint and read at most max_bytes of the response body
+
+        The body is read in chunks and the connection is dropped as soon as the
+        budget is exceeded, so memory use is bounded regardless of result size.
+        Returns the (possibly cut off) body text and whether it was truncated.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        async with self._get_session().post(
+            url,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as response:
+            response.raise_for_status()
+            body = bytearray()
+            truncated = False
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    del body[max_bytes:]
+                    truncated = True
+                    response.close()
+                    break
+            # A multi-byte character may have been split at the cut
+            return body.decode("utf-8", errors="ignore"), truncated
+
+    async def list_databases(self, use_cache: bool = True) -> Dict[str, Any]:
+        """List available ClickHouse databases
+
+        Args:
+            use_cache: Serve the result from the schema cache when available
+        """
+        cache_key = f"{self.base_url}:list_databases"
+        use_cache = use_cache and STRANDS_SCHEMA_CACHE_TTL > 0
         try:
+            if use_cache:
+                cached_result = await _schema_cache.get(cache_key)
+                if cached_result is not None:
+                    log.info(
+                        f"[CLICKHOUSE MCP] ✓ list_databases served from schema cache"
+                    )
+                    return cached_result
+
             log.info(f"[CLICKHOUSE MCP] Calling list_databases")
             log.info(f"[CLICKHOUSE MCP] Endpoint: {self.base_url}/list_databases")
             
-            response = self.session.post(f"{self.base_url}/list_databases")
-            response.raise_for_status()
-            result = response.json()
+            result = await self._post(
+                "list_databases",
+                timeout=STRANDS_CLICKHOUSE_MCP_TIMEOUT,
+                retries=STRANDS_CLICKHOUSE_MCP_MAX_RETRIES,
+            )
             
             # Handle both list and dict responses from MCP server
             if isinstance(result, list):
@@ -189,6 +605,8 @@ class ClickHouseMCPClient:
                 log.info(f"[CLICKHOUSE MCP] ✓ list_databases completed: {db_count} database(s)")
                 if db_count > 0:
                     log.info(f"[CLICKHOUSE MCP] Databases: {', '.join(result.get('databases', []))}")
+                if use_cache:
+                    await _schema_cache.set(cache_key, result)
             
             return result
         except Exception as e:
@@ -196,9 +614,34 @@ class ClickHouseMCPClient:
             log.error(f"[CLICKHOUSE MCP] ✗ {error_msg}")
             return {"error": error_msg}
     
-    def list_tables(self, database: str, like: Optional[str] = None, not_like: Optional[str] = None) -> Dict[str, Any]:
-        """List available ClickHouse tables in a database"""
+    async def list_tables(
+        self,
+        database: str,
+        like: Optional[str] = None,
+        not_like: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """List available ClickHouse tables in a database
+
+        Args:
+            database: Database name
+            like: Filter tables with LIKE pattern (optional)
+            not_like: Filter tables with NOT LIKE pattern (optional)
+            use_cache: Serve the result from the schema cache when available
+        """
+        cache_key = (
+            f"{self.base_url}:list_tables:{json.dumps([database, like, not_like])}"
+        )
+        use_cache = use_cache and STRANDS_SCHEMA_CACHE_TTL > 0
         try:
+            if use_cache:
+                cached_result = await _schema_cache.get(cache_key)
+                if cached_result is not None:
+                    log.info(
+                        f"[CLICKHOUSE MCP] ✓ list_tables for {database} served from schema cache"
+                    )
+                    return cached_result
+
             log.info(f"[CLICKHOUSE MCP] Calling list_tables")
             log.info(f"[CLICKHOUSE MCP] Database: {database}")
             if like:
@@ -212,13 +655,12 @@ class ClickHouseMCPClient:
             if not_like:
                 payload["not_like"] = not_like
             
-            response = self.session.post(
-                f"{self.base_url}/list_tables",
-                json=payload,
-                headers={"Content-Type": "application/json"}
+            result = await self._post(
+                "list_tables",
+                payload,
+                timeout=STRANDS_CLICKHOUSE_MCP_TIMEOUT,
+                retries=STRANDS_CLICKHOUSE_MCP_MAX_RETRIES,
             )
-            response.raise_for_status()
-            result = response.json()
             
             # Handle both list and dict responses from MCP server
             if isinstance(result, list):
@@ -242,47 +684,112 @@ class ClickHouseMCPClient:
                     tables_list = result.get('tables', [])[:10]
                     table_names = [t.get('name', t) if isinstance(t, dict) else str(t) for t in tables_list]
                     log.info(f"[CLICKHOUSE MCP] First 10 tables: {', '.join(table_names)}")
+                if use_cache:
+                    await _schema_cache.set(cache_key, result)
             
             return result
         except Exception as e:
             error_msg = f"Failed to list tables: {str(e)}"
             log.error(f"[CLICKHOUSE MCP] ✗ {error_msg}")
             return {"error": error_msg}
-    
-    def run_select_query(self, query: str) -> Dict[str, Any]:
-        """Run a SELECT query in a ClickHouse database"""
+
+    async def run_select_query(
+        self, query: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Run a SELECT query in a ClickHouse database
+
+        Results are cached by normalized SQL, and identical queries that are already
+        running (from this or another request) are awaited instead of re-issued.
+
+        Args:
+            query: SQL SELECT query to execute
+            use_cache: Serve the result from the query cache when available
+        """
+        log.info(f"[CLICKHOUSE MCP] Executing SQL query")
+        # Log truncated query for readability
+        if len(query) > 200:
+            log.info(f"[CLICKHOUSE QUERY] Query (truncated): {query[:200]}...")
+            log.info(f"[CLICKHOUSE QUERY] Full query length: {len(query)} characters")
+        else:
+            log.info(f"[CLICKHOUSE QUERY] Query: {query}")
+
+        # Add query to execution log for DB Queries tab
+        query_event = {
+            "type": "clickhouse_query",
+            "query": query,
+            "timestamp": datetime.now().isoformat(),
+            "description": (
+                f"ClickHouse Query: {query[:100]}..."
+                if len(query) > 100
+                else f"ClickHouse Query: {query}"
+            ),
+        }
+        get_execution_context().append(query_event)
+        log.info(f"[CLICKHOUSE QUERY] Added query to execution log")
+
+        query_key = hashlib.sha256(
+            f"{self.base_url}\n{normalize_query(query)}".encode()
+        ).hexdigest()
+        use_cache = use_cache and STRANDS_QUERY_CACHE_TTL > 0
+        if use_cache:
+            cached_result = await _query_cache.get(query_key)
+            if cached_result is not None:
+                log.info(f"[CLICKHOUSE MCP] ✓ Query served from query cache")
+                return cached_result
+
+        # Coalesce identical queries that are already running
+        in_flight = self._in_flight_queries.get(query_key)
+        if in_flight is not None:
+            log.info(
+                f"[CLICKHOUSE MCP] Identical query already running, waiting for its result"
+            )
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The request that issued the query went away; run it ourselves
+                return await self._execute_select_query(query)
+
+        in_flight = asyncio.get_running_loop().create_future()
+        self._in_flight_queries[query_key] = in_flight
         try:
-            log.info(f"[CLICKHOUSE MCP] Executing SQL query")
-            # Log truncated query for readability
-            if len(query) > 200:
-                log.info(f"[CLICKHOUSE QUERY] Query (truncated): {query[:200]}...")
-                log.info(f"[CLICKHOUSE QUERY] Full query length: {len(query)} characters")
-            else:
-                log.info(f"[CLICKHOUSE QUERY] Query: {query}")
-            
-            # Add query to execution log for DB Queries tab
-            global _execution_log
-            with _execution_log_lock:
-                query_event = {
-                    "type": "clickhouse_query",
-                    "query": query,
-                    "timestamp": datetime.now().isoformat(),
-                    "description": f"ClickHouse Query: {query[:100]}..." if len(query) > 100 else f"ClickHouse Query: {query}"
-                }
-                _execution_log.append(query_event)
-                log.info(f"[CLICKHOUSE QUERY] Added query to execution log")
-            
-            _notify_execution_listeners(query_event)
-            
+            result = await self._execute_select_query(query)
+            if use_cache and "error" not in result:
+                await _query_cache.set(query_key, result)
+            in_flight.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Let waiters run the query on their own
+            in_flight.cancel()
+            raise
+        finally:
+            self._in_flight_queries.pop(query_key, None)
+
+    async def _execute_select_query(self, query: str) -> Dict[str, Any]:
+        """Send a SELECT query to the MCP server"""
+        try:
+            # Queries are not retried; they may be expensive and are not guaranteed to be idempotent
             payload = {"query": query}
-            response = self.session.post(
-                f"{self.base_url}/run_select_query",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            result = response.json()
+            async with self._get_query_semaphore():
+                body, body_truncated = await self._post_with_budget(
+                    "run_select_query",
+                    payload,
+                    timeout=STRANDS_CLICKHOUSE_MCP_QUERY_TIMEOUT,
+                    max_bytes=STRANDS_QUERY_MAX_BYTES,
+                )
             
+            if body_truncated:
+                # Keep the complete rows that fit in the byte budget
+                columns, rows = parse_partial_query_result(body)
+                result = {"rows": rows, "columns": columns}
+                log.warning(
+                    f"[CLICKHOUSE MCP] Result exceeded {STRANDS_QUERY_MAX_BYTES} bytes, "
+                    f"kept {len(rows)} complete row(s)"
+                )
+            else:
+                result = json.loads(body)
+
             # Handle both list and dict responses from MCP server
             if isinstance(result, list):
                 # MCP server returned raw rows as a list
@@ -294,6 +801,7 @@ class ClickHouseMCPClient:
             if "error" in result:
                 log.error(f"[CLICKHOUSE MCP] ✗ Query execution failed: {result['error']}")
             else:
+                result = apply_query_result_budget(result, body_truncated)
                 row_count = len(result.get("rows", []))
                 col_count = len(result.get("columns", []))
                 log.info(f"[CLICKHOUSE MCP] ✓ Query executed successfully")
@@ -308,43 +816,35 @@ class ClickHouseMCPClient:
             return {"error": error_msg}
 
 def log_tool_call(tool_name: str, args: dict = None):
-    """Log a tool call to the execution log"""
-    global _execution_log, _tool_call_counts
-
-    with _execution_log_lock:
-        # Update call count
-        _tool_call_counts[tool_name] = _tool_call_counts.get(tool_name, 0) + 1
-
-        # Log the event
-        event = {
-            "type": "tool_call",
-            "tool_name": tool_name,
-            "args": args or {},
-            "timestamp": datetime.now().isoformat(),
-            "call_number": _tool_call_counts[tool_name]
-        }
-        _execution_log.append(event)
+    """Log a tool call to the execution log of the current request"""
+    context = get_execution_context()
+    call_number = context.count_tool_call(tool_name)
+
+    event = {
+        "type": "tool_call",
+        "tool_name": tool_name,
+        "args": args or {},
+        "timestamp": datetime.now().isoformat(),
+        "call_number": call_number,
+    }
 
     # Enhanced console logging
-    log.info(f"[STRANDS TOOL] ▶ Calling tool '{tool_name}' (attempt #{_tool_call_counts[tool_name]})")
+    log.info(f"[STRANDS TOOL] ▶ Calling tool '{tool_name}' (attempt #{call_number})")
     if args:
         log.info(f"[STRANDS TOOL] Arguments: {json.dumps(args, indent=2, default=str)}")
     
-    _notify_execution_listeners(event)
+    context.append(event)
 
-def log_tool_result(tool_name: str, result: Any, error: str = None):
-    """Log a tool result to the execution log"""
-    global _execution_log
 
-    with _execution_log_lock:
-        event = {
-            "type": "tool_result",
-            "tool_name": tool_name,
-            "success": error is None,
-            "error": error,
-            "timestamp": datetime.now().isoformat()
-        }
-        _execution_log.append(event)
+def log_tool_result(tool_name: str, result: Any, error: str = None):
+    """Log a tool result to the execution log of the current request"""
+    event = {
+        "type": "tool_result",
+        "tool_name": tool_name,
+        "success": error is None,
+        "error": error,
+        "timestamp": datetime.now().isoformat(),
+    }
 
     # Enhanced console logging
     if error:
@@ -360,184 +860,146 @@ def log_tool_result(tool_name: str, result: Any, error: str = None):
         else:
             log.info(f"[STRANDS TOOL] Result: {result_str}")
 
-    _notify_execution_listeners(event)
-
-def reset_execution_tracking():
-    """Reset execution tracking for a new request"""
-    global _execution_log, _tool_call_counts
-    with _execution_log_lock:
-        # Log summary of previous execution if there was any activity
-        if _execution_log or _tool_call_counts:
-            log.info("[STRANDS TRACKING] Previous execution summary:")
-            log.info(f"[STRANDS TRACKING] - Total events: {len(_execution_log)}")
-            log.info(f"[STRANDS TRACKING] - Total tool calls: {sum(_tool_call_counts.values())}")
-            for tool_name, count in _tool_call_counts.items():
-                log.info(f"[STRANDS TRACKING]   • {tool_name}: {count}")
-        
-        # Reset tracking
-        _execution_log = []
-        _tool_call_counts = {}
-        log.info("[STRANDS TRACKING] ✓ Execution tracking reset for new request")
+    get_execution_context().append(event)
 
-class StreamingOutputCapture:
-    """Custom file-like object that streams output to logging in real-time"""
-    
-    def __init__(self, logger_func, prefix):
-        self.logger_func = logger_func
-        self.prefix = prefix
-        self.buffer = ""
-        self.current_reasoning = ""
-        self.tool_counter = 0
-    
-    def write(self, text):
-        """Write text and log complete lines immediately"""
-        if text:
-            self.buffer += text
-            # Process complete lines
-            while '\n' in self.buffer:
-                line, self.buffer = self.buffer.split('\n', 1)
-                if line.strip():
-                    self.logger_func(f"{self.prefix} {line.strip()}")
-                    # Extract reasoning for chain of thought
-                    self._extract_reasoning(line.strip())
-        return len(text)
-    
-    def _extract_reasoning(self, line):
-        """Extract reasoning from agent output for chain of thought logging"""
-        global _execution_log
-        
-        # Skip tool usage patterns - we don't want these in chain of thought
-        if line.startswith("Tool #"):
-            # Don't add tool calls to chain of thought, just log them
-            if ":" in line:
-                tool_name = line.split(":", 1)[1].strip()
-                log.info(f"[STRANDS TOOL_USAGE] Tool call detected: {tool_name}")
-            return
-        
-        # Detect reasoning patterns in agent output - only include actual reasoning
-        if any(keyword in line.lower() for keyword in [
-            "let me", "now let me", "i'll", "i will", "let's", "first", "next", 
-            "then", "now i", "i need to", "to analyze", "to check", "to find",
-            "excellent", "perfect", "good", "great", "based on", "looking at",
-            "the analysis", "from the", "this shows", "we can see", "it appears"
-        ]):
-            # This looks like reasoning text
-            self.current_reasoning = line
-            
-            # Log reasoning as chain of thought
-            with _execution_log_lock:
-                event = {
-                    "type": "reasoning_step", 
-                    "description": f"Agent reasoning: {line}",
-                    "reasoning_text": line,
-                    "timestamp": datetime.now().isoformat()
-                }
-                _execution_log.append(event)
-                log.info(f"[STRANDS CHAIN_OF_THOUGHT] Agent reasoning: {line}")
-            
-            _notify_execution_listeners(event)
-    
-    def flush(self):
-        """Flush any remaining content in buffer"""
-        if self.buffer.strip():
-            self.logger_func(f"{self.prefix} {self.buffer.strip()}")
-            self._extract_reasoning(self.buffer.strip())
-            self.buffer = ""
-
-def capture_agent_output(func, *args, **kwargs):
-    """Capture stdout/stderr from Strands agent and stream to logging in real-time"""
-    # Create streaming capture objects
-    stdout_capture = StreamingOutputCapture(log.info, "[STRANDS AGENT OUTPUT]")
-    stderr_capture = StreamingOutputCapture(log.error, "[STRANDS AGENT ERROR]")
-    
-    try:
-        with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-            result = func(*args, **kwargs)
-        
-        # Flush any remaining content
-        stdout_capture.flush()
-        stderr_capture.flush()
-        
-        return result
-        
-    except Exception as e:
-        # Flush any remaining content even if there was an exception
-        stdout_capture.flush()
-        stderr_capture.flush()
-        raise e
 
-def initialize_agent(system_prompt: Optional[str] = None):
-    """Initialize the Strands agent with tools
-    
-    Args:
-        system_prompt: Optional system prompt to use. If None, uses the default prompt.
+class AgentEventRecorder:
+    """Records structured reasoning from the agent's event stream into the execution context
+
+    Each completed assistant message yields chain of thought steps for the model's
+    reasoning blocks and for any text the model wrote before calling tools. Text of
+    the final message is the answer itself and is not recorded as reasoning.
     """
-    global _agent_instance, _clickhouse_client, _agent_tools
-    
-    # Reload configuration from CONFIG_DATA to get latest values
-    log.info(f"[STRANDS AGENT] Reloading configuration from CONFIG_DATA")
-    current_config = get_strands_config()
-    current_aws_profile = current_config['AWS_PROFILE']
-    current_aws_region = current_config['AWS_DEFAULT_REGION']
-    current_model_id = current_config['MODEL_ID']
-    current_clickhouse_url = current_config['CLICKHOUSE_MCP_BASE_URL']
-    
-    log.info(f"[STRANDS AGENT] Current config from CONFIG_DATA:")
-    log.info(f"[STRANDS AGENT] - AWS_PROFILE: {current_aws_profile}")
-    log.info(f"[STRANDS AGENT] - AWS_DEFAULT_REGION: {current_aws_region}")
-    log.info(f"[STRANDS AGENT] - MODEL_ID: {current_model_id}")
-    log.info(f"[STRANDS AGENT] - CLICKHOUSE_MCP_BASE_URL: {current_clickhouse_url}")
-    
-    # Use provided system prompt or fall back to environment/default
-    prompt_to_use = system_prompt if system_prompt is not None else SYSTEM_PROMPT
-    
-    # If a custom system prompt is provided, don't use the cached instance
-    if _agent_instance is not None and system_prompt is None:
-        return _agent_instance
-    
-    if Agent is None or BedrockModel is None or tool is None:
-        log.error("Strands dependencies not available")
+
+    def __init__(self, context: Optional[ExecutionContext] = None):
+        self.context = context or get_execution_context()
+
+    def handle(self, event: Dict[str, Any]):
+        """Process one event from Agent.stream_async"""
+        if event.get("force_stop"):
+            log.warning(
+                f"[STRANDS AGENT] Agent stopped: {event.get('force_stop_reason')}"
+            )
+            return
+
+        message = event.get("message")
+        if not isinstance(message, dict) or message.get("role") != "assistant":
+            return
+
+        content = message.get("content") or []
+        tool_names = [
+            block["toolUse"].get("name") for block in content if "toolUse" in block
+        ]
+        for tool_name in tool_names:
+            log.info(f"[STRANDS TOOL_USAGE] Tool call requested: {tool_name}")
+
+        for block in content:
+            if "reasoningContent" in block:
+                reasoning_text = (
+                    (block["reasoningContent"].get("reasoningText") or {})
+                    .get("text", "")
+                    .strip()
+                )
+                if reasoning_text:
+                    self._record_step("Model reasoning", reasoning_text)
+            elif "text" in block and tool_names:
+                text = block["text"].strip()
+                if text:
+                    self._record_step(f"Agent reasoning: {text.splitlines()[0]}", text)
+
+    def _record_step(self, description: str, reasoning_text: str):
+        log.info(f"[STRANDS CHAIN_OF_THOUGHT] {description}")
+        self.context.append(
+            {
+                "type": "reasoning_step",
+                "description": description,
+                "reasoning_text": reasoning_text,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+
+
+def _get_config_version(config: Dict[str, Any]) -> str:
+    """Fingerprint of the Strands configuration, used to retire agents built from stale config"""
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+def get_clickhouse_client() -> Optional[ClickHouseMCPClient]:
+    """Get the shared ClickHouse MCP client for the current configuration"""
+    global _clickhouse_client
+
+    clickhouse_url = get_strands_config()["CLICKHOUSE_MCP_BASE_URL"]
+    if not clickhouse_url:
+        log.error("[CLICKHOUSE MCP] CLICKHOUSE_MCP_BASE_URL is not configured")
         return None
-    
+
+    with _agent_build_lock:
+        if _clickhouse_client is None or _clickhouse_client.base_url != clickhouse_url:
+            if _clickhouse_client is not None:
+                _close_clickhouse_client(_clickhouse_client)
+            _clickhouse_client = ClickHouseMCPClient(clickhouse_url)
+        return _clickhouse_client
+
+
+def _close_clickhouse_client(client: ClickHouseMCPClient):
+    """Close a replaced client's connection pool in the background"""
     try:
-        # Verify required configuration
-        if not all([current_aws_profile, current_aws_region, current_model_id, current_clickhouse_url]):
-            log.error("Missing required Strands configuration")
-            log.error(f"AWS_PROFILE: {current_aws_profile}")
-            log.error(f"AWS_DEFAULT_REGION: {current_aws_region}")
-            log.error(f"MODEL_ID: {current_model_id}")
-            log.error(f"CLICKHOUSE_MCP_BASE_URL: {current_clickhouse_url}")
-            raise ValueError("Strands configuration incomplete: AWS_PROFILE, AWS_DEFAULT_REGION, MODEL_ID, and CLICKHOUSE_MCP_BASE_URL are required")
-        
-        log.info(f"[STRANDS AGENT] Initializing with configuration:")
-        log.info(f"[STRANDS AGENT] - AWS Profile: {current_aws_profile}")
-        log.info(f"[STRANDS AGENT] - AWS Region: {current_aws_region}")
-        log.info(f"[STRANDS AGENT] - Bedrock Model: {current_model_id}")
-        
+        asyncio.get_running_loop().create_task(client.close())
+    except RuntimeError:
+        # No running loop; the pool is released when the session is garbage collected
+        pass
+
+
+def _get_bedrock_model(config: Dict[str, Any]):
+    """Get the shared BedrockModel for the given configuration, creating it on first use"""
+    global _bedrock_model, _bedrock_model_version
+
+    config_version = _get_config_version(config)
+    with _agent_build_lock:
+        if _bedrock_model is not None and _bedrock_model_version == config_version:
+            return _bedrock_model
+
         # Set AWS credentials using profile
-        if current_aws_profile:
-            log.info(f"[STRANDS AGENT] Setting AWS profile: {current_aws_profile}")
-            boto_session = boto3.Session(profile_name=current_aws_profile, region_name=current_aws_region)
+        if config["AWS_PROFILE"]:
+            log.info(f"[STRANDS AGENT] Setting AWS profile: {config['AWS_PROFILE']}")
+            boto_session = boto3.Session(
+                profile_name=config["AWS_PROFILE"],
+                region_name=config["AWS_DEFAULT_REGION"],
+            )
             log.info(f"[STRANDS AGENT] Boto3 session created with profile")
         else:
             log.info(f"[STRANDS AGENT] Creating default boto3 session")
-            boto_session = boto3.Session(region_name=current_aws_region)
-        
+            boto_session = boto3.Session(region_name=config["AWS_DEFAULT_REGION"])
+
         # Initialize BedrockModel with the boto session
-        log.info(f"[STRANDS AGENT] Initializing BedrockModel with model_id: {current_model_id}")
-        model_id = BedrockModel(model_id=current_model_id, max_tokens=64000, boto_session=boto_session)
+        log.info(
+            f"[STRANDS AGENT] Initializing BedrockModel with model_id: {config['MODEL_ID']}"
+        )
+        _bedrock_model = BedrockModel(
+            model_id=config["MODEL_ID"], max_tokens=64000, boto_session=boto_session
+        )
+        _bedrock_model_version = config_version
         log.info("[STRANDS AGENT] BedrockModel initialized successfully")
-        
-        # Initialize ClickHouse client
-        _clickhouse_client = ClickHouseMCPClient(current_clickhouse_url)
-        
+        return _bedrock_model
+
+
+def _get_agent_tools() -> List[Any]:
+    """Get the ClickHouse tools shared by all agents, creating them on first use"""
+    global _agent_tools
+
+    with _agent_build_lock:
+        if _agent_tools:
+            return _agent_tools
+
         # Create tools for the agent
         @tool
-        def list_databases():
+        async def list_databases():
             """List available ClickHouse databases"""
             log_tool_call("list_databases")
             try:
-                result = _clickhouse_client.list_databases()
+                result = await get_clickhouse_client().list_databases()
                 log_tool_result("list_databases", result)
                 return result
             except Exception as e:
@@ -545,7 +1007,7 @@ def initialize_agent(system_prompt: Optional[str] = None):
                 raise
 
         @tool
-        def list_tables(database: str, like: str = None, not_like: str = None):
+        async def list_tables(database: str, like: str = None, not_like: str = None):
             """List available ClickHouse tables in a database, including schema, comment, row count, and column count
             
             Args:
@@ -555,7 +1017,9 @@ def initialize_agent(system_prompt: Optional[str] = None):
             """
             log_tool_call("list_tables", {"database": database, "like": like, "not_like": not_like})
             try:
-                result = _clickhouse_client.list_tables(database, like, not_like)
+                result = await get_clickhouse_client().list_tables(
+                    database, like, not_like
+                )
                 log_tool_result("list_tables", result)
                 return result
             except Exception as e:
@@ -563,7 +1027,7 @@ def initialize_agent(system_prompt: Optional[str] = None):
                 raise
 
         @tool
-        def run_select_query(query: str):
+        async def run_select_query(query: str):
             """Run a SELECT query in a ClickHouse database
             
             Args:
@@ -571,7 +1035,7 @@ def initialize_agent(system_prompt: Optional[str] = None):
             """
             log_tool_call("run_select_query", {"query": query[:100]})  # Log first 100 chars of query
             try:
-                result = _clickhouse_client.run_select_query(query)
+                result = await get_clickhouse_client().run_select_query(query)
                 log_tool_result("run_select_query", result)
                 return result
             except Exception as e:
@@ -580,33 +1044,213 @@ def initialize_agent(system_prompt: Optional[str] = None):
 
         # Store tools for introspection
         _agent_tools = [list_databases, list_tables, run_select_query]
-        
-        # Create agent with tools
-        log.info("[STRANDS AGENT] Creating Strands Agent with tools...")
-        log.info(f"[STRANDS AGENT] Final configuration for agent creation:")
-        log.info(f"[STRANDS AGENT] - Model ID: {current_model_id}")
+        return _agent_tools
+
+
+def initialize_agent(system_prompt: Optional[str] = None):
+    """Create a new Strands agent with tools
+
+    The boto3 session, BedrockModel, ClickHouse client and tools are shared across
+    agents; only the Agent itself (which holds the conversation state) is new.
+    Use checkout_agent() to get an agent from the pool instead of calling this directly.
+
+    Args:
+        system_prompt: Optional system prompt to use. If None, uses the default prompt.
+    """
+    # Reload configuration from CONFIG_DATA to get latest values
+    log.info(f"[STRANDS AGENT] Reloading configuration from CONFIG_DATA")
+    current_config = get_strands_config()
+    current_aws_profile = current_config["AWS_PROFILE"]
+    current_aws_region = current_config["AWS_DEFAULT_REGION"]
+    current_model_id = current_config["MODEL_ID"]
+    current_clickhouse_url = current_config["CLICKHOUSE_MCP_BASE_URL"]
+
+    log.info(f"[STRANDS AGENT] Current config from CONFIG_DATA:")
+    log.info(f"[STRANDS AGENT] - AWS_PROFILE: {current_aws_profile}")
+    log.info(f"[STRANDS AGENT] - AWS_DEFAULT_REGION: {current_aws_region}")
+    log.info(f"[STRANDS AGENT] - MODEL_ID: {current_model_id}")
+    log.info(f"[STRANDS AGENT] - CLICKHOUSE_MCP_BASE_URL: {current_clickhouse_url}")
+
+    # Use provided system prompt or fall back to environment/default
+    prompt_to_use = system_prompt if system_prompt is not None else SYSTEM_PROMPT
+
+    if Agent is None or BedrockModel is None or tool is None:
+        log.error("Strands dependencies not available")
+        return None
+
+    try:
+        # Verify required configuration
+        if not all(
+            [
+                current_aws_profile,
+                current_aws_region,
+                current_model_id,
+                current_clickhouse_url,
+            ]
+        ):
+            log.error("Missing required Strands configuration")
+            log.error(f"AWS_PROFILE: {current_aws_profile}")
+            log.error(f"AWS_DEFAULT_REGION: {current_aws_region}")
+            log.error(f"MODEL_ID: {current_model_id}")
+            log.error(f"CLICKHOUSE_MCP_BASE_URL: {current_clickhouse_url}")
+            raise ValueError(
+                "Strands configuration incomplete: AWS_PROFILE, AWS_DEFAULT_REGION, MODEL_ID, and CLICKHOUSE_MCP_BASE_URL are required"
+            )
+
+        log.info(f"[STRANDS AGENT] Initializing with configuration:")
         log.info(f"[STRANDS AGENT] - AWS Profile: {current_aws_profile}")
         log.info(f"[STRANDS AGENT] - AWS Region: {current_aws_region}")
-        log.info(f"[STRANDS AGENT] - ClickHouse URL: {current_clickhouse_url}")
-        log.info(f"[STRANDS AGENT] - Tools: {[tool.__name__ for tool in _agent_tools]}")
-        
+        log.info(f"[STRANDS AGENT] - Bedrock Model: {current_model_id}")
+
+        model = _get_bedrock_model(current_config)
+        agent_tools = _get_agent_tools()
+
+        # Create agent with tools
+        log.info("[STRANDS AGENT] Creating Strands Agent with tools...")
+        log.info(
+            f"[STRANDS AGENT] - Tools: {[agent_tool.__name__ for agent_tool in agent_tools]}"
+        )
+
         agent = Agent(
-            model=model_id,
+            model=model,
             system_prompt=prompt_to_use,
-            tools=_agent_tools
+            tools=agent_tools,
+            # Events are consumed from stream_async; the default handler prints to stdout
+            callback_handler=None,
         )
         log.info("[STRANDS AGENT] ✓ Agent setup completed successfully")
         log.info(f"[STRANDS AGENT] System prompt length: {len(prompt_to_use)} characters")
         
-        # Always cache the agent instance so get_agent_internals() can access it
-        _agent_instance = agent
-        
         return agent
         
     except Exception as e:
         log.error(f"Failed to initialize Strands agent: {e}")
         return None
 
+
+class AgentPool:
+    """Bounded pool of idle Strands agents with checkout/return semantics and LRU eviction
+
+    Agents are keyed by (model id, system prompt hash, config version). A checked out
+    agent is used by exactly one request, so concurrent requests never share an agent's
+    message history.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._idle: "OrderedDict[tuple, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _size(self) -> int:
+        return sum(len(agents) for agents in self._idle.values())
+
+    def checkout(self, key: tuple, factory):
+        """Take an idle agent for key, or build a new one with factory()"""
+        with self._lock:
+            agents = self._idle.get(key)
+            if agents:
+                agent = agents.pop()
+                if not agents:
+                    del self._idle[key]
+                log.info(f"[STRANDS POOL] Reusing pooled agent for key {key}")
+                return agent
+
+        log.info(f"[STRANDS POOL] No idle agent for key {key}, creating a new one")
+        return factory()
+
+    def release(self, key: tuple, agent):
+        """Return an agent to the pool, clearing its conversation state"""
+        if key[2] != _get_config_version(get_strands_config()):
+            log.info(f"[STRANDS POOL] Discarding agent built from stale configuration")
+            return
+
+        try:
+            agent.messages = []
+        except Exception as e:
+            log.warning(
+                f"[STRANDS POOL] Failed to reset agent conversation state, discarding agent: {e}"
+            )
+            return
+
+        with self._lock:
+            self._idle.setdefault(key, []).append(agent)
+            self._idle.move_to_end(key)
+
+            # Evict least recently used agents beyond the pool size
+            while self._size() > self.max_size:
+                lru_key, lru_agents = next(iter(self._idle.items()))
+                lru_agents.pop(0)
+                if not lru_agents:
+                    del self._idle[lru_key]
+                log.info(f"[STRANDS POOL] Evicted idle agent for key {lru_key}")
+
+    def clear(self):
+        """Drop all idle agents"""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": self._size(),
+                "keys": len(self._idle),
+                "max_size": self.max_size,
+            }
+
+
+_agent_pool = AgentPool(STRANDS_AGENT_POOL_SIZE)
+
+
+class AgentLease:
+    """An agent checked out from the pool; call release() once the request is done"""
+
+    def __init__(self, key: tuple, agent):
+        self.key = key
+        self.agent = agent
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        _agent_pool.release(self.key, self.agent)
+
+
+def checkout_agent(system_prompt: Optional[str] = None) -> Optional[AgentLease]:
+    """Check out an agent for the given system prompt from the pool
+
+    Args:
+        system_prompt: Optional system prompt to use. If None, uses the default prompt.
+    """
+    current_config = get_strands_config()
+    prompt_to_use = system_prompt if system_prompt is not None else SYSTEM_PROMPT
+    key = (
+        current_config["MODEL_ID"],
+        hashlib.sha256(prompt_to_use.encode()).hexdigest()[:16],
+        _get_config_version(current_config),
+    )
+
+    agent = _agent_pool.checkout(
+        key, lambda: initialize_agent(system_prompt=system_prompt)
+    )
+    if agent is None:
+        return None
+    return AgentLease(key, agent)
+
+
+def reset_agents():
+    """Drop pooled agents and shared clients so the next request picks up new configuration"""
+    global _clickhouse_client, _bedrock_model, _bedrock_model_version
+
+    _agent_pool.clear()
+    with _agent_build_lock:
+        if _clickhouse_client is not None:
+            _close_clickhouse_client(_clickhouse_client)
+        _clickhouse_client = None
+        _bedrock_model = None
+        _bedrock_model_version = None
+
+
 class AgentInternals(BaseModel):
     """Model for agent internal state"""
     tools: List[Dict[str, Any]]
@@ -640,31 +1284,56 @@ class ChatResponse(BaseModel):
     usage: Optional[Dict[str, int]] = None
     internals: Optional[AgentInternals] = None
 
-def get_agent_internals(system_prompt: Optional[str] = None) -> Optional[AgentInternals]:
+
+def build_chain_of_thought(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build chain of thought steps from execution log events"""
+    chain_of_thought = []
+    for event in events:
+        if event["type"] == "reasoning_step":
+            # Only include reasoning steps from agent output
+            chain_of_thought.append(
+                {
+                    "description": event.get("description", "Agent reasoning"),
+                    "timestamp": event["timestamp"],
+                    "reasoning": event.get(
+                        "reasoning_text", event.get("tool_context", "")
+                    ),
+                }
+            )
+    return chain_of_thought
+
+
+def get_agent_internals(
+    system_prompt: Optional[str] = None,
+    context: Optional[ExecutionContext] = None,
+    agent=None,
+) -> Optional[AgentInternals]:
     """Get current agent internal state with execution tracking
     
     Args:
         system_prompt: Optional system prompt to include in internals. If None, uses the agent's actual system prompt.
+        context: Execution context of the request. If None, uses the context of the current request.
+        agent: The agent serving the request, used to read its actual system prompt.
     """
-    global _agent_instance, _agent_tools, _execution_log, _tool_call_counts
+    global _agent_tools
     
-    if _agent_instance is None:
+    if not _agent_tools:
         log.warning("[STRANDS INTERNALS] Agent not initialized")
         return None
     
     # Use provided system prompt, or get the actual system prompt from the agent instance, or fall back to default
     if system_prompt is not None:
         prompt_to_show = system_prompt
-    elif hasattr(_agent_instance, 'system_prompt') and _agent_instance.system_prompt:
-        prompt_to_show = _agent_instance.system_prompt
+    elif agent is not None and getattr(agent, "system_prompt", None):
+        prompt_to_show = agent.system_prompt
     else:
         prompt_to_show = SYSTEM_PROMPT
     
     try:
-        with _execution_log_lock:
-            execution_log_snapshot = list(_execution_log)
-            tool_call_counts_snapshot = dict(_tool_call_counts)
-        
+        execution_log_snapshot, tool_call_counts_snapshot = (
+            context or get_execution_context()
+        ).snapshot()
+
         # Extract tool information with call counts
         tools_info = []
         for tool_func in _agent_tools:
@@ -693,18 +1362,7 @@ def get_agent_internals(system_prompt: Optional[str] = None) -> Optional[AgentIn
         }
         
         # Build chain of thought from execution log - only include reasoning steps
-        chain_of_thought = []
-        step_number = 1
-        for event in execution_log_snapshot:
-            if event["type"] == "reasoning_step":
-                # Only include reasoning steps from agent output
-                step = {
-                    "description": event.get("description", "Agent reasoning"),
-                    "timestamp": event["timestamp"],
-                    "reasoning": event.get("reasoning_text", event.get("tool_context", ""))
-                }
-                chain_of_thought.append(step)
-                step_number += 1
+        chain_of_thought = build_chain_of_thought(execution_log_snapshot)
         
         # Calculate metrics
         total_tool_calls = sum(tool_call_counts_snapshot.values())
@@ -807,8 +1465,6 @@ async def update_config(
 ):
     """Update Strands AI configuration and persist to database"""
     global AWS_PROFILE, AWS_DEFAULT_REGION, MODEL_ID, CLICKHOUSE_MCP_BASE_URL
-    global _agent_instance, _clickhouse_client
-    
     log.info(f"[STRANDS CONFIG] ===== POST /config/update START =====")
     log.info(f"[STRANDS CONFIG] Received config_data: {config_data}")
     log.info(f"[STRANDS CONFIG] config_data type: {type(config_data)}")
@@ -886,9 +1542,10 @@ async def update_config(
     log.info(f"[STRANDS CONFIG] RELOADED_CONFIG_DATA['strands'] after save: {RELOADED_CONFIG_DATA.get('strands', {})}")
     
     # Reset agent to pick up new configuration
-    _agent_instance = None
-    _clickhouse_client = None
-    log.info(f"[STRANDS CONFIG] Agent and ClickHouse client reset")
+    reset_agents()
+    await _schema_cache.invalidate()
+    await _query_cache.invalidate()
+    log.info(f"[STRANDS CONFIG] Agent pool, ClickHouse client and caches reset")
     
     # Verify config was saved by reading it back from CONFIG_DATA
     log.info(f"[STRANDS CONFIG] Verifying by calling get_strands_config()...")
@@ -973,6 +1630,47 @@ def _format_execution_status(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return None
 
 
+async def _run_agent_stream(
+    agent,
+    conversation_context: str,
+    context: ExecutionContext,
+    queue: Optional[asyncio.Queue] = None,
+):
+    """Consume the agent's async event stream and forward text deltas and tool uses to queue
+
+    Runs as its own task, so binding the execution context here only affects this
+    request; tool functions run in the same task (or through asyncio.to_thread) and
+    inherit it. Returns the final agent result.
+    """
+    _current_execution_context.set(context)
+    recorder = AgentEventRecorder(context)
+    seen_tool_uses = set()
+    result = None
+
+    async for event in agent.stream_async(conversation_context):
+        recorder.handle(event)
+        if event.get("data"):
+            if queue is not None:
+                queue.put_nowait({"type": "text_delta", "text": event["data"]})
+        elif event.get("current_tool_use"):
+            tool_use = event["current_tool_use"]
+            tool_use_id = tool_use.get("toolUseId")
+            if tool_use_id and tool_use_id not in seen_tool_uses and queue is not None:
+                seen_tool_uses.add(tool_use_id)
+                queue.put_nowait(
+                    {
+                        "type": "tool_use",
+                        "tool_name": tool_use.get("name"),
+                        "tool_use_id": tool_use_id,
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+        elif "result" in event:
+            result = event["result"]
+
+    return result
+
+
 async def stream_strands_response(
     agent,
     conversation_context: str,
@@ -980,9 +1678,12 @@ async def stream_strands_response(
     model: str,
     start_time,
     include_internals: bool = False,
-    system_prompt: Optional[str] = None
+    system_prompt: Optional[str] = None,
+    context: Optional[ExecutionContext] = None,
+    lease: Optional[AgentLease] = None,
 ):
     """Stream the Strands AI response in real-time"""
+    context = context or ExecutionContext(request_id)
     
     log.info(f"[STRANDS STREAM] Starting stream for request {request_id}")
     log.info(f"[STRANDS STREAM] Conversation context length: {len(conversation_context)} characters")
@@ -991,7 +1692,7 @@ async def stream_strands_response(
 
     loop = asyncio.get_running_loop()
     execution_queue: asyncio.Queue = asyncio.Queue()
-    register_execution_listener(loop, execution_queue)
+    context.register_listener(loop, execution_queue)
 
     def _status_event(payload: Dict[str, Any]) -> str:
         return f"data: {json.dumps({'type': 'status', 'data': payload})}\n\n"
@@ -1012,83 +1713,141 @@ async def stream_strands_response(
             }],
             "strands_internals": internals_data
         }
+        return f"data: {json.dumps(chunk_data, default=str)}\n\n"
+
+    streamed_content: List[str] = []
+    after_tool_use = False
+
+    def _content_event(content: str) -> str:
+        """Forward a text delta as an OpenAI-style content chunk"""
+        nonlocal after_tool_use
+        if after_tool_use:
+            content = f"\n\n{content}"
+            after_tool_use = False
+        chunk_data = {
+            "id": request_id,
+            "object": "chat.completion.chunk",
+            "created": int(start_time.timestamp()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {
+                        "role": "assistant" if not streamed_content else None,
+                        "content": content,
+                    },
+                    "finish_reason": None,
+                }
+            ],
+        }
+        streamed_content.append(content)
         return f"data: {json.dumps(chunk_data)}\n\n"
 
     # Initial status updates
     log.info(f"[STRANDS STREAM] Sending initialization status")
     yield _status_event(_format_status_message("Initializing Strands agent...", done=True))
 
+    agent_task = None
     try:
-        agent_task = asyncio.create_task(asyncio.to_thread(capture_agent_output, agent, conversation_context))
+        agent_task = asyncio.create_task(
+            _run_agent_stream(agent, conversation_context, context, execution_queue)
+        )
         log.info(f"[STRANDS STREAM] Agent task created")
         yield _status_event(_format_status_message("Analyzing request with Strands tools...", done=True))
 
-        # Send initial empty internals to show the component
+        # Send the initial full snapshot; later updates are deltas applied on top of it
         if include_internals:
             log.info(f"[STRANDS STREAM] Sending initial internals")
-            initial_internals = {
-                "chain_of_thought": [],
-                "tools": [],
-                "execution_log": [],
-                "streaming": True
-            }
+            current_internals = get_agent_internals(
+                system_prompt=system_prompt, context=context, agent=agent
+            )
+            if current_internals:
+                initial_internals = current_internals.model_dump()
+            else:
+                initial_internals = {
+                    "chain_of_thought": [],
+                    "tools": [],
+                    "execution_log": [],
+                }
+            initial_internals["streaming"] = True
             yield _internals_event(initial_internals)
 
-        # Stream execution updates while the agent runs
+        # Stream text deltas and execution updates while the agent runs
         event_count = 0
+        internals_cursor = (
+            len(initial_internals["execution_log"]) if include_internals else 0
+        )
+        thinking_steps = (
+            len(initial_internals["chain_of_thought"]) if include_internals else 0
+        )
         while True:
-            if agent_task.done():
+            if agent_task.done() and execution_queue.empty():
                 log.info(f"[STRANDS STREAM] Agent task completed after {event_count} events")
                 break
 
             try:
                 event = await asyncio.wait_for(execution_queue.get(), timeout=0.2)
-                event_count += 1
-                log.info(f"[STRANDS STREAM] Event #{event_count}: {event.get('type')} - {event.get('tool_name', 'N/A')}")
             except asyncio.TimeoutError:
                 continue
 
+            if event.get("type") == "text_delta":
+                yield _content_event(event["text"])
+                continue
+
+            event_count += 1
+            log.info(
+                f"[STRANDS STREAM] Event #{event_count}: {event.get('type')} - {event.get('tool_name', 'N/A')}"
+            )
+
+            if event.get("type") == "tool_use":
+                # Separate the text of the next model turn from the text before the tool call
+                after_tool_use = bool(streamed_content)
+                yield _status_event(
+                    _format_status_message(
+                        f"Preparing tool '{event.get('tool_name')}'",
+                        done=False,
+                        extra={
+                            "tool_name": event.get("tool_name"),
+                            "timestamp": event.get("timestamp"),
+                        },
+                    )
+                )
+                continue
+
             status_payload = _format_execution_status(event)
             if status_payload:
                 yield _status_event(status_payload)
 
-            # Send incremental thinking process updates
+            # Send incremental thinking process updates as append-only deltas
             if include_internals:
-                current_internals = get_agent_internals(system_prompt=system_prompt)
-                if current_internals:
-                    internals_dict = json.loads(json.dumps(current_internals.model_dump(), default=str))
-                    internals_dict["streaming"] = True
-                    
-                    # Log chain of thought updates during streaming
-                    chain_of_thought = internals_dict.get('chain_of_thought', [])
-                    if chain_of_thought:
-                        log.info(f"[STRANDS STREAM] Chain of thought update: {len(chain_of_thought)} steps")
-                        for i, step in enumerate(chain_of_thought[-3:], max(1, len(chain_of_thought) - 2)):  # Log last 3 steps
-                            step_desc = step.get('description', 'No description')
-                            log.info(f"[STRANDS STREAM] Recent step {i}: {step_desc}")
-                            
-
-                    
-                    log.info(f"[STRANDS STREAM] Sending internals update: {len(chain_of_thought)} steps")
-                    yield _internals_event(internals_dict)
-            #log.info(f"[STRANDS STREAM] Agent response--00: \r\n{str(await agent_task)}")
-        # Drain any remaining events emitted right as the agent completes
-        drain_count = 0
-        while not execution_queue.empty():
-            event = execution_queue.get_nowait()
-            drain_count += 1
-            log.info(f"[STRANDS STREAM] Draining event #{drain_count}: {event.get('type')} - {event.get('tool_name', 'N/A')}")
-            status_payload = _format_execution_status(event)
-            if status_payload:
-                yield _status_event(status_payload)
-        
-        if drain_count > 0:
-            log.info(f"[STRANDS STREAM] Drained {drain_count} remaining events")
+                new_events, internals_cursor, tool_call_counts = context.events_since(
+                    internals_cursor
+                )
+                if new_events:
+                    new_steps = build_chain_of_thought(new_events)
+                    thinking_steps += len(new_steps)
+                    log.info(
+                        f"[STRANDS STREAM] Sending internals delta: {len(new_events)} event(s), {len(new_steps)} new step(s)"
+                    )
+                    yield _internals_event(
+                        {
+                            "delta": True,
+                            "streaming": True,
+                            "chain_of_thought": new_steps,
+                            "execution_log": new_events,
+                            "tool_call_counts": tool_call_counts,
+                            "metrics": {
+                                "tool_calls": sum(tool_call_counts.values()),
+                                "thinking_steps": thinking_steps,
+                            },
+                        }
+                    )
 
         # Retrieve agent response
         answer = await agent_task
-        answer_text = str(answer)
+        answer_text = str(answer) if answer is not None else ""
         log.info(f"[STRANDS STREAM] Agent response length: {len(answer_text)} characters")
+        log.info(f"[STRANDS STREAM] Streamed {len(streamed_content)} text chunks")
         
         # Log the final agent response content
         if len(answer_text) > 1000:
@@ -1096,41 +1855,15 @@ async def stream_strands_response(
         else:
             log.info(f"[STRANDS STREAM] Final agent response: {answer_text}")
 
-        yield _status_event(_format_status_message("Generating final response...", done=False))
-
-        # Stream the response in chunks (simulating typing effect)
-        chunk_size = 50  # characters per chunk
-        total_chunks = (len(answer_text) + chunk_size - 1) // chunk_size
-        log.info(f"[STRANDS STREAM] Streaming response in {total_chunks} chunks")
-        
-        for i in range(0, len(answer_text), chunk_size):
-            chunk = answer_text[i:i + chunk_size]
-            chunk_num = (i // chunk_size) + 1
-
-            chunk_data = {
-                "id": request_id,
-                "object": "chat.completion.chunk",
-                "created": int(start_time.timestamp()),
-                "model": model,
-                "choices": [{
-                    "index": 0,
-                    "delta": {
-                        "role": "assistant" if i == 0 else None,
-                        "content": chunk
-                    },
-                    "finish_reason": None
-                }]
-            }
-
-            if chunk_num % 10 == 0:  # Log every 10th chunk to avoid spam
-                log.info(f"[STRANDS STREAM] Sent chunk {chunk_num}/{total_chunks}")
-            
-            yield f"data: {json.dumps(chunk_data)}\n\n"
-            await asyncio.sleep(0.05)  # Small delay for smooth streaming
+        # Fall back to the final result if the model produced no streamed text
+        if not streamed_content and answer_text:
+            yield _content_event(answer_text)
 
         # Send final internals with streaming=False
         if include_internals:
-            final_internals = get_agent_internals(system_prompt=system_prompt)
+            final_internals = get_agent_internals(
+                system_prompt=system_prompt, context=context, agent=agent
+            )
             if final_internals:
                 internals_dict = json.loads(json.dumps(final_internals.model_dump(), default=str))
                 internals_dict["streaming"] = False
@@ -1187,18 +1920,31 @@ async def stream_strands_response(
         yield "data: [DONE]\n\n"
 
     finally:
-        clear_execution_listener(loop, execution_queue)
+        context.clear_listener(loop, execution_queue)
+        context.log_summary()
+        if agent_task is not None and not agent_task.done():
+            # The client went away; stop consuming the model stream
+            agent_task.cancel()
+        if lease is not None:
+            # Wait for the agent to finish before returning it to the pool
+            if agent_task is not None and not agent_task.done():
+                agent_task.add_done_callback(lambda _: lease.release())
+            else:
+                lease.release()
         log.info(f"[STRANDS STREAM] Stream cleanup completed for request {request_id}")
 
 
 @router.get("/internals")
 async def get_internals(request: Request, user=Depends(get_verified_user)):
     """Get agent internals for debugging and visualization"""
-    agent = initialize_agent()
-    if agent is None:
+    lease = checkout_agent()
+    if lease is None:
         raise HTTPException(status_code=500, detail="Strands AI agent not available")
     
-    internals = get_agent_internals()
+    try:
+        internals = get_agent_internals(agent=lease.agent)
+    finally:
+        lease.release()
     if internals is None:
         raise HTTPException(status_code=500, detail="Failed to get agent internals")
     
@@ -1212,7 +1958,7 @@ async def chat_completions(
 ):
     """Handle chat completions with Strands AI agent"""
     start_time = datetime.now()
-    request_id = f"strands-{int(start_time.timestamp())}"
+    request_id = f"strands-{int(start_time.timestamp())}-{uuid4().hex[:8]}"
     
     log.info(f"[STRANDS CHAT] ═══════════════════════════════════════════════════")
     log.info(f"[STRANDS CHAT] New chat completion request: {request_id}")
@@ -1224,9 +1970,9 @@ async def chat_completions(
     log.info(f"[STRANDS CHAT] - Temperature: {chat_request.temperature}")
     log.info(f"[STRANDS CHAT] - User: {user.name if hasattr(user, 'name') else 'Unknown'}")
     
-    # Reset execution tracking for this request
-    reset_execution_tracking()
-    log.info(f"[STRANDS CHAT] Reset execution tracking")
+    # Track execution for this request only
+    context = ExecutionContext(request_id)
+    log.info(f"[STRANDS CHAT] Created execution context")
     
     # Get model configuration to extract system prompt from params
     model_id = chat_request.model
@@ -1244,16 +1990,18 @@ async def chat_completions(
     else:
         log.info(f"[STRANDS CHAT] No model info found, using default system prompt")
     
-    # Initialize agent with custom system prompt if available
-    agent = initialize_agent(system_prompt=system_prompt)
-    if agent is None:
+    # Check out an agent for the custom system prompt (if any) from the pool
+    lease = checkout_agent(system_prompt=system_prompt)
+    if lease is None:
         log.error(f"[STRANDS CHAT] ✗ Agent initialization failed")
         raise HTTPException(status_code=500, detail="Strands AI agent not available")
+    agent = lease.agent
     
     # Extract user question (last message) and full conversation context
     question = extract_user_question(chat_request.messages)
     if not question:
         log.warning(f"[STRANDS CHAT] No user content found in messages")
+        lease.release()
         return ChatResponse(
             id=request_id,
             created=int(start_time.timestamp()),
@@ -1271,10 +2019,13 @@ async def chat_completions(
     log.info(f"[STRANDS CHAT] Total conversation messages: {len(chat_request.messages)}")
     log.info(f"[STRANDS CHAT] Conversation context length: {len(conversation_context)} characters")
     
+    # The streaming generator returns the agent to the pool once the stream ends
+    release_lease = True
     try:
         # Check if streaming is requested
         if chat_request.stream:
             log.info(f"[STRANDS CHAT] Using streaming mode")
+            release_lease = False
             # Return streaming response
             return StreamingResponse(
                 stream_strands_response(
@@ -1284,7 +2035,9 @@ async def chat_completions(
                     chat_request.model, 
                     start_time,
                     chat_request.include_internals,
-                    system_prompt
+                    system_prompt,
+                    context,
+                    lease,
                 ),
                 media_type="text/event-stream"
             )
@@ -1293,8 +2046,12 @@ async def chat_completions(
         log.info(f"[STRANDS CHAT] Using non-streaming mode")
         log.info(f"[STRANDS CHAT] Calling Strands agent...")
         
-        # Call the Strands agent directly with output capture
-        answer = capture_agent_output(agent, conversation_context)  # Pass full conversation context
+        # Run the Strands agent in its own task bound to this request's context
+        answer = await asyncio.create_task(
+            _run_agent_stream(
+                agent, conversation_context, context
+            )  # Pass full conversation context
+        )
         
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
@@ -1311,8 +2068,10 @@ async def chat_completions(
         
         # Prepare response with agent internals (including execution time)
         # Pass the system prompt that was actually used
-        internals = get_agent_internals(system_prompt=system_prompt)
-        
+        internals = get_agent_internals(
+            system_prompt=system_prompt, context=context, agent=agent
+        )
+
         # Add execution time to metrics
         if internals and internals.metrics:
             internals.metrics["execution_time"] = round(processing_time, 2)
@@ -1321,10 +2080,16 @@ async def chat_completions(
         log.info(f"[STRANDS CHAT] Agent internals collected: {internals is not None}")
         if internals:
             log.info(f"[STRANDS CHAT] Execution summary:")
-            log.info(f"[STRANDS CHAT] - Tool calls: {sum(_tool_call_counts.values())}")
-            log.info(f"[STRANDS CHAT] - Thinking steps: {len(internals.chain_of_thought)}")
-            log.info(f"[STRANDS CHAT] - Execution log entries: {len(internals.execution_log)}")
-        
+            log.info(
+                f"[STRANDS CHAT] - Tool calls: {internals.metrics.get('tool_calls', 0)}"
+            )
+            log.info(
+                f"[STRANDS CHAT] - Thinking steps: {len(internals.chain_of_thought)}"
+            )
+            log.info(
+                f"[STRANDS CHAT] - Execution log entries: {len(internals.execution_log)}"
+            )
+
         # Convert internals to JSON-safe dict
         internals_dict = None
         if internals:
@@ -1368,6 +2133,7 @@ async def chat_completions(
         log.info(f"[STRANDS CHAT] - Has strands_internals: {internals_dict is not None}")
         log.info(f"[STRANDS CHAT] - Token usage: {response_data['usage']['total_tokens']}")
         log.info(f"[STRANDS CHAT] ✓ Request {request_id} completed successfully")
+        context.log_summary()
         log.info(f"[STRANDS CHAT] ═══════════════════════════════════════════════════")
         
         return response_data
@@ -1389,6 +2155,10 @@ async def chat_completions(
                 "finish_reason": "stop"
             }]
         )
+    finally:
+        if release_lease:
+            lease.release()
+
 
 @router.post("/health")
 async def health_check(request: Request, user=Depends(get_verified_user)):
@@ -1439,7 +2209,10 @@ async def health_check(request: Request, user=Depends(get_verified_user)):
             clickhouse_error = None
             try:
                 client = ClickHouseMCPClient(clickhouse_url)
-                result = client.list_databases()
+                try:
+                    result = await client.list_databases(use_cache=False)
+                finally:
+                    await client.close()
                 
                 # Check if result has error key
                 if "error" in result:
@@ -1494,6 +2267,39 @@ async def health_check(request: Request, user=Depends(get_verified_user)):
             "version": "1.0.0"
         }
 
+@router.get("/cache/stats")
+async def get_cache_stats(request: Request, user=Depends(get_admin_user)):
+    """Get hit ratios of the Strands caches and agent pool usage of this worker"""
+    return {
+        "schema": _schema_cache.stats(),
+        "query": _query_cache.stats(),
+        "agent_pool": _agent_pool.stats(),
+    }
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    request: Request, cache: Optional[str] = None, user=Depends(get_admin_user)
+):
+    """Drop cached ClickHouse results
+
+    Args:
+        cache: "schema" or "query" to drop a single cache; both are dropped if omitted
+    """
+    caches = {"schema": _schema_cache, "query": _query_cache}
+    if cache is not None and cache not in caches:
+        raise HTTPException(status_code=400, detail=f"Unknown cache: {cache}")
+
+    removed = {}
+    for name, ttl_cache in caches.items():
+        if cache is None or cache == name:
+            removed[name] = await ttl_cache.invalidate()
+            log.info(
+                f"[STRANDS CACHE] {name} cache invalidated by {user.email}: {removed[name]} entries removed"
+            )
+    return removed
+
+
 @router.post("/tools/test")
 async def test_tools(
     request: Request, 
@@ -1501,8 +2307,8 @@ async def test_tools(
     user=Depends(get_verified_user)
 ):
     """Test individual tools for debugging"""
-    agent = initialize_agent()
-    if agent is None:
+    clickhouse_client = get_clickhouse_client()
+    if clickhouse_client is None:
         raise HTTPException(status_code=500, detail="Strands AI agent not available")
     
     tool_name = tool_request.get("tool_name")
@@ -1513,12 +2319,12 @@ async def test_tools(
     
     try:
         if tool_name == "list_databases":
-            result = _clickhouse_client.list_databases()
+            result = await clickhouse_client.list_databases()
         elif tool_name == "list_tables":
             database = tool_args.get("database")
             if not database:
                 raise HTTPException(status_code=400, detail="database parameter is required")
-            result = _clickhouse_client.list_tables(
+            result = await clickhouse_client.list_tables(
                 database, 
                 tool_args.get("like"), 
                 tool_args.get("not_like")
@@ -1527,7 +2333,7 @@ async def test_tools(
             query = tool_args.get("query")
             if not query:
                 raise HTTPException(status_code=400, detail="query parameter is required")
-            result = _clickhouse_client.run_select_query(query)
+            result = await clickhouse_client.run_select_query(query)
         else:
             raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
         
@@ -11,7 +11,6 @@ import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
-from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes, NoteUpdateForm
 from open_webui.utils.redis import (
     get_sentinels_from_env,
@@ -37,12 +36,19 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    WEBSOCKET_EVENT_COALESCE_INTERVAL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    EventCoalescer,
+    RedisDict,
+    RedisLock,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
+from open_webui.utils.message_buffer import MESSAGE_WRITE_BUFFER
 
 
 from open_webui.env import (
@@ -696,20 +702,23 @@ async def disconnect(sid):
         # print(f"Unknown session ID {sid} disconnected")
 
 
+async def emit_events_frame(room: str, frame: dict):
+    await sio.emit("events", frame, room=room)
+
+
+EVENT_COALESCER = EventCoalescer(
+    emit_events_frame, WEBSOCKET_EVENT_COALESCE_INTERVAL / 1000
+)
+
+
 def get_event_emitter(request_info, update_db=True):
     async def __event_emitter__(event_data):
         user_id = request_info["user_id"]
         chat_id = request_info["chat_id"]
         message_id = request_info["message_id"]
 
-        await sio.emit(
-            "events",
-            {
-                "chat_id": chat_id,
-                "message_id": message_id,
-                "data": event_data,
-            },
-            room=f"user:{user_id}",
+        await EVENT_COALESCER.emit_event(
+            f"user:{user_id}", chat_id, message_id, event_data
         )
         if (
             update_db
@@ -718,14 +727,14 @@ def get_event_emitter(request_info, update_db=True):
         ):
 
             if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
+                MESSAGE_WRITE_BUFFER.add_message_status(
                     request_info["chat_id"],
                     request_info["message_id"],
                     event_data.get("data", {}),
                 )
 
             if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
+                message = await MESSAGE_WRITE_BUFFER.get_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                 )
@@ -734,7 +743,7 @@ def get_event_emitter(request_info, update_db=True):
                     content = message.get("content", "")
                     content += event_data.get("data", {}).get("content", "")
 
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    MESSAGE_WRITE_BUFFER.upsert_message(
                         request_info["chat_id"],
                         request_info["message_id"],
                         {
@@ -745,7 +754,7 @@ def get_event_emitter(request_info, update_db=True):
             if "type" in event_data and event_data["type"] == "replace":
                 content = event_data.get("data", {}).get("content", "")
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                MESSAGE_WRITE_BUFFER.upsert_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                     {
@@ -754,7 +763,7 @@ def get_event_emitter(request_info, update_db=True):
                 )
 
             if "type" in event_data and event_data["type"] == "embeds":
-                message = Chats.get_message_by_id_and_message_id(
+                message = await MESSAGE_WRITE_BUFFER.get_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                 )
@@ -762,7 +771,7 @@ def get_event_emitter(request_info, update_db=True):
                 embeds = event_data.get("data", {}).get("embeds", [])
                 embeds.extend(message.get("embeds", []))
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                MESSAGE_WRITE_BUFFER.upsert_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                     {
@@ -771,7 +780,7 @@ def get_event_emitter(request_info, update_db=True):
                 )
 
             if "type" in event_data and event_data["type"] == "files":
-                message = Chats.get_message_by_id_and_message_id(
+                message = await MESSAGE_WRITE_BUFFER.get_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                 )
@@ -779,7 +788,7 @@ def get_event_emitter(request_info, update_db=True):
                 files = event_data.get("data", {}).get("files", [])
                 files.extend(message.get("files", []))
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                MESSAGE_WRITE_BUFFER.upsert_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                     {
@@ -790,7 +799,7 @@ def get_event_emitter(request_info, update_db=True):
             if event_data.get("type") in ["source", "citation"]:
                 data = event_data.get("data", {})
                 if data.get("type") == None:
-                    message = Chats.get_message_by_id_and_message_id(
+                    message = await MESSAGE_WRITE_BUFFER.get_message(
                         request_info["chat_id"],
                         request_info["message_id"],
                     )
@@ -798,7 +807,7 @@ def get_event_emitter(request_info, update_db=True):
                     sources = message.get("sources", [])
                     sources.append(data)
 
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    MESSAGE_WRITE_BUFFER.upsert_message(
                         request_info["chat_id"],
                         request_info["message_id"],
                         {
@@ -1,10 +1,15 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -225,3 +230,145 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+class PendingFrame:
+    def __init__(self, event_data: dict):
+        self.event_data = event_data
+        self.events = 1
+        self.created_at = time.monotonic()
+        self.timer = None
+
+
+class EventCoalescer:
+    """
+    Coalesces the streaming deltas of a message into one socket.io frame per tick.
+
+    A content snapshot (a chat:completion event carrying only content) replaces the
+    pending snapshot of its message, and consecutive message events are concatenated.
+    Any other event of the message sends the pending frame first, so the client
+    sees events in the order they were emitted.
+    """
+
+    def __init__(self, emit, interval: float):
+        """
+        :param emit: Coroutine function sending a frame, called as emit(room, frame)
+        :param interval: Max seconds a delta is held back, 0 sends every delta
+        """
+        self.emit = emit
+        self.interval = interval
+
+        self._pending: dict[tuple, PendingFrame] = {}
+        self._flushing: dict[tuple, asyncio.Task] = {}
+
+        self.events = 0
+        self.frames = 0
+        self.delayed_frames = 0  # frames held back to coalesce deltas
+        self.coalesced_frames = 0  # delayed frames carrying more than one delta
+        self.added_latency = 0.0  # seconds the first delta of frames was held back
+        self.max_added_latency = 0.0
+
+    @staticmethod
+    def _is_delta(event_data: dict) -> bool:
+        data = event_data.get("data")
+        if not isinstance(data, dict):
+            return False
+        if event_data.get("type") == "chat:completion":
+            return data.keys() == {"content"}
+        if event_data.get("type") == "message":
+            return data.keys() == {"content"} and isinstance(data["content"], str)
+        return False
+
+    @staticmethod
+    def _merge(pending: dict, event_data: dict) -> Optional[dict]:
+        """Return the event with the pending delta applied, None if they don't merge."""
+        if pending.get("type") != event_data.get("type"):
+            return None
+        if event_data["type"] == "chat:completion":
+            return event_data
+        content = pending["data"]["content"] + event_data["data"]["content"]
+        return {"type": "message", "data": {"content": content}}
+
+    async def emit_event(self, room: str, chat_id: str, message_id: str, event_data):
+        self.events += 1
+        key = (room, chat_id, message_id)
+
+        flushing = self._flushing.get(key)
+        if flushing is not None:
+            await flushing
+
+        is_delta = self.interval > 0 and self._is_delta(event_data)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            merged = self._merge(pending.event_data, event_data) if is_delta else None
+            if merged is not None:
+                pending.event_data = merged
+                pending.events += 1
+                return
+            await self.flush(key)
+
+        if is_delta:
+            pending = self._pending[key] = PendingFrame(event_data)
+            pending.timer = asyncio.get_running_loop().call_later(
+                self.interval, self._schedule_flush, key
+            )
+            return
+
+        await self._send(key, event_data)
+
+    def _schedule_flush(self, key: tuple):
+        # Events emitted while the frame is being sent wait for it to keep their order
+        self._flushing[key] = asyncio.create_task(self._flush_on_timer(key))
+
+    async def _flush_on_timer(self, key: tuple):
+        try:
+            await self.flush(key)
+        except Exception as e:
+            log.warning(f"Failed to emit coalesced events of {key}: {e}")
+        finally:
+            if self._flushing.get(key) is asyncio.current_task():
+                del self._flushing[key]
+
+    async def flush(self, key: tuple):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        pending.timer.cancel()
+        self.delayed_frames += 1
+        if pending.events > 1:
+            self.coalesced_frames += 1
+
+        added_latency = time.monotonic() - pending.created_at
+        self.added_latency += added_latency
+        self.max_added_latency = max(self.max_added_latency, added_latency)
+
+        await self._send(key, pending.event_data)
+
+    async def _send(self, key: tuple, event_data: dict):
+        room, chat_id, message_id = key
+        self.frames += 1
+        await self.emit(
+            room,
+            {
+                "chat_id": chat_id,
+                "message_id": message_id,
+                "data": event_data,
+            },
+        )
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "pending": len(self._pending),
+            "events": self.events,
+            "frames": self.frames,
+            "frames_saved": self.events - self.frames - len(self._pending),
+            "delayed_frames": self.delayed_frames,
+            "coalesced_frames": self.coalesced_frames,
+            "avg_added_latency": (
+                self.added_latency / self.delayed_frames if self.delayed_frames else 0.0
+            ),
+            "max_added_latency": self.max_added_latency,
+        }
@@ -0,0 +1,113 @@
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexCache
+from open_webui.retrieval.vector.main import GetResult
+
+
+def get_result(documents, start=0):
+    return GetResult(
+        ids=[[f"{start + i}" for i in range(len(documents))]],
+        documents=[documents],
+        metadatas=[[{"i": start + i} for i in range(len(documents))]],
+    )
+
+
+DOCUMENTS = [
+    "the cat sat on the mat",
+    "the dog chased the cat",
+    "stock markets fell sharply today",
+    "the cat and the dog are friends",
+]
+
+
+class TestBM25Index:
+    def test_search_ranks_by_bm25(self):
+        index = BM25Index()
+        index.add(get_result(DOCUMENTS))
+
+        assert [d.metadata["i"] for d in index.search("markets", 4)] == [2]
+        assert index.search("dog", 1)[0].page_content in DOCUMENTS
+        assert index.search("unknown", 4) == []
+
+    def test_add_and_remove_match_rebuild(self):
+        index = BM25Index()
+        index.add(get_result(DOCUMENTS[:2]))
+        index.add(get_result(DOCUMENTS[2:], start=2))
+        index.add(get_result(["replaced content"], start=3))
+        index.remove(["1"])
+
+        rebuilt = BM25Index()
+        rebuilt.add(get_result(DOCUMENTS[:1]))
+        rebuilt.add(get_result(DOCUMENTS[2:3], start=2))
+        rebuilt.add(get_result(["replaced content"], start=3))
+
+        assert index.postings == rebuilt.postings
+        assert index.total_length == rebuilt.total_length
+
+
+class TestBM25IndexCache:
+    def test_index_is_built_once_and_shared(self, tmp_path):
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return get_result(DOCUMENTS)
+
+        cache, other_worker = BM25IndexCache(tmp_path), BM25IndexCache(tmp_path)
+        assert len(cache.get_index("kb", fetch)) == 4
+        assert len(other_worker.get_index("kb", fetch)) == 4
+        assert len(fetches) == 1
+
+        cache.add("kb", get_result(["quarterly earnings report"], start=4))
+        results = other_worker.get_index("kb", fetch).search("earnings", 1)
+        assert results[0].metadata["i"] == 4
+        assert len(fetches) == 1
+
+    def test_invalidate_rebuilds(self, tmp_path):
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return get_result(DOCUMENTS[: 4 - len(fetches)])
+
+        cache, other_worker = BM25IndexCache(tmp_path), BM25IndexCache(tmp_path)
+        assert len(cache.get_index("kb", fetch)) == 3
+
+        other_worker.invalidate("kb")
+        assert len(cache.get_index("kb", fetch)) == 2
+
+        cache.reset()
+        assert len(other_worker.get_index("kb", fetch)) == 1
+
+    def test_empty_collection(self, tmp_path):
+        cache = BM25IndexCache(tmp_path)
+        assert cache.get_index("kb", lambda: get_result([])) is None
+        assert cache.get_index("missing", lambda: None) is None
+
+    def test_redis_generation_is_shared_by_hosts(self, tmp_path):
+        class FakeRedis(dict):
+            def set(self, key, value):
+                self[key] = value
+
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return get_result(DOCUMENTS[: 4 - len(fetches)])
+
+        redis = FakeRedis()
+        host, other_host = (
+            BM25IndexCache(tmp_path / "host", redis=redis, redis_key_prefix="test"),
+            BM25IndexCache(tmp_path / "other", redis=redis, redis_key_prefix="test"),
+        )
+        assert len(host.get_index("kb", fetch)) == 3
+        assert len(other_host.get_index("kb", fetch)) == 2
+
+        host.invalidate("kb")
+        assert len(other_host.get_index("kb", fetch)) == 1
+
+        other_host.add("kb", get_result(["quarterly earnings report"], start=4))
+        assert len(host.get_index("kb", lambda: get_result(DOCUMENTS))) == 4
+
+        fetches.clear()
+        other_host.reset()
+        assert len(host.get_index("kb", fetch)) == 3
+        assert list((tmp_path / "other").iterdir()) == []
@@ -0,0 +1,89 @@
+import pytest
+
+from open_webui.retrieval.embedding_cache import (
+    DiskEmbeddingCacheBackend,
+    EmbeddingCache,
+)
+
+
+def create_embed():
+    calls = []
+
+    async def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    return embed, calls
+
+
+class TestEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_only_missing_texts_are_embedded(self):
+        cache = EmbeddingCache(size=10)
+        embed, calls = create_embed()
+
+        assert await cache.get_embeddings(["a", "bb"], embed, "openai", "m") == [
+            [1.0, 0.5],
+            [2.0, 0.5],
+        ]
+        texts = ["bb", "ccc", "ccc"]
+        embeddings = await cache.get_embeddings(texts, embed, "openai", "m")
+        assert embeddings == [[2.0, 0.5], [3.0, 0.5], [3.0, 0.5]]
+        assert await cache.get_embeddings("a", embed, "openai", "m") == [1.0, 0.5]
+        assert calls == [["a", "bb"], ["ccc"]]
+
+        stats = cache.stats()
+        assert stats["requests"] == 6
+        assert stats["hits"] == 2
+        assert stats["misses"] == 4
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model_and_prefix(self):
+        cache = EmbeddingCache(size=10)
+        embed, calls = create_embed()
+
+        await cache.get_embeddings(["a"], embed, "openai", "m")
+        await cache.get_embeddings(["a"], embed, "openai", "other")
+        await cache.get_embeddings(["a"], embed, "openai", "m", prefix="query: ")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_disk_backend_is_shared(self, tmp_path):
+        embed, calls = create_embed()
+        path = tmp_path / "embeddings.db"
+
+        first = EmbeddingCache(size=10, backend=DiskEmbeddingCacheBackend(path, 100))
+        await first.get_embeddings(["a", "bb"], embed, "", "m")
+
+        second = EmbeddingCache(size=10, backend=DiskEmbeddingCacheBackend(path, 100))
+        assert await second.get_embeddings(["a", "bb"], embed, "", "m") == [
+            [1.0, 0.5],
+            [2.0, 0.5],
+        ]
+        assert len(calls) == 1
+        assert second.stats()["backend_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_are_evicted(self, tmp_path):
+        backend = DiskEmbeddingCacheBackend(tmp_path / "embeddings.db", 2)
+        cache = EmbeddingCache(size=1, backend=backend)
+        embed, calls = create_embed()
+
+        await cache.get_embeddings(["a"], embed, "", "m")
+        await cache.get_embeddings(["bb"], embed, "", "m")
+        await cache.get_embeddings(["a"], embed, "", "m")
+        await cache.get_embeddings(["ccc"], embed, "", "m")
+
+        assert backend.db.execute("SELECT COUNT(*) FROM embedding").fetchone()[0] == 2
+        await cache.get_embeddings(["bb"], embed, "", "m")
+        assert calls == [["a"], ["bb"], ["ccc"], ["bb"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_embeddings_are_not_cached(self):
+        cache = EmbeddingCache(size=10)
+
+        async def embed(texts):
+            return None
+
+        assert await cache.get_embeddings(["a"], embed, "openai", "m") is None
+        assert cache.stats()["memory_entries"] == 0
@@ -0,0 +1,173 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.routers import retrieval
+from open_webui.utils.misc import sanitize_text_for_db
+
+
+class FakeVectorDB:
+    def __init__(self, fail_on_insert=None):
+        self.collections = {}
+        self.inserts = 0
+        self.fail_on_insert = fail_on_insert
+        self.deleted_collections = []
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.deleted_collections.append(collection_name)
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        self.inserts += 1
+        if self.inserts == self.fail_on_insert:
+            raise RuntimeError("write failed")
+        for item in items:
+            self.collections.setdefault(collection_name, {})[item["id"]] = item
+
+    def delete(self, collection_name, ids):
+        for id in ids:
+            self.collections.get(collection_name, {}).pop(id, None)
+
+
+class FakeBM25Indexes:
+    def add(self, collection_name, result):
+        pass
+
+    def invalidate(self, collection_name):
+        pass
+
+
+def create_embedding_function(fail_on_call=None):
+    calls = []
+
+    async def embedding_function(texts, prefix=None, user=None):
+        calls.append(list(texts))
+        if len(calls) == fail_on_call:
+            raise RuntimeError("embed failed")
+        return [[float(len(text)), float(text.count(" "))] for text in texts]
+
+    return embedding_function, calls
+
+
+def get_request(**config):
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                config=SimpleNamespace(
+                    **{
+                        "ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER": True,
+                        "CHUNK_MIN_SIZE_TARGET": 40,
+                        "TEXT_SPLITTER": "character",
+                        "CHUNK_SIZE": 60,
+                        "CHUNK_OVERLAP": 10,
+                        "RAG_EMBEDDING_ENGINE": "openai",
+                        "RAG_EMBEDDING_MODEL": "test-model",
+                        **config,
+                    }
+                )
+            )
+        )
+    )
+
+
+def get_docs():
+    return [
+        Document(
+            page_content=(
+                f"# Report {i}\n\nShort intro.\n\n## Details\n\n"
+                + " ".join(f"word{j}" for j in range(40))
+            ),
+            metadata={"source": f"report-{i}.md", "file_id": f"file-{i}"},
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    vector_db = FakeVectorDB()
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", vector_db)
+    monkeypatch.setattr(retrieval, "BM25_INDEXES", FakeBM25Indexes())
+    monkeypatch.setattr(retrieval, "RAG_INGEST_BATCH_SIZE", 2)
+    monkeypatch.setattr(retrieval, "RAG_INGEST_QUEUE_SIZE", 1)
+    return vector_db
+
+
+class TestIngestDocs:
+    @pytest.mark.asyncio
+    async def test_chunks_match_sequential_split(self, vector_db):
+        request = get_request()
+        embedding_function, calls = create_embedding_function()
+
+        count = await retrieval.ingest_docs(
+            request,
+            iter(get_docs()),
+            "kb",
+            embedding_function,
+            metadata={"hash": "abc"},
+        )
+
+        chunks = retrieval.split_docs(request, get_docs())
+        assert count == len(chunks) > 2
+        assert all(len(texts) <= 2 for texts in calls)
+
+        items = list(vector_db.collections["kb"].values())
+        assert [item["text"] for item in items] == [
+            sanitize_text_for_db(chunk.page_content) for chunk in chunks
+        ]
+        assert [item["metadata"] for item in items] == [
+            {
+                **chunk.metadata,
+                "hash": "abc",
+                "embedding_config": {"engine": "openai", "model": "test-model"},
+            }
+            for chunk in chunks
+        ]
+        embedded = [text for texts in calls for text in texts]
+        assert [item["vector"] for item in items] == [
+            [float(len(text)), float(text.count(" "))] for text in embedded
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stage", ["split", "embed", "write"])
+    async def test_failing_stage_removes_inserted_chunks(self, vector_db, stage):
+        def docs():
+            yield from get_docs()[:2]
+            if stage == "split":
+                raise RuntimeError("split failed")
+
+        embedding_function, _ = create_embedding_function(
+            fail_on_call=2 if stage == "embed" else None
+        )
+        if stage == "write":
+            vector_db.fail_on_insert = 2
+
+        with pytest.raises(RuntimeError, match=f"{stage} failed"):
+            await retrieval.ingest_docs(get_request(), docs(), "kb", embedding_function)
+
+        assert vector_db.inserts >= 1
+        assert vector_db.collections.get("kb", {}) == {}
+
+    @pytest.mark.asyncio
+    async def test_empty_content_keeps_existing_collection(self, vector_db):
+        vector_db.insert("kb", [{"id": "existing", "text": "kept"}])
+        embedding_function, calls = create_embedding_function()
+
+        with pytest.raises(ValueError, match=re.escape(ERROR_MESSAGES.EMPTY_CONTENT)):
+            await retrieval.ingest_docs(
+                get_request(),
+                [Document(page_content="", metadata={"source": "empty.txt"})],
+                "kb",
+                embedding_function,
+                overwrite=True,
+            )
+
+        assert calls == []
+        assert vector_db.deleted_collections == []
+        assert list(vector_db.collections["kb"]) == ["existing"]
@@ -0,0 +1,53 @@
+import os
+import random
+import time
+
+import pytest
+
+from open_webui.retrieval.vector.dbs.pgvector import escape_copy_value
+
+
+def test_escape_copy_value():
+    assert escape_copy_value("plain text") == "plain text"
+    assert escape_copy_value("a\tb\nc\rd") == "a\\tb\\nc\\rd"
+    assert escape_copy_value("C:\\path") == "C:\\\\path"
+    assert escape_copy_value(None) == "\\N"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("PGVECTOR_DB_URL"), reason="PGVECTOR_DB_URL is not set"
+)
+def test_bulk_insert_throughput():
+    """Insert 100k chunks in batches of 1000 and report the rows per second."""
+    from open_webui.retrieval.vector.dbs.pgvector import (
+        VECTOR_LENGTH,
+        PgvectorClient,
+    )
+
+    client = PgvectorClient()
+    collection_name = f"benchmark-{int(time.time())}"
+    count, batch_size = 100_000, 1000
+
+    try:
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            client.insert(
+                collection_name,
+                [
+                    {
+                        "id": f"{collection_name}-{i}",
+                        "text": f"chunk {i}\twith\nspecial characters \\",
+                        "vector": [random.random() for _ in range(VECTOR_LENGTH)],
+                        "metadata": {"file_id": "benchmark", "index": i},
+                    }
+                    for i in range(offset, offset + batch_size)
+                ],
+            )
+        elapsed = time.perf_counter() - start
+        print(f"Inserted {count} chunks at {count / elapsed:.0f} rows/s")
+
+        result = client.get(collection_name)
+        assert len(result.ids[0]) == count
+        assert "\twith\n" in result.documents[0][0]
+    finally:
+        client.delete_collection(collection_name)
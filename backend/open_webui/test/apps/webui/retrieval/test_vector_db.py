@@ -0,0 +1,76 @@
+from open_webui.retrieval.vector.main import GetResult, VectorDBBase
+
+
+class MemoryVectorDB(VectorDBBase):
+    def __init__(self, items):
+        self.items = items
+
+    def _get_result(self, items):
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def has_collection(self, collection_name):
+        return True
+
+    def delete_collection(self, collection_name):
+        pass
+
+    def insert(self, collection_name, items):
+        pass
+
+    def upsert(self, collection_name, items):
+        pass
+
+    def search(self, collection_name, vectors, filter=None, limit=10):
+        pass
+
+    def query(self, collection_name, filter, limit=None):
+        return self._get_result(
+            [
+                item
+                for item in self.items
+                if all(item["metadata"].get(k) == v for k, v in filter.items())
+            ]
+        )
+
+    def get(self, collection_name):
+        return self._get_result(self.items)
+
+    def delete(self, collection_name, ids=None, filter=None):
+        pass
+
+    def reset(self):
+        pass
+
+
+ITEMS = [
+    {"id": str(i), "text": f"chunk {i}", "metadata": {"file_id": f"{i % 2}"}}
+    for i in range(5)
+]
+
+
+class TestGetBatches:
+    def test_batches(self):
+        batches = list(MemoryVectorDB(ITEMS).get_batches("kb", batch_size=2))
+
+        assert [batch.ids[0] for batch in batches] == [["0", "1"], ["2", "3"], ["4"]]
+        assert batches[2].documents == [["chunk 4"]]
+        assert batches[2].metadatas == [[{"file_id": "0"}]]
+
+    def test_filter_and_include(self):
+        batches = list(
+            MemoryVectorDB(ITEMS).get_batches(
+                "kb", filter={"file_id": "1"}, include=["metadatas"]
+            )
+        )
+
+        assert len(batches) == 1
+        assert batches[0].ids == [["1", "3"]]
+        assert batches[0].documents is None
+        assert batches[0].metadatas == [[{"file_id": "1"}, {"file_id": "1"}]]
+
+    def test_empty_collection(self):
+        assert list(MemoryVectorDB([]).get_batches("kb")) == []
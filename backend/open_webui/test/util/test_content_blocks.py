@@ -0,0 +1,142 @@
+import json
+import time
+
+from open_webui.utils import content_blocks
+from open_webui.utils.content_blocks import (
+    ContentBlocksSerializer,
+    serialize_content_blocks,
+)
+
+
+def stream_content_blocks(turns=5, deltas=20):
+    """Yield the content blocks of a simulated tool-heavy response after every delta"""
+    blocks = []
+    for turn in range(turns):
+        reasoning = {
+            "type": "reasoning",
+            "start_tag": "<think>",
+            "end_tag": "</think>",
+            "attributes": {"type": "reasoning_content"},
+            "content": "",
+        }
+        blocks.append(reasoning)
+        for i in range(deltas):
+            reasoning["content"] += f"step {i} of turn {turn}\n"
+            yield blocks
+        reasoning["duration"] = 2
+
+        text = {"type": "text", "content": ""}
+        blocks.append(text)
+        for i in range(deltas):
+            text["content"] += f"Looking at the data {i} "
+            yield blocks
+
+        tool_calls = {
+            "type": "tool_calls",
+            "content": [
+                {
+                    "id": f"call_{turn}",
+                    "function": {
+                        "name": "run_select_query",
+                        "arguments": json.dumps({"query": f"SELECT {turn}"}),
+                    },
+                }
+            ],
+        }
+        blocks.append(tool_calls)
+        yield blocks
+        tool_calls["results"] = [
+            {
+                "tool_call_id": f"call_{turn}",
+                "content": json.dumps([{"id": n, "name": "<row>"} for n in range(50)]),
+            }
+        ]
+        yield blocks
+
+        blocks.append(
+            {
+                "type": "code_interpreter",
+                "attributes": {"lang": "python"},
+                "content": "print(1)",
+            }
+        )
+        yield blocks
+        blocks[-1]["output"] = {"stdout": "1"}
+        yield blocks
+
+
+class TestContentBlocksSerializer:
+    def test_matches_full_serialization(self):
+        serializer = ContentBlocksSerializer()
+        for blocks in stream_content_blocks():
+            assert serializer(blocks) == serialize_content_blocks(blocks)
+            assert serializer(blocks, raw=True) == serialize_content_blocks(
+                blocks, raw=True
+            )
+
+    def test_pending_blocks_list(self):
+        serializer = ContentBlocksSerializer()
+        for blocks in stream_content_blocks(turns=2):
+            pending_blocks = blocks + [{"type": "text", "content": "pending"}]
+            assert serializer(pending_blocks) == serialize_content_blocks(
+                pending_blocks
+            )
+            assert serializer(blocks) == serialize_content_blocks(blocks)
+
+    def test_modified_and_removed_blocks(self):
+        serializer = ContentBlocksSerializer()
+        blocks = [
+            {"type": "text", "content": "first"},
+            {"type": "text", "content": "second"},
+            {"type": "text", "content": "third"},
+        ]
+        assert serializer(blocks) == "first\nsecond\nthird"
+
+        # Blocks are only modified or removed while they are the last block
+        blocks.pop()
+        blocks.pop()
+        blocks[-1]["content"] = "first, edited"
+        assert serializer(blocks) == "first, edited"
+
+        blocks.append({"type": "text", "content": "fourth"})
+        assert serializer(blocks) == "first, edited\nfourth"
+        assert serializer([]) == ""
+
+    def test_renders_per_delta_independent_of_length(self, monkeypatch):
+        renders = []
+        serialize_content_block = content_blocks.serialize_content_block
+
+        def counting_serialize_content_block(content, block, raw=False):
+            renders.append(block)
+            return serialize_content_block(content, block, raw)
+
+        monkeypatch.setattr(
+            content_blocks, "serialize_content_block", counting_serialize_content_block
+        )
+
+        serializer = ContentBlocksSerializer()
+        calls = 0
+        for blocks in stream_content_blocks(turns=10):
+            serializer(blocks)
+            calls += 1
+
+        # Every block is rendered once as the last block per delta and once more
+        # when it is cached, so renders grow with deltas rather than deltas * blocks
+        assert len(renders) <= 2 * calls
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: average cost of serializing one delta as the response grows.
+    # What remains of the incremental cost growth is copying the returned string.
+    for turns in (5, 20, 80):
+        for name, serialize in (
+            ("full", serialize_content_blocks),
+            ("incremental", ContentBlocksSerializer()),
+        ):
+            calls = 0
+            start = time.perf_counter()
+            for blocks in stream_content_blocks(turns=turns):
+                serialize(blocks)
+                calls += 1
+            elapsed = time.perf_counter() - start
+            print(f"{turns:>3} turns {name:>11}: {elapsed / calls * 1e6:8.1f} us/delta")
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from open_webui.socket.utils import EventCoalescer
+
+
+def create_coalescer(interval=0.02):
+    frames = []
+
+    async def emit(room, frame):
+        frames.append((room, frame["message_id"], frame["data"]))
+
+    return EventCoalescer(emit, interval), frames
+
+
+def completion(content):
+    return {"type": "chat:completion", "data": {"content": content}}
+
+
+class TestEventCoalescer:
+    @pytest.mark.asyncio
+    async def test_content_snapshots_coalesce_per_tick(self):
+        coalescer, frames = create_coalescer()
+        for i in range(10):
+            await coalescer.emit_event("user:1", "chat", "message", completion(f"{i}"))
+
+        assert frames == []
+        await asyncio.sleep(0.05)
+
+        assert frames == [("user:1", "message", completion("9"))]
+        assert coalescer.stats()["frames_saved"] == 9
+
+    @pytest.mark.asyncio
+    async def test_message_deltas_are_concatenated(self):
+        coalescer, frames = create_coalescer()
+        for content in ("Hel", "lo", "!"):
+            await coalescer.emit_event(
+                "user:1",
+                "chat",
+                "message",
+                {"type": "message", "data": {"content": content}},
+            )
+
+        await asyncio.sleep(0.05)
+        assert frames == [
+            ("user:1", "message", {"type": "message", "data": {"content": "Hello!"}})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_other_events_keep_order(self):
+        coalescer, frames = create_coalescer(interval=10)
+        done = {"type": "chat:completion", "data": {"done": True, "content": "ab"}}
+        status = {"type": "status", "data": {"description": "Searching"}}
+
+        await coalescer.emit_event("user:1", "chat", "message", completion("a"))
+        await coalescer.emit_event("user:1", "chat", "message", status)
+        await coalescer.emit_event("user:1", "chat", "message", completion("ab"))
+        await coalescer.emit_event("user:1", "chat", "message", done)
+
+        assert [data for _, _, data in frames] == [
+            completion("a"),
+            status,
+            completion("ab"),
+            done,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_messages_are_coalesced_separately(self):
+        coalescer, frames = create_coalescer()
+        await coalescer.emit_event("user:1", "chat", "first", completion("a"))
+        await coalescer.emit_event("user:1", "chat", "second", completion("b"))
+
+        await asyncio.sleep(0.05)
+        assert sorted(message_id for _, message_id, _ in frames) == [
+            "first",
+            "second",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_sends_every_event(self):
+        coalescer, frames = create_coalescer(interval=0)
+        for i in range(3):
+            await coalescer.emit_event("user:1", "chat", "message", completion(f"{i}"))
+
+        assert len(frames) == 3
+        assert coalescer.stats()["frames_saved"] == 0
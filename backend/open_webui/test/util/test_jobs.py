@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from open_webui.utils.jobs import SQLiteJobQueue
+
+
+class TestSQLiteJobQueue:
+    def test_lanes_are_served_in_priority_order(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.db", lease=60)
+        queue.enqueue("job", {"n": 1}, lane="low")
+        queue.enqueue("job", {"n": 2})
+        queue.enqueue("job", {"n": 3}, lane="high")
+        queue.enqueue("job", {"n": 4}, lane="high")
+
+        jobs = [queue.dequeue() for _ in range(4)]
+        assert [job["payload"]["n"] for job in jobs] == [3, 4, 2, 1]
+        assert queue.dequeue() is None
+
+    def test_completed_jobs_are_removed(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.db", lease=0)
+        queue.enqueue("job", {})
+
+        job = queue.dequeue()
+        assert job["attempts"] == 1
+        queue.complete(job)
+        assert queue.dequeue() is None
+
+    def test_expired_leases_are_handed_out_again(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.db", lease=0)
+        id = queue.enqueue("job", {})
+
+        assert queue.dequeue()["id"] == id
+        job = queue.dequeue()
+        assert job["id"] == id
+        assert job["attempts"] == 2
+
+        # Another process sees the same queue
+        queue.lease = 60
+        queue.extend(job)
+        assert SQLiteJobQueue(tmp_path / "jobs.db", lease=60).dequeue() is None
+
+    def test_retries_wait_for_their_delay(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.db", lease=60)
+        queue.enqueue("job", {})
+
+        queue.retry(queue.dequeue(), delay=0.2)
+        assert queue.dequeue() is None
+        time.sleep(0.3)
+        assert queue.dequeue()["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_events_published_after_listening(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.db", lease=60)
+        queue.publish({"n": 0})
+
+        events = queue.events()
+        listening = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.1)
+        SQLiteJobQueue(tmp_path / "jobs.db", lease=60).publish({"n": 1})
+
+        assert await asyncio.wait_for(listening, timeout=5) == {"n": 1}
+        await events.aclose()
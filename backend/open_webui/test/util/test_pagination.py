@@ -0,0 +1,127 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import BigInteger, Column, Index, Text, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from open_webui.utils.pagination import Keyset, decode_cursor, encode_cursor
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "item"
+
+    id = Column(Text, primary_key=True)
+    owner_id = Column(Text)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("item_owner_id_updated_at_id_idx", "owner_id", "updated_at", "id"),
+    )
+
+
+ITEM_KEYSET = Keyset(Item.updated_at, Item.id)
+
+
+def create_items(count=1000, owners=2):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            [
+                # Every second timestamp is shared by two items, ties break on id
+                Item(id=f"{i:08d}", owner_id=f"owner-{i % owners}", updated_at=i // 2)
+                for i in range(count)
+            ]
+        )
+        db.commit()
+    return engine
+
+
+class TestKeyset:
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([1700000000, "0f5c-id"])
+        assert decode_cursor(cursor) == [1700000000, "0f5c-id"]
+        assert "=" not in cursor
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor")
+
+        query = SimpleNamespace(filter=None, order_by=None)
+        with pytest.raises(ValueError):
+            ITEM_KEYSET.apply(query, encode_cursor([1]))
+
+    def test_pages_match_offset_pagination(self):
+        engine = create_items(count=101)
+        with Session(engine) as db:
+            expected = [
+                item.id
+                for item in db.query(Item)
+                .order_by(Item.updated_at.desc(), Item.id.desc())
+                .all()
+            ]
+
+            ids, cursor = [], None
+            while True:
+                page = ITEM_KEYSET.apply(db.query(Item), cursor).limit(10).all()
+                ids.extend(item.id for item in page)
+                cursor = ITEM_KEYSET.get_next_cursor(page, 10)
+                if cursor is None:
+                    break
+
+            assert ids == expected
+
+    def test_ascending_with_key(self):
+        keyset = Keyset(
+            Item.updated_at,
+            Item.id,
+            descending=False,
+            key=lambda item: (item["updated_at"], item["id"]),
+        )
+        engine = create_items(count=20)
+        with Session(engine) as db:
+            cursor = keyset.get_cursor({"updated_at": 4, "id": "00000009"})
+            page = keyset.apply(db.query(Item), cursor).limit(3).all()
+            assert [item.id for item in page] == ["00000010", "00000011", "00000012"]
+
+    def test_next_cursor_on_last_page(self):
+        items = [SimpleNamespace(updated_at=1, id="a")]
+        assert ITEM_KEYSET.get_next_cursor(items, 2) is None
+        assert ITEM_KEYSET.get_next_cursor(items, 1) == encode_cursor([1, "a"])
+        assert ITEM_KEYSET.get_next_cursor(items, None) is None
+
+
+if __name__ == "__main__":
+    # Benchmark: latency of fetching one page at increasing depths with OFFSET and
+    # with a cursor. OFFSET grows linearly with the depth, the cursor stays flat.
+    engine = create_items(count=200_000)
+    limit = 50
+    with Session(engine) as db:
+        for depth in (0, 1_000, 10_000, 50_000, 90_000):
+            query = db.query(Item).filter(Item.owner_id == "owner-0")
+
+            start = time.perf_counter()
+            for _ in range(20):
+                page = (
+                    query.order_by(Item.updated_at.desc(), Item.id.desc())
+                    .offset(depth)
+                    .limit(limit)
+                    .all()
+                )
+            offset_elapsed = (time.perf_counter() - start) / 20
+
+            # Cursor continuing at the same depth, as returned by the previous page
+            cursor = ITEM_KEYSET.get_cursor(page[0]) if depth else None
+
+            start = time.perf_counter()
+            for _ in range(20):
+                ITEM_KEYSET.apply(query, cursor).limit(limit).all()
+            cursor_elapsed = (time.perf_counter() - start) / 20
+
+            print(
+                f"depth {depth:>6}: offset {offset_elapsed * 1e3:6.2f} ms"
+                f"  cursor {cursor_elapsed * 1e3:6.2f} ms"
+            )
@@ -0,0 +1,64 @@
+from open_webui.utils.status_history import (
+    COMPACTED_ACTION,
+    append_status,
+    compact_status_history,
+)
+
+
+def status(action, timestamp, **kwargs):
+    return {"action": action, "timestamp": timestamp, **kwargs}
+
+
+class TestStatusHistory:
+    def test_repeated_stage_collapses(self):
+        history = [status("start", 0)]
+        for i in range(1, 6):
+            history = append_status(history, status("tool", i, description=f"{i}"))
+
+        assert len(history) == 2
+        assert history[-1]["description"] == "5"
+        assert history[-1]["updates"] == 5
+        assert history[-1]["started_at"] == 1
+        assert history[-1]["duration"] == 4
+
+    def test_iso_timestamps(self):
+        history = [status("start", "2026-01-01T00:00:00")]
+        history = append_status(history, status("tool", "2026-01-01T00:00:01.500000"))
+        history = append_status(history, status("tool", "2026-01-01T00:00:04"))
+
+        assert history[-1]["started_at"] == "2026-01-01T00:00:01.500000"
+        assert history[-1]["duration"] == 2.5
+
+    def test_missing_and_mixed_timestamps(self):
+        history = [status("start", 0), {"action": "tool"}]
+        history = append_status(history, {"action": "tool", "timestamp": None})
+        assert history[-1]["updates"] == 2
+        assert isinstance(history[-1]["timestamp"], int)
+
+        history = append_status(history, status("tool", "not a date"))
+        assert history[-1]["updates"] == 3
+        assert "duration" not in history[-1]
+
+    def test_first_status_is_never_collapsed(self):
+        history = append_status([status("tool", 0)], status("tool", 1))
+        assert [entry["timestamp"] for entry in history] == [0, 1]
+
+    def test_cap_keeps_first_and_summary(self):
+        history = []
+        for i in range(100):
+            history = append_status(history, status(f"stage-{i}", i), max_length=10)
+
+        assert len(history) == 10
+        assert history[0]["action"] == "stage-0"
+        assert history[1]["action"] == COMPACTED_ACTION
+        assert history[1]["updates"] == 91
+        assert history[-1]["action"] == "stage-99"
+
+    def test_compaction_is_idempotent(self):
+        statuses = [status(f"stage-{i % 7}", i) for i in range(200)]
+        compacted = compact_status_history(statuses, max_length=10)
+        assert compact_status_history(compacted, max_length=10) == compacted
+
+    def test_zero_max_length_keeps_all_stages(self):
+        statuses = [status(f"stage-{i}", i) for i in range(100)]
+        assert len(compact_status_history(statuses, max_length=0)) == 100
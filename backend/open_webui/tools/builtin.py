@@ -751,54 +751,23 @@ async def search_chats(
     try:
         user_id = __user__.get("id")
 
-        chats = Chats.get_chats_by_user_id_and_search_text(
+        chats = Chats.search_chats_by_user_id_and_text(
             user_id=user_id,
             search_text=query,
-            include_archived=False,
-            skip=0,
-            limit=count * 3,  # Fetch more for filtering
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            limit=count,
         )
 
-        results = []
-        for chat in chats:
-            # Apply date filters (updated_at is in seconds)
-            if start_timestamp and chat.updated_at < start_timestamp:
-                continue
-            if end_timestamp and chat.updated_at > end_timestamp:
-                continue
-
-            # Find a matching message snippet
-            snippet = ""
-            messages = chat.chat.get("history", {}).get("messages", {})
-            lower_query = query.lower()
-
-            for msg_id, msg in messages.items():
-                content = msg.get("content", "")
-                if isinstance(content, str) and lower_query in content.lower():
-                    idx = content.lower().find(lower_query)
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + len(query) + 100)
-                    snippet = (
-                        ("..." if start > 0 else "")
-                        + content[start:end]
-                        + ("..." if end < len(content) else "")
-                    )
-                    break
-
-            if not snippet and lower_query in chat.title.lower():
-                snippet = f"Title match: {chat.title}"
-
-            results.append(
-                {
-                    "id": chat.id,
-                    "title": chat.title,
-                    "snippet": snippet,
-                    "updated_at": chat.updated_at,
-                }
-            )
-
-            if len(results) >= count:
-                break
+        results = [
+            {
+                "id": chat.id,
+                "title": chat.title,
+                "snippet": chat.snippet,
+                "updated_at": chat.updated_at,
+            }
+            for chat in chats
+        ]
 
         return json.dumps(results, ensure_ascii=False)
     except Exception as e:
@@ -0,0 +1,158 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import REDIS_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    JSON-serializable TTL cache using Redis so all workers share entries.
+    Falls back to an in-process LRU store if Redis is not available.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int,
+        redis_client=None,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+    ):
+        """
+        :param namespace: Key namespace, e.g. "strands:schema"
+        :param ttl: Entry lifetime in seconds
+        :param redis_client: Async Redis client instance or None
+        :param max_entries: Max entries kept by the in-memory store
+        :param max_bytes: Max serialized size of all entries kept by the in-memory store
+        :param max_entry_bytes: Values larger than this when serialized are not cached
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.r = redis_client
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+        self._memory_store: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def _key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def _redis_available(self) -> bool:
+        return self.r is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        raw = None
+        if self._redis_available():
+            try:
+                raw = await self.r.get(self._key(key))
+            except Exception as e:
+                log.warning(f"Redis cache read failed for {self.namespace}: {e}")
+                raw = self._get_memory(key)
+        else:
+            raw = self._get_memory(key)
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any):
+        raw = json.dumps(value, default=str)
+        if self.max_entry_bytes is not None and len(raw) > self.max_entry_bytes:
+            self.skipped += 1
+            return
+
+        if self._redis_available():
+            try:
+                await self.r.set(self._key(key), raw, ex=self.ttl)
+                return
+            except Exception as e:
+                log.warning(f"Redis cache write failed for {self.namespace}: {e}")
+        self._set_memory(key, raw)
+
+    async def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop key, or every entry of the namespace if key is None. Returns the number of entries removed."""
+        removed = 0
+        if self._redis_available():
+            try:
+                if key is not None:
+                    removed += await self.r.delete(self._key(key))
+                else:
+                    keys = [k async for k in self.r.scan_iter(match=self._key("*"))]
+                    if keys:
+                        removed += await self.r.delete(*keys)
+            except Exception as e:
+                log.warning(
+                    f"Redis cache invalidation failed for {self.namespace}: {e}"
+                )
+
+        if key is not None:
+            if key in self._memory_store:
+                self._delete_memory(key)
+                removed += 1
+        else:
+            removed += len(self._memory_store)
+            self._memory_store.clear()
+            self._memory_bytes = 0
+        return removed
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "backend": "redis" if self._redis_available() else "memory",
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "skipped": self.skipped,
+            "memory_entries": len(self._memory_store),
+            "memory_bytes": self._memory_bytes,
+        }
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        entry = self._memory_store.get(key)
+        if entry is None:
+            return None
+
+        expires_at, raw = entry
+        if expires_at < time.monotonic():
+            self._delete_memory(key)
+            return None
+
+        self._memory_store.move_to_end(key)
+        return raw
+
+    def _set_memory(self, key: str, raw: str):
+        if key in self._memory_store:
+            self._delete_memory(key)
+
+        self._memory_store[key] = (time.monotonic() + self.ttl, raw)
+        self._memory_bytes += len(raw)
+
+        # Evict least recently used entries beyond the entry and byte budgets
+        while len(self._memory_store) > self.max_entries or (
+            self.max_bytes is not None
+            and self._memory_bytes > self.max_bytes
+            and len(self._memory_store) > 1
+        ):
+            _, (_, evicted) = self._memory_store.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _delete_memory(self, key: str):
+        _, raw = self._memory_store.pop(key)
+        self._memory_bytes -= len(raw)
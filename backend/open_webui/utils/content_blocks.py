@@ -0,0 +1,203 @@
+import html
+import json
+
+
+def split_content_and_whitespace(content):
+    content_stripped = content.rstrip()
+    original_whitespace = (
+        content[len(content_stripped) :] if len(content) > len(content_stripped) else ""
+    )
+    return content_stripped, original_whitespace
+
+
+def is_opening_code_block(content):
+    backtick_segments = content.split("```")
+    # Even number of segments means the last backticks are opening a new block
+    return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
+
+
+def serialize_content_block(content: str, block: dict, raw: bool = False) -> str:
+    """Append the rendered block to the content serialized so far and return it."""
+    if block["type"] == "text":
+        block_content = block["content"].strip()
+        if block_content:
+            content = f"{content}{block_content}\n"
+    elif block["type"] == "tool_calls":
+        attributes = block.get("attributes", {})
+
+        tool_calls = block.get("content", [])
+        results = block.get("results", [])
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if results:
+
+            tool_calls_display_content = ""
+            for tool_call in tool_calls:
+
+                tool_call_id = tool_call.get("id", "")
+                tool_name = tool_call.get("function", {}).get("name", "")
+                tool_arguments = tool_call.get("function", {}).get("arguments", "")
+
+                tool_result = None
+                tool_result_files = None
+                for result in results:
+                    if tool_call_id == result.get("tool_call_id", ""):
+                        tool_result = result.get("content", None)
+                        tool_result_files = result.get("files", None)
+                        break
+
+                if tool_result is not None:
+                    tool_result_embeds = result.get("embeds", "")
+                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}" embeds="{html.escape(json.dumps(tool_result_embeds))}">\n<summary>Tool Executed</summary>\n</details>\n'
+                else:
+                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+
+            if not raw:
+                content = f"{content}{tool_calls_display_content}"
+        else:
+            tool_calls_display_content = ""
+
+            for tool_call in tool_calls:
+                tool_call_id = tool_call.get("id", "")
+                tool_name = tool_call.get("function", {}).get("name", "")
+                tool_arguments = tool_call.get("function", {}).get("arguments", "")
+
+                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+
+            if not raw:
+                content = f"{content}{tool_calls_display_content}"
+
+    elif block["type"] == "reasoning":
+        reasoning_display_content = html.escape(
+            "\n".join(
+                (f"> {line}" if not line.startswith(">") else line)
+                for line in block["content"].splitlines()
+            )
+        )
+
+        reasoning_duration = block.get("duration", None)
+
+        start_tag = block.get("start_tag", "")
+        end_tag = block.get("end_tag", "")
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if reasoning_duration is not None:
+            if raw:
+                content = f'{content}{start_tag}{block["content"]}{end_tag}\n'
+            else:
+                content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+        else:
+            if raw:
+                content = f'{content}{start_tag}{block["content"]}{end_tag}\n'
+            else:
+                content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+
+    elif block["type"] == "code_interpreter":
+        attributes = block.get("attributes", {})
+        output = block.get("output", None)
+        lang = attributes.get("lang", "")
+
+        content_stripped, original_whitespace = split_content_and_whitespace(content)
+        if is_opening_code_block(content_stripped):
+            # Remove trailing backticks that would open a new block
+            content = content_stripped.rstrip("`").rstrip() + original_whitespace
+        else:
+            # Keep content as is - either closing backticks or no backticks
+            content = content_stripped + original_whitespace
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if output:
+            output = html.escape(json.dumps(output))
+
+            if raw:
+                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
+            else:
+                content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+        else:
+            if raw:
+                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
+            else:
+                content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+
+    else:
+        block_content = str(block["content"]).strip()
+        if block_content:
+            content = f"{content}{block['type']}: {block_content}\n"
+
+    return content
+
+
+def serialize_content_blocks(content_blocks: list[dict], raw: bool = False) -> str:
+    content = ""
+    for block in content_blocks:
+        content = serialize_content_block(content, block, raw)
+    return content.strip()
+
+
+def get_content_block_signature(block: dict) -> tuple:
+    """
+    Cheap fingerprint of the parts of a block that change while a response streams,
+    used to detect that a block rendered earlier has been modified since.
+    """
+    content = block.get("content")
+    return (
+        id(block),
+        block.get("type"),
+        len(content) if isinstance(content, (str, list)) else content,
+        len(block.get("results") or []),
+        block.get("duration"),
+        block.get("output") is not None,
+    )
+
+
+class ContentBlocksSerializer:
+    """
+    Incremental serialize_content_blocks for a single streaming response.
+
+    Only the last block of a response is still being written to, so the content
+    rendered from all blocks before it is cached and reused, and each call only
+    renders the blocks added since the previous call plus the last block.
+
+    Blocks are only ever modified or removed while they are the last block, so a
+    change to the cached blocks always shows in the last cached one; if it was
+    modified or removed, the content is rendered from scratch. The cache can also
+    step back one block, for callers serializing content_blocks plus a pending block.
+    """
+
+    def __init__(self):
+        # raw -> [signatures of the cached blocks, content rendered from them,
+        #         content rendered before the last cached block]
+        self._prefixes: dict[bool, list] = {}
+
+    def __call__(self, content_blocks: list[dict], raw: bool = False) -> str:
+        if not content_blocks:
+            return ""
+
+        prefix = self._prefixes.setdefault(raw, [[], "", None])
+        signatures, content, previous_content = prefix
+        completed = len(content_blocks) - 1
+
+        if len(signatures) == completed + 1 and previous_content is not None:
+            signatures.pop()
+            content, previous_content = previous_content, None
+
+        if len(signatures) > completed or (
+            signatures
+            and signatures[-1]
+            != get_content_block_signature(content_blocks[len(signatures) - 1])
+        ):
+            signatures, content, previous_content = [], "", None
+
+        for block in content_blocks[len(signatures) : completed]:
+            previous_content = content
+            content = serialize_content_block(content, block, raw)
+            signatures.append(get_content_block_signature(block))
+        self._prefixes[raw] = [signatures, content, previous_content]
+
+        return serialize_content_block(content, content_blocks[-1], raw).strip()
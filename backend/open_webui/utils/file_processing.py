@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from open_webui.env import (
+    DATA_DIR,
+    ENABLE_FILE_PROCESSING_QUEUE,
+    FILE_PROCESSING_JOB_LEASE,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.jobs import RedisJobQueue, SQLiteJobQueue
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+FILE_PROCESSING_JOB = "process_file"
+
+# Files up to this size are processed first, so attachments of a chat don't wait
+# for large uploads
+FILE_PROCESSING_HIGH_PRIORITY_MAX_SIZE = 1024 * 1024
+
+
+def get_file_job_queue():
+    if REDIS_URL:
+        redis_sentinels = get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        )
+        return RedisJobQueue(
+            get_redis_connection(
+                redis_url=REDIS_URL,
+                redis_sentinels=redis_sentinels,
+                redis_cluster=REDIS_CLUSTER,
+            ),
+            get_redis_connection(
+                redis_url=REDIS_URL,
+                redis_sentinels=redis_sentinels,
+                redis_cluster=REDIS_CLUSTER,
+                async_mode=True,
+            ),
+            # The hash tag keeps the keys of the queue in one slot of a cluster
+            f"{REDIS_KEY_PREFIX}:{{file-jobs}}",
+            FILE_PROCESSING_JOB_LEASE,
+        )
+    return SQLiteJobQueue(DATA_DIR / "jobs.db", FILE_PROCESSING_JOB_LEASE)
+
+
+_file_jobs = None
+
+
+def get_file_jobs():
+    """Return the file processing queue, created on first use."""
+    global _file_jobs
+    if _file_jobs is None:
+        _file_jobs = get_file_job_queue()
+    return _file_jobs
+
+
+def get_file_processing_lane(content_type: Optional[str], size: int) -> str:
+    if content_type and content_type.startswith(("audio/", "video/")):
+        # Transcriptions take the longest
+        return "low"
+    if size <= FILE_PROCESSING_HIGH_PRIORITY_MAX_SIZE:
+        return "high"
+    return "default"
+
+
+def enqueue_file_processing(
+    file_id: str,
+    user_id: str,
+    content_type: Optional[str],
+    file_path: str,
+    metadata: dict,
+    size: int,
+) -> str:
+    return get_file_jobs().enqueue(
+        FILE_PROCESSING_JOB,
+        {
+            "file_id": file_id,
+            "user_id": user_id,
+            "content_type": content_type,
+            "file_path": file_path,
+            "metadata": metadata,
+        },
+        lane=get_file_processing_lane(content_type, size),
+    )
+
+
+def publish_file_status(
+    file_id: str, user_id: str, status: str, error: Optional[str] = None
+):
+    """Announce a new processing status of a file to the API processes."""
+    if not ENABLE_FILE_PROCESSING_QUEUE:
+        # Nothing listens, status streams poll the database instead
+        return
+
+    event = {"file_id": file_id, "user_id": user_id, "status": status}
+    if error is not None:
+        event["error"] = error
+
+    try:
+        get_file_jobs().publish(event)
+    except Exception as e:
+        log.warning(f"Failed to publish the status of file {file_id}: {e}")
+
+
+# Queues of the file status streams served by this process, per file id
+FILE_STATUS_SUBSCRIBERS: dict[str, set[asyncio.Queue]] = {}
+
+
+@contextmanager
+def subscribe_file_status(file_id: str) -> Iterator[asyncio.Queue]:
+    queue = asyncio.Queue()
+    FILE_STATUS_SUBSCRIBERS.setdefault(file_id, set()).add(queue)
+    try:
+        yield queue
+    finally:
+        queues = FILE_STATUS_SUBSCRIBERS.get(file_id, set())
+        queues.discard(queue)
+        if not queues:
+            FILE_STATUS_SUBSCRIBERS.pop(file_id, None)
+
+
+async def file_status_listener():
+    """Forward file status events to the status streams of this process."""
+    while True:
+        try:
+            async for event in get_file_jobs().events():
+                for queue in FILE_STATUS_SUBSCRIBERS.get(event["file_id"], ()):
+                    queue.put_nowait(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"File status listener failed, restarting: {e}")
+            await asyncio.sleep(1)
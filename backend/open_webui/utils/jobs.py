@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+log = logging.getLogger(__name__)
+
+# Lanes of a job queue, in the order they are served
+JOB_LANES = ("high", "default", "low")
+
+# KEYS: jobs, attempts, delayed, leased, lanes...
+# ARGV: now, lease end, lane names...
+REDIS_DEQUEUE_SCRIPT = """
+local function restore(key)
+    local ids = redis.call('ZRANGEBYSCORE', key, '-inf', ARGV[1], 'LIMIT', 0, 100)
+    for _, id in ipairs(ids) do
+        redis.call('ZREM', key, id)
+        local data = redis.call('HGET', KEYS[1], id)
+        if data then
+            local lane = cjson.decode(data)['lane']
+            for i = 3, #ARGV do
+                if ARGV[i] == lane then
+                    redis.call('RPUSH', KEYS[i + 2], id)
+                end
+            end
+        end
+    end
+end
+
+restore(KEYS[3])
+restore(KEYS[4])
+
+for i = 5, #KEYS do
+    local id = redis.call('LPOP', KEYS[i])
+    if id then
+        local attempts = redis.call('HINCRBY', KEYS[2], id, 1)
+        redis.call('ZADD', KEYS[4], ARGV[2], id)
+        return {id, redis.call('HGET', KEYS[1], id), attempts}
+    end
+end
+return nil
+"""
+
+
+class RedisJobQueue:
+    """
+    Durable job queue in Redis.
+
+    Jobs are kept in a hash until completed, while their ids move between a list
+    per lane, a sorted set of jobs waiting for a retry and a sorted set of the jobs
+    leased to workers. A job is handed out again once its retry is due or its lease
+    expired, which is how the jobs of workers that died are recovered.
+    """
+
+    def __init__(self, redis, async_redis, name: str, lease: int):
+        self.redis = redis
+        self.async_redis = async_redis
+        self.lease = lease
+
+        self.jobs_key = f"{name}:jobs"
+        self.attempts_key = f"{name}:attempts"
+        self.delayed_key = f"{name}:delayed"
+        self.leased_key = f"{name}:leased"
+        self.lane_keys = [f"{name}:lane:{lane}" for lane in JOB_LANES]
+        self.channel = f"{name}:events"
+
+        self.dequeue_script = redis.register_script(REDIS_DEQUEUE_SCRIPT)
+
+    def enqueue(self, type: str, payload: dict, lane: str = "default") -> str:
+        id = str(uuid.uuid4())
+        job = {"id": id, "type": type, "lane": lane, "payload": payload}
+
+        pipeline = self.redis.pipeline()
+        pipeline.hset(self.jobs_key, id, json.dumps(job))
+        pipeline.rpush(self.lane_keys[JOB_LANES.index(lane)], id)
+        pipeline.execute()
+        return id
+
+    def dequeue(self) -> Optional[dict]:
+        """Lease the next job, None if there is none."""
+        now = time.time()
+        result = self.dequeue_script(
+            keys=[
+                self.jobs_key,
+                self.attempts_key,
+                self.delayed_key,
+                self.leased_key,
+                *self.lane_keys,
+            ],
+            args=[now, now + self.lease, *JOB_LANES],
+        )
+        if result is None:
+            return None
+
+        id, data, attempts = result
+        if data is None:
+            # Completed while its id was still queued
+            self.complete({"id": id})
+            return None
+        return {**json.loads(data), "attempts": int(attempts)}
+
+    def extend(self, job: dict):
+        """Renew the lease of a running job."""
+        self.redis.zadd(self.leased_key, {job["id"]: time.time() + self.lease}, xx=True)
+
+    def complete(self, job: dict):
+        pipeline = self.redis.pipeline()
+        pipeline.zrem(self.leased_key, job["id"])
+        pipeline.hdel(self.jobs_key, job["id"])
+        pipeline.hdel(self.attempts_key, job["id"])
+        pipeline.execute()
+
+    def retry(self, job: dict, delay: float):
+        pipeline = self.redis.pipeline()
+        pipeline.zrem(self.leased_key, job["id"])
+        pipeline.zadd(self.delayed_key, {job["id"]: time.time() + delay})
+        pipeline.execute()
+
+    def publish(self, event: dict):
+        self.redis.publish(self.channel, json.dumps(event))
+
+    async def events(self) -> AsyncIterator[dict]:
+        pubsub = self.async_redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+
+class SQLiteJobQueue:
+    """
+    Durable job queue in a SQLite database, shared by the processes of one host.
+
+    A dequeued job is leased to its worker and handed out again once its lease
+    expired. Events are kept for an hour in a table that listeners poll.
+    """
+
+    def __init__(self, path: Path, lease: int):
+        self.lease = lease
+        self.lock = threading.Lock()
+
+        # Transactions are explicit, dequeuing takes the write lock before reading
+        self.db = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS job (id TEXT PRIMARY KEY, "
+            "lane INTEGER NOT NULL, data TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, "
+            "leased_until REAL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS job_lane_idx ON job (lane, available_at)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS event (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "data TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def enqueue(self, type: str, payload: dict, lane: str = "default") -> str:
+        id = str(uuid.uuid4())
+        job = {"id": id, "type": type, "lane": lane, "payload": payload}
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO job (id, lane, data, available_at) VALUES (?, ?, ?, ?)",
+                [id, JOB_LANES.index(lane), json.dumps(job), time.time()],
+            )
+        return id
+
+    def dequeue(self) -> Optional[dict]:
+        """Lease the next job, None if there is none."""
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    "SELECT id, data, attempts FROM job WHERE available_at <= ? "
+                    "AND (leased_until IS NULL OR leased_until <= ?) "
+                    "ORDER BY lane, available_at LIMIT 1",
+                    [now, now],
+                ).fetchone()
+                if row is not None:
+                    self.db.execute(
+                        "UPDATE job SET attempts = attempts + 1, leased_until = ? "
+                        "WHERE id = ?",
+                        [now + self.lease, row[0]],
+                    )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return {**json.loads(row[1]), "attempts": row[2] + 1}
+
+    def extend(self, job: dict):
+        """Renew the lease of a running job."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE job SET leased_until = ? WHERE id = ?",
+                [time.time() + self.lease, job["id"]],
+            )
+
+    def complete(self, job: dict):
+        with self.lock:
+            self.db.execute("DELETE FROM job WHERE id = ?", [job["id"]])
+
+    def retry(self, job: dict, delay: float):
+        with self.lock:
+            self.db.execute(
+                "UPDATE job SET available_at = ?, leased_until = NULL WHERE id = ?",
+                [time.time() + delay, job["id"]],
+            )
+
+    def publish(self, event: dict):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO event (data, created_at) VALUES (?, ?)",
+                [json.dumps(event), now],
+            )
+            self.db.execute("DELETE FROM event WHERE created_at < ?", [now - 3600])
+
+    def _get_events(self, last_id: Optional[int]) -> list:
+        with self.lock:
+            if last_id is None:
+                return self.db.execute(
+                    "SELECT COALESCE(MAX(id), 0), NULL FROM event"
+                ).fetchall()
+            return self.db.execute(
+                "SELECT id, data FROM event WHERE id > ? ORDER BY id", [last_id]
+            ).fetchall()
+
+    async def events(self) -> AsyncIterator[dict]:
+        # Only events published from now on are listened to
+        last_id = None
+        while True:
+            for id, data in await asyncio.to_thread(self._get_events, last_id):
+                last_id = id
+                if data is not None:
+                    yield json.loads(data)
+            await asyncio.sleep(1)
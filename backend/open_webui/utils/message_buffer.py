@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from open_webui.env import (
+    CHAT_MESSAGE_SAVE_FLUSH_INTERVAL,
+    CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES,
+)
+from open_webui.models.chats import Chats
+from open_webui.utils.status_history import append_status
+
+log = logging.getLogger(__name__)
+
+
+class PendingMessage:
+    def __init__(self):
+        self.fields = {}  # message fields upserted since the last flush
+        self.statuses = []  # statusHistory entries appended since the last flush
+        self.updates = 0
+        self.message = None  # working copy for read-modify-write callers
+        self.timer = None
+
+
+class MessageWriteBuffer:
+    """
+    Write-behind buffer for chat message updates made while a response streams.
+
+    Updates to a message are coalesced in memory and written with a single upsert
+    once flush_interval seconds have passed since the first pending update, once
+    max_updates updates are pending, or when flush() is called on completion or
+    cancellation. A crash loses at most flush_interval seconds of updates.
+
+    Writes run in a thread pool, so the event loop never waits on the database, and
+    the writes of a message are applied in the order they were flushed. flush() and
+    get_message() are coroutines that wait for the pending writes of the message.
+
+    All per-message writes of a response must go through the same buffer so they
+    reach the database in order.
+    """
+
+    def __init__(self, flush_interval: float, max_updates: int):
+        """
+        :param flush_interval: Max seconds an update stays in memory, 0 writes through
+        :param max_updates: Pending updates of a message that trigger an immediate flush
+        """
+        self.flush_interval = flush_interval
+        self.max_updates = max_updates
+
+        self._pending: dict[tuple[str, str], PendingMessage] = {}
+        # Last write of each message, until it finished
+        self._writing: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(thread_name_prefix="message-writes")
+        self.updates = 0
+        self.writes = 0
+
+    def _write_through(self) -> bool:
+        return self.flush_interval <= 0
+
+    def _entry(self, chat_id: str, message_id: str) -> PendingMessage:
+        entry = self._pending.get((chat_id, message_id))
+        if entry is None:
+            entry = self._pending[(chat_id, message_id)] = PendingMessage()
+            self._schedule(chat_id, message_id, entry)
+        return entry
+
+    def _schedule(self, chat_id: str, message_id: str, entry: PendingMessage):
+        if self._write_through():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to flush later from
+            return
+        entry.timer = loop.call_later(
+            self.flush_interval, self._submit, chat_id, message_id
+        )
+
+    def _mark_dirty(self, chat_id: str, message_id: str, entry: PendingMessage):
+        entry.updates += 1
+        self.updates += 1
+        if (
+            entry.timer is None
+            or entry.updates >= self.max_updates
+            or self._write_through()
+        ):
+            self._submit(chat_id, message_id)
+
+    def _write(
+        self,
+        chat_id: str,
+        message_id: str,
+        entry: Optional[PendingMessage],
+        previous: Optional[Future] = None,
+    ):
+        if previous is not None:
+            # Submitted before this write, the pool starts its jobs in order
+            previous.result()
+        if entry is None or not (entry.fields or entry.statuses):
+            return
+
+        try:
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_id, message_id, entry.fields, statuses=entry.statuses
+            )
+            with self._lock:
+                self.writes += 1
+        except Exception as e:
+            log.error(f"Failed to save message {message_id} of chat {chat_id}: {e}")
+
+    def _submit(self, chat_id: str, message_id: str) -> Optional[Future]:
+        """
+        Queue the pending updates of a message for writing, after its earlier writes.
+        Returns the last write of the message, None if it has nothing to write.
+        """
+        key = (chat_id, message_id)
+        entry = self._pending.pop(key, None)
+        if entry is not None and entry.timer is not None:
+            entry.timer.cancel()
+
+        with self._lock:
+            previous = self._writing.get(key)
+            if entry is None:
+                return previous
+
+            future = self._executor.submit(
+                self._write, chat_id, message_id, entry, previous
+            )
+            self._writing[key] = future
+
+        def done(future: Future):
+            with self._lock:
+                if self._writing.get(key) is future:
+                    del self._writing[key]
+
+        future.add_done_callback(done)
+        return future
+
+    async def get_message(self, chat_id: str, message_id: str) -> Optional[dict]:
+        """Return the message with pending updates applied."""
+        key = (chat_id, message_id)
+        entry = self._pending.get(key)
+        if entry is None or entry.message is None:
+            with self._lock:
+                writing = self._writing.get(key)
+            if writing is not None:
+                # Read the updates already flushed too
+                await asyncio.wrap_future(writing)
+
+            stored = await asyncio.to_thread(
+                Chats.get_message_by_id_and_message_id, chat_id, message_id
+            )
+            if self._write_through():
+                return stored
+
+            # Updates may have been made while reading
+            entry = self._entry(chat_id, message_id)
+            if entry.message is None:
+                if not stored and not entry.fields:
+                    return stored
+
+                message = {**(stored or {}), **entry.fields}
+                for status in entry.statuses:
+                    message["statusHistory"] = append_status(
+                        message.get("statusHistory") or [], status
+                    )
+                entry.message = message
+
+        return entry.message
+
+    def upsert_message(self, chat_id: str, message_id: str, message: dict):
+        entry = self._entry(chat_id, message_id)
+        entry.fields.update(message)
+        if "statusHistory" in message:
+            entry.statuses = []
+        if entry.message is not None:
+            entry.message.update(message)
+
+        self._mark_dirty(chat_id, message_id, entry)
+
+    def add_message_status(self, chat_id: str, message_id: str, status: dict):
+        entry = self._entry(chat_id, message_id)
+        entry.statuses.append(status)
+        if entry.message is not None:
+            entry.message["statusHistory"] = append_status(
+                entry.message.get("statusHistory") or [], status
+            )
+
+        self._mark_dirty(chat_id, message_id, entry)
+
+    async def flush(self, chat_id: str, message_id: str):
+        """Write the pending updates of a message to the database and wait for it."""
+        future = self._submit(chat_id, message_id)
+        if future is not None:
+            await asyncio.wrap_future(future)
+
+    async def flush_all(self):
+        for chat_id, message_id in list(self._pending.keys()):
+            self._submit(chat_id, message_id)
+
+        with self._lock:
+            writing = list(self._writing.values())
+        for future in writing:
+            await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            writes = self.writes
+        return {
+            "pending": len(self._pending),
+            "updates": self.updates,
+            "writes": writes,
+        }
+
+
+MESSAGE_WRITE_BUFFER = MessageWriteBuffer(
+    CHAT_MESSAGE_SAVE_FLUSH_INTERVAL, CHAT_MESSAGE_SAVE_FLUSH_MAX_UPDATES
+)
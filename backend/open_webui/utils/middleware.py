@@ -58,6 +58,8 @@ from open_webui.routers.pipelines import (
 from open_webui.routers.memories import query_memory, QueryMemoryForm
 
 from open_webui.utils.webhook import post_webhook
+from open_webui.utils.message_buffer import MESSAGE_WRITE_BUFFER
+from open_webui.utils.content_blocks import ContentBlocksSerializer
 from open_webui.utils.files import (
     convert_markdown_base64_images,
     get_file_url_from_base64,
@@ -1965,6 +1967,10 @@ async def process_chat_response(
         try:
             if "chat_id" in metadata and not metadata["chat_id"].startswith("local:"):
                 log.debug(f"[DEBUG] Processing chat_id: {metadata.get('chat_id', 'N/A')}")
+                # Persist buffered message updates before reading the history back
+                await MESSAGE_WRITE_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
                 messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
                 log.debug(f"[DEBUG] messages_map retrieved, type: {type(messages_map)}, is None: {messages_map is None}")
                 
@@ -2064,7 +2070,7 @@ async def process_chat_response(
                             )
 
                             if not metadata.get("chat_id", "").startswith("local:"):
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                MESSAGE_WRITE_BUFFER.upsert_message(
                                     metadata["chat_id"],
                                     metadata["message_id"],
                                     {
@@ -2240,7 +2246,7 @@ async def process_chat_response(
                         else:
                             error = str(error)
 
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        MESSAGE_WRITE_BUFFER.upsert_message(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -2256,7 +2262,7 @@ async def process_chat_response(
                             )
 
                     if "selected_model_id" in response_data:
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        MESSAGE_WRITE_BUFFER.upsert_message(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -2343,7 +2349,7 @@ async def process_chat_response(
                                 except Exception as e:
                                     log.error(f"Middleware: Failed to serialize strands_internals from message for DB: {e}")
                             
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            MESSAGE_WRITE_BUFFER.upsert_message(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 message_data,
@@ -2426,11 +2432,14 @@ async def process_chat_response(
                                 log.error(f"Middleware: Failed to serialize strands_internals from msg (no emitter): {e}")
                         
                         if "strands_internals" in message_data:
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            MESSAGE_WRITE_BUFFER.upsert_message(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 message_data,
                             )
+                            await MESSAGE_WRITE_BUFFER.flush(
+                                metadata["chat_id"], metadata["message_id"]
+                            )
                             log.info(f"Middleware: Saved message with strands_internals to chat {metadata['chat_id'][:8]}")
             
             if events and isinstance(events, list) and isinstance(response, dict):
@@ -2486,156 +2495,9 @@ async def process_chat_response(
         task_id = str(uuid4())  # Create a unique task ID.
         model_id = form_data.get("model", "")
 
-        def split_content_and_whitespace(content):
-            content_stripped = content.rstrip()
-            original_whitespace = (
-                content[len(content_stripped) :]
-                if len(content) > len(content_stripped)
-                else ""
-            )
-            return content_stripped, original_whitespace
-
-        def is_opening_code_block(content):
-            backtick_segments = content.split("```")
-            # Even number of segments means the last backticks are opening a new block
-            return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
-
         # Handle as a background task
         async def response_handler(response, events):
-            def serialize_content_blocks(content_blocks, raw=False):
-                content = ""
-
-                for block in content_blocks:
-                    if block["type"] == "text":
-                        block_content = block["content"].strip()
-                        if block_content:
-                            content = f"{content}{block_content}\n"
-                    elif block["type"] == "tool_calls":
-                        attributes = block.get("attributes", {})
-
-                        tool_calls = block.get("content", [])
-                        results = block.get("results", [])
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if results:
-
-                            tool_calls_display_content = ""
-                            for tool_call in tool_calls:
-
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_result = None
-                                tool_result_files = None
-                                for result in results:
-                                    if tool_call_id == result.get("tool_call_id", ""):
-                                        tool_result = result.get("content", None)
-                                        tool_result_files = result.get("files", None)
-                                        break
-
-                                if tool_result is not None:
-                                    tool_result_embeds = result.get("embeds", "")
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}" embeds="{html.escape(json.dumps(tool_result_embeds))}">\n<summary>Tool Executed</summary>\n</details>\n'
-                                else:
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
-
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
-                        else:
-                            tool_calls_display_content = ""
-
-                            for tool_call in tool_calls:
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
-
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
-
-                    elif block["type"] == "reasoning":
-                        reasoning_display_content = html.escape(
-                            "\n".join(
-                                (f"> {line}" if not line.startswith(">") else line)
-                                for line in block["content"].splitlines()
-                            )
-                        )
-
-                        reasoning_duration = block.get("duration", None)
-
-                        start_tag = block.get("start_tag", "")
-                        end_tag = block.get("end_tag", "")
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if reasoning_duration is not None:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
-                        else:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
-
-                    elif block["type"] == "code_interpreter":
-                        attributes = block.get("attributes", {})
-                        output = block.get("output", None)
-                        lang = attributes.get("lang", "")
-
-                        content_stripped, original_whitespace = (
-                            split_content_and_whitespace(content)
-                        )
-                        if is_opening_code_block(content_stripped):
-                            # Remove trailing backticks that would open a new block
-                            content = (
-                                content_stripped.rstrip("`").rstrip()
-                                + original_whitespace
-                            )
-                        else:
-                            # Keep content as is - either closing backticks or no backticks
-                            content = content_stripped + original_whitespace
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if output:
-                            output = html.escape(json.dumps(output))
-
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-                        else:
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-
-                    else:
-                        block_content = str(block["content"]).strip()
-                        if block_content:
-                            content = f"{content}{block['type']}: {block_content}\n"
-
-                return content.strip()
+            serialize_content_blocks = ContentBlocksSerializer()
 
             def convert_content_blocks_to_messages(content_blocks, raw=False):
                 messages = []
@@ -2909,7 +2771,7 @@ async def process_chat_response(
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    MESSAGE_WRITE_BUFFER.upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2985,7 +2847,7 @@ async def process_chat_response(
 
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    MESSAGE_WRITE_BUFFER.upsert_message(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -3285,7 +3147,7 @@ async def process_chat_response(
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            MESSAGE_WRITE_BUFFER.upsert_message(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -3781,13 +3643,16 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    MESSAGE_WRITE_BUFFER.upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await MESSAGE_WRITE_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
 
                 # Send a webhook notification if the user is not active
                 if not Users.is_user_active(user.id):
@@ -3819,13 +3684,16 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    MESSAGE_WRITE_BUFFER.upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await MESSAGE_WRITE_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
 
             if response.background is not None:
                 await response.background()
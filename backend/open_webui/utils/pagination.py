@@ -0,0 +1,90 @@
+import base64
+import json
+from typing import Any, Callable, Optional
+
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor of the next page of a list endpoint
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    return (
+        base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode())
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class Keyset:
+    """
+    Keyset (cursor) pagination over an ordering of columns that is unique per row,
+    e.g. Keyset(Chat.updated_at, Chat.id).
+
+    Instead of skipping rows with OFFSET, a page continues after the last row of the
+    previous page, which an index on the columns finds directly at any depth. Cursors
+    are opaque tokens holding the column values of that last row.
+    """
+
+    def __init__(
+        self,
+        *columns,
+        descending: bool = True,
+        key: Optional[Callable[[Any], tuple]] = None,
+    ):
+        """
+        :param columns: Columns to order by, unique together
+        :param descending: Order by the columns descending, ascending if False
+        :param key: Function returning the column values of a listed item, by
+            default its attributes named after the columns
+        """
+        self.columns = columns
+        self.descending = descending
+        self.key = key
+
+    def apply(self, query, cursor: Optional[str] = None):
+        """Order the query by the keyset and continue after the cursor if given."""
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.columns):
+                raise ValueError("Invalid cursor")
+
+            key, after = tuple_(*self.columns), tuple_(*values)
+            query = query.filter(key < after if self.descending else key > after)
+
+        return query.order_by(
+            *[
+                column.desc() if self.descending else column.asc()
+                for column in self.columns
+            ]
+        )
+
+    def get_cursor(self, item) -> str:
+        """Return the cursor of the page after the given item."""
+        if self.key is not None:
+            return encode_cursor(list(self.key(item)))
+        return encode_cursor([getattr(item, column.key) for column in self.columns])
+
+    def get_next_cursor(self, items: list, limit: Optional[int]) -> Optional[str]:
+        """Return the cursor of the next page, None if items is the last page."""
+        if not limit or len(items) < limit:
+            return None
+        return self.get_cursor(items[-1])
+
+
+def set_next_cursor(response, keyset: Keyset, items: list, limit: Optional[int]):
+    """Send the cursor of the next page of a list endpoint in a response header."""
+    next_cursor = keyset.get_next_cursor(items, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,91 @@
+import time
+from datetime import datetime
+from typing import Optional
+
+from open_webui.env import CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH
+
+# Action of the entry standing in for the status updates dropped from a history
+COMPACTED_ACTION = "status_history_compacted"
+
+
+def get_status_stage(status: dict) -> Optional[str]:
+    return status.get("action") or status.get("description")
+
+
+def get_status_time(timestamp) -> Optional[float]:
+    """Return a status timestamp, epoch seconds or an ISO 8601 string, in seconds."""
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return timestamp
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def append_status(
+    history: list,
+    status: dict,
+    max_length: int = CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH,
+) -> list:
+    """
+    Append a status to a message's statusHistory, compacting it as it grows.
+
+    Consecutive updates of the same stage (action, or description without one)
+    collapse into the latest, which records the number of updates it stands for and
+    how long the stage has been running. The first status is always kept, and beyond
+    max_length the oldest of the others are dropped into a single summary entry.
+    """
+    status = {**status}
+    if status.get("timestamp") is None:
+        status["timestamp"] = int(time.time())
+    history = list(history or [])
+
+    if len(history) > 1 and get_status_stage(history[-1]) == get_status_stage(status):
+        previous = history.pop()
+        status["updates"] = previous.get("updates", 1) + status.get("updates", 1)
+
+        started_at = previous.get("started_at", previous.get("timestamp"))
+        if started_at is not None:
+            status["started_at"] = started_at
+
+            start = get_status_time(started_at)
+            end = get_status_time(status["timestamp"])
+            if start is not None and end is not None:
+                status["duration"] = max(end - start, 0)
+
+    history.append(status)
+
+    if max_length and len(history) > max(max_length, 3):
+        summary = history[1] if history[1].get("action") == COMPACTED_ACTION else None
+        kept = history[len(history) - max_length + 2 :]
+        dropped = history[2 if summary else 1 : len(history) - max_length + 2]
+
+        updates = (summary or {}).get("updates", 0) + sum(
+            entry.get("updates", 1) for entry in dropped
+        )
+        history = [
+            history[0],
+            {
+                "action": COMPACTED_ACTION,
+                "description": f"{updates} earlier status updates",
+                "updates": updates,
+                "done": True,
+                "timestamp": status["timestamp"],
+            },
+            *kept,
+        ]
+
+    return history
+
+
+def compact_status_history(
+    history: list, max_length: int = CHAT_MESSAGE_STATUS_HISTORY_MAX_LENGTH
+) -> list:
+    """Compact a full statusHistory as if its statuses had been appended one by one."""
+    compacted = []
+    for status in history or []:
+        if isinstance(status, dict):
+            compacted = append_status(compacted, status, max_length)
+    return compacted
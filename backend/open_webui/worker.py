@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+
+from fastapi import Request
+from starlette.datastructures import Headers
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    FILE_PROCESSING_JOB_MAX_ATTEMPTS,
+    FILE_PROCESSING_JOB_RETRY_DELAY,
+)
+from open_webui.internal.db import SessionLocal
+from open_webui.main import app
+from open_webui.models.files import Files
+from open_webui.models.users import Users
+from open_webui.routers.files import process_uploaded_file_content
+from open_webui.utils.file_processing import (
+    FILE_PROCESSING_JOB,
+    get_file_jobs,
+    publish_file_status,
+)
+
+log = logging.getLogger(__name__)
+
+# Errors a retry can't fix
+NON_RETRYABLE_ERRORS = {ERROR_MESSAGES.DUPLICATE_CONTENT, ERROR_MESSAGES.EMPTY_CONTENT}
+
+# Seconds between polls of the queue while it is empty
+IDLE_INTERVAL = 0.5
+
+
+def renew_lease(job: dict, done: threading.Event):
+    while not done.wait(get_file_jobs().lease / 3):
+        try:
+            get_file_jobs().extend(job)
+        except Exception as e:
+            log.warning(f"Failed to renew the lease of job {job['id']}: {e}")
+
+
+def fail_job(job: dict, file_id: str, user_id: str, error: str, db):
+    Files.update_file_data_by_id(file_id, {"status": "failed", "error": error}, db=db)
+    get_file_jobs().complete(job)
+    publish_file_status(file_id, user_id, "failed", error)
+
+
+def process_job(request: Request, job: dict):
+    payload = job["payload"]
+    file_id = payload["file_id"]
+
+    with SessionLocal() as db:
+        user = Users.get_user_by_id(payload["user_id"], db=db)
+        if user is None or Files.get_file_by_id(file_id, db=db) is None:
+            log.info(f"Skipping job {job['id']}, its file or user no longer exists")
+            get_file_jobs().complete(job)
+            return
+
+        if job["attempts"] > FILE_PROCESSING_JOB_MAX_ATTEMPTS:
+            # The previous attempts didn't finish, their workers died
+            log.error(f"Giving up on job {job['id']} of file {file_id}")
+            fail_job(job, file_id, user.id, "File processing was interrupted", db)
+            return
+
+        done = threading.Event()
+        threading.Thread(target=renew_lease, args=(job, done), daemon=True).start()
+        try:
+            process_uploaded_file_content(
+                request,
+                payload["content_type"],
+                payload["file_path"],
+                file_id,
+                payload["metadata"],
+                user,
+                db=db,
+            )
+            # process_file_item published the completed status
+            get_file_jobs().complete(job)
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+            if (
+                job["attempts"] < FILE_PROCESSING_JOB_MAX_ATTEMPTS
+                and error not in NON_RETRYABLE_ERRORS
+            ):
+                delay = FILE_PROCESSING_JOB_RETRY_DELAY * 2 ** (job["attempts"] - 1)
+                log.warning(
+                    f"Error processing file {file_id}, retrying in {delay}s: {error}"
+                )
+                Files.update_file_data_by_id(
+                    file_id, {"status": "pending", "error": error}, db=db
+                )
+                get_file_jobs().retry(job, delay)
+                publish_file_status(file_id, user.id, "pending", error)
+            else:
+                log.error(f"Error processing file: {file_id}")
+                fail_job(job, file_id, user.id, error, db)
+        finally:
+            done.set()
+
+
+def run():
+    """Process the jobs of the file processing queue, one at a time."""
+    # Creating a mock request object to pass to the file processing functions
+    request = Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+    log.info("File processing worker started")
+    while True:
+        try:
+            job = get_file_jobs().dequeue()
+        except Exception as e:
+            log.exception(f"Error dequeuing a file processing job: {e}")
+            time.sleep(5)
+            continue
+
+        if job is None:
+            time.sleep(IDLE_INTERVAL)
+        elif job["type"] != FILE_PROCESSING_JOB:
+            log.warning(f"Dropping job {job['id']} of unknown type {job['type']}")
+            get_file_jobs().complete(job)
+        else:
+            try:
+                process_job(request, job)
+            except Exception as e:
+                # Handed out again once its lease expires
+                log.exception(f"Error running job {job['id']}: {e}")
+
+
+if __name__ == "__main__":
+    run()
@@ -78,6 +78,14 @@ if [ -n "$SPACE_ID" ]; then
 fi
 
 PYTHON_CMD=$(command -v python3 || command -v python)
+
+if [[ "${ENABLE_FILE_PROCESSING_QUEUE,,}" == "true" ]]; then
+    FILE_PROCESSING_WORKERS="${FILE_PROCESSING_WORKERS:-1}"
+    echo "Starting ${FILE_PROCESSING_WORKERS} file processing workers..."
+    for _ in $(seq "$FILE_PROCESSING_WORKERS"); do
+        WEBUI_SECRET_KEY="$WEBUI_SECRET_KEY" "$PYTHON_CMD" -m open_webui.worker &
+    done
+fi
 UVICORN_WORKERS="${UVICORN_WORKERS:-1}"
 
 # If script is called with arguments, use them; otherwise use default workers